@@ -0,0 +1,69 @@
+"""add_tasks_list_indexes
+
+Revision ID: 8ac5acfa30f5
+Revises: 6aff2de8a784
+Create Date: 2026-10-18 10:12:41.207315
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8ac5acfa30f5"
+down_revision: Union[str, Sequence[str], None] = "6aff2de8a784"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Индексы под выборку списка задач: (пользователь[, статус], порядок, id)
+TASKS_INDEXES: dict[str, list[str]] = {
+    "ix_tasks_id_users_created_at": ["id_users", "created_at", "id"],
+    "ix_tasks_id_users_completed_at": ["id_users", "completed_at", "id"],
+    "ix_tasks_id_users_name": ["id_users", "name", "id"],
+    "ix_tasks_id_users_completed_created_at": [
+        "id_users",
+        "completed",
+        "created_at",
+        "id",
+    ],
+    "ix_tasks_id_users_completed_completed_at": [
+        "id_users",
+        "completed",
+        "completed_at",
+        "id",
+    ],
+    "ix_tasks_id_users_completed_name": [
+        "id_users",
+        "completed",
+        "name",
+        "id",
+    ],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в большую таблицу, но не может
+    # выполняться внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, columns in TASKS_INDEXES.items():
+            op.create_index(
+                name,
+                "tasks",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in TASKS_INDEXES:
+            op.drop_index(
+                name,
+                table_name="tasks",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,48 @@
+"""add_tasks_name_trgm_index
+
+Revision ID: 8f2eaffeb551
+Revises: 8ac5acfa30f5
+Create Date: 2026-10-18 10:46:09.531842
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8f2eaffeb551"
+down_revision: Union[str, Sequence[str], None] = "8ac5acfa30f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm - операторы для ILIKE/similarity, btree_gin - чтобы id_users
+    # можно было включить в тот же GIN-индекс
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_id_users_name_trgm",
+            "tasks",
+            ["id_users", "name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Расширения не удаляются: ими могут пользоваться другие объекты БД
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_id_users_name_trgm",
+            table_name="tasks",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,48 @@
+"""add_users_changed_notify
+
+Revision ID: 3c1f7d9b52e4
+Revises: 8f2eaffeb551
+Create Date: 2026-10-18 11:30:27.418305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from core.models.user import USERS_CHANGED_CHANNEL
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1f7d9b52e4"
+down_revision: Union[str, Sequence[str], None] = "8f2eaffeb551"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Уведомление с ID пользователя сбрасывает его запись в кэше
+    # пользователей во всех воркерах (канал USERS_CHANGED_CHANNEL слушает
+    # crud.user.users_listener)
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION notify_users_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('{USERS_CHANGED_CHANNEL}', OLD.id::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_changed_notify
+        AFTER UPDATE OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_users_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_changed_notify ON users")
+    op.execute("DROP FUNCTION IF EXISTS notify_users_changed()")
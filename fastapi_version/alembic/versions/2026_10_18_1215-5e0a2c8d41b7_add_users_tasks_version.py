@@ -0,0 +1,54 @@
+"""add_users_tasks_version
+
+Revision ID: 5e0a2c8d41b7
+Revises: 3c1f7d9b52e4
+Create Date: 2026-10-18 12:15:42.907316
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e0a2c8d41b7"
+down_revision: Union[str, Sequence[str], None] = "3c1f7d9b52e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column(
+            "tasks_version",
+            sa.BigInteger(),
+            server_default="0",
+            nullable=False,
+        ),
+    )
+    # Версия задач меняется при каждом изменении задач: кэш пользователей
+    # сбрасывается только при изменении данных самого пользователя
+    op.execute("DROP TRIGGER IF EXISTS users_changed_notify ON users")
+    op.execute(
+        """
+        CREATE TRIGGER users_changed_notify
+        AFTER UPDATE OF name, email, hashed_password OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_users_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_changed_notify ON users")
+    op.execute(
+        """
+        CREATE TRIGGER users_changed_notify
+        AFTER UPDATE OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_users_changed()
+        """
+    )
+    op.drop_column("users", "tasks_version")
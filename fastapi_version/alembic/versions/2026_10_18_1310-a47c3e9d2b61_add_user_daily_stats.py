@@ -0,0 +1,139 @@
+"""add_user_daily_stats
+
+Revision ID: a47c3e9d2b61
+Revises: 5e0a2c8d41b7
+Create Date: 2026-10-18 13:10:05.624118
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a47c3e9d2b61"
+down_revision: Union[str, Sequence[str], None] = "5e0a2c8d41b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Вклад задач из таблицы {table} в счетчики дня: +1 (новые строки) или
+# -1 (старые строки) к created в день создания и к completed в день
+# выполнения
+TASKS_DELTA = """
+    SELECT id_users, created_at::date AS day,
+        {sign} AS created, 0 AS completed
+    FROM {table}
+    WHERE created_at IS NOT NULL
+    UNION ALL
+    SELECT id_users, completed_at::date, 0, {sign}
+    FROM {table}
+    WHERE completed AND completed_at IS NOT NULL
+"""
+
+# Прибавляет вклад измененных задач к счетчикам (одна вставка на
+# оператор, в т.ч. на COPY и массовые UPDATE/DELETE)
+UPSERT_DAILY_STATS = """
+    INSERT INTO user_daily_stats AS s (id_users, day, created, completed)
+    SELECT id_users, day, sum(created), sum(completed)
+    FROM ({delta}) AS delta
+    GROUP BY id_users, day
+    HAVING sum(created) <> 0 OR sum(completed) <> 0
+    ON CONFLICT (id_users, day) DO UPDATE
+    SET created = s.created + EXCLUDED.created,
+        completed = s.completed + EXCLUDED.completed
+"""
+
+# Операция -> переходные таблицы триггера (вид, имя, знак вклада)
+TRIGGERS: dict[str, tuple[tuple[str, str, int], ...]] = {
+    "INSERT": (("NEW", "new_tasks", 1),),
+    "UPDATE": (("OLD", "old_tasks", -1), ("NEW", "new_tasks", 1)),
+    "DELETE": (("OLD", "old_tasks", -1),),
+}
+
+
+def daily_stats_trigger(
+    operation: str,
+    tables: tuple[tuple[str, str, int], ...],
+) -> tuple[str, str]:
+    """
+    Возвращает DDL функции и триггера, которые прибавляют к счетчикам
+    вклад задач из переходных таблиц оператора operation.
+    """
+    name = f"user_daily_stats_{operation.lower()}"
+    delta = " UNION ALL ".join(
+        TASKS_DELTA.format(table=table, sign=sign) for _, table, sign in tables
+    )
+    referencing = " ".join(f"{kind} TABLE AS {t}" for kind, t, _ in tables)
+    function = f"""
+        CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+        BEGIN
+            {UPSERT_DAILY_STATS.format(delta=delta)};
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+    trigger = f"""
+        CREATE TRIGGER tasks_{name}
+        AFTER {operation} ON tasks
+        REFERENCING {referencing}
+        FOR EACH STATEMENT EXECUTE FUNCTION {name}()
+    """
+    return function, trigger
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_daily_stats",
+        sa.Column("id_users", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column(
+            "created",
+            sa.Integer(),
+            server_default="0",
+            nullable=False,
+        ),
+        sa.Column(
+            "completed",
+            sa.Integer(),
+            server_default="0",
+            nullable=False,
+        ),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["id_users"],
+            ["users.id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "id_users",
+            "day",
+            name="uq_user_daily_stats_id_users_day",
+        ),
+    )
+
+    # Триггеры уровня оператора с переходными таблицами: счетчики
+    # обновляются одним запросом на оператор, а не на каждую задачу
+    for operation, tables in TRIGGERS.items():
+        function, trigger = daily_stats_trigger(operation, tables)
+        op.execute(function)
+        op.execute(trigger)
+
+    # Счетчики по уже существующим задачам (CREATE TRIGGER заблокировал
+    # изменение задач до конца транзакции)
+    op.execute(
+        UPSERT_DAILY_STATS.format(
+            delta=TASKS_DELTA.format(table="tasks", sign=1),
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for operation in TRIGGERS:
+        name = f"user_daily_stats_{operation.lower()}"
+        op.execute(f"DROP TRIGGER IF EXISTS tasks_{name} ON tasks")
+        op.execute(f"DROP FUNCTION IF EXISTS {name}()")
+    op.drop_table("user_daily_stats")
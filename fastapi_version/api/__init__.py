@@ -1,8 +1,15 @@
+from core.config import settings
 from fastapi import APIRouter
 
+from .stats import router as stats_router
 from .tasks import router as tasks_router
 from .users import router as users_router
+from .v1 import router as v1_router
 
 router = APIRouter()
 router.include_router(users_router)
 router.include_router(tasks_router)
+router.include_router(v1_router)
+# Счетчики кэшей и пулов открыты без авторизации - только по настройке
+if settings.run.stats:
+    router.include_router(stats_router)
@@ -0,0 +1,26 @@
+from typing import Any
+
+from crud.task import tasks_cache
+from crud.user import users_cache
+from fastapi import APIRouter
+from security.hashing import password_hasher
+from security.utils import jwt_cache
+
+router = APIRouter(tags=["Stats"], prefix="/stats")
+
+
+@router.get("")
+async def show_stats() -> dict[str, Any]:
+    """
+    Возвращает счетчики кэшей и пулов процесса (воркера) для подбора их
+    размеров.
+
+    Returns:
+        dict[str, Any]: статистика по каждому кэшу.
+    """
+    return {
+        "users_cache": users_cache.stats(),
+        "jwt_cache": jwt_cache.stats(),
+        "tasks_cache": tasks_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+    }
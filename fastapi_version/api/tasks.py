@@ -1,10 +1,23 @@
-from api.utils import check_auth
+from typing import Any, AsyncIterator
+
+from api.utils import (
+    check_auth,
+    etag_headers,
+    etag_matches,
+    not_modified,
+    parse_task_ids,
+    stream_template,
+    task_ids_token,
+    tasks_etag,
+    tasks_list_url,
+    tasks_query,
+)
 from core.config import settings
 from core.models import Task, User, db_helper
 from core.schemas.tasks import ChangeTaskForm, CreateTaskForm, TaskCreate
 from crud import task as tsk
 from fastapi import APIRouter, Cookie, Depends, HTTPException, Request, status
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import RedirectResponse
 
@@ -76,12 +89,12 @@ async def process_create_task(
         )
 
 
-@router.get("", response_class=HTMLResponse)
+@router.get("", response_class=HTMLResponse, response_model=None)
 async def show_all_tasks(
     request: Request,
     user: User = Depends(check_auth),  # noqa B008
-    session: AsyncSession = Depends(db_helper.session_getter),  # noqa B008
-) -> HTMLResponse:
+    session: AsyncSession = Depends(db_helper.read_session_getter),  # noqa B008
+) -> Response:
     """
     Обрабатывает запрос на просмотр задач пользователя с параметрами
     сортировки, фильтрации и поиска.
@@ -91,9 +104,24 @@ async def show_all_tasks(
     - filter: фильтрация по статусу выполнения
         ('all', 'completed', 'uncompleted').
     - search: поисковый запрос по названию задачи.
+    - after / before: курсор соседней страницы (keyset-пагинация).
 
     В зависимости от выбранных значений подставляет соответствующие
-    SQL-параметры и возвращает HTML-страницу с отфильтрованными задачами.
+    SQL-параметры и возвращает HTML-страницу с отфильтрованными задачами
+    (не более settings.tasks.page_size задач на странице).
+
+    Если включен settings.tasks.stream, страница отдается потоком: шапка
+    уходит клиенту сразу, а строки таблицы отрисовываются по мере чтения
+    из БД в отдельной сессии (сессия зависимости закрывается до отправки
+    тела ответа). Страница из кэша (crud.task.tasks_cache) отдается
+    целиком.
+
+    Только читает БД, поэтому использует реплику (см.
+    DatabaseHelper.read_session_getter).
+
+    Страница отдается с ETag из версии задач пользователя и параметров
+    запроса; если задачи не менялись, на If-None-Match возвращается 304
+    после одного запроса версии.
 
     Args:
         request (Request): объект запроса FastAPI.
@@ -101,71 +129,217 @@ async def show_all_tasks(
         session (AsyncSession): асинхронная сессия SQLAlchemy.
 
     Returns:
-        HTMLResponse: страница с задачами пользователя.
+        Response: страница с задачами пользователя (HTMLResponse или
+            StreamingResponse) или ответ 304.
     """
-    params = request.query_params
+    version = await tsk.get_tasks_version(user.id, session)
+    etag = tasks_etag(request, user.id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    options = tasks_query(request)
+    context = {
+        "request": request,
+        "html_param": settings.tasks,
+        "sort_option": options.sort_option,
+        "filter_option": options.filter_option,
+        "search_query": options.search_query,
+    }
+    query: dict[str, Any] = {"id_users": user.id, **options.page_params()}
+
+    cached: tsk.TaskPage | None = None
+    if settings.tasks.stream:
+        # Страница из кэша отдается целиком: ждать чтения из БД не нужно
+        cached = tsk.get_cached_tasks_page(version=version, **query)
+
+    if settings.tasks.stream and cached is None:
+        # Курсоры страниц заполняются по мере чтения строк
+        page = tsk.TaskPage(tasks=[])
+
+        async def stream_tasks() -> AsyncIterator[Task]:
+            read_session_factory = db_helper.read_session_factory(request)
+            async with read_session_factory() as stream_session:
+                async for task in tsk.iter_tasks_page(
+                    page,
+                    session=stream_session,
+                    version=version,
+                    **query,
+                ):
+                    yield task
+
+        response: Response = stream_template(
+            "tasks.html",
+            {**context, "page": page, "tasks": stream_tasks()},
+        )
+    else:
+        # Получаем страницу задач с учетом всех параметров
+        page = cached or await tsk.get_tasks_page(
+            session=session,
+            version=version,
+            **query,
+        )
+        response = templates.TemplateResponse(
+            "tasks.html",
+            {**context, "page": page, "tasks": page.tasks},
+        )
 
-    # Получаем параметр сортировки из URL (напр., "up" или "down")
-    sort_option = params.get(
-        settings.tasks.SORTED.name, settings.tasks.SORTED.default_html
-    )
-    assert isinstance(sort_option, str)
-    #  Подставляем соответствующее SQL-значение (напр., "created_at")
-    assert isinstance(settings.tasks.SORTED.db_map, dict)
-    sorted_for_db = settings.tasks.SORTED.db_map.get(
-        sort_option, settings.tasks.SORTED.default_db
-    )
+    response.headers.update(etag_headers(etag))
+    return response
 
-    # Получаем параметр фильтрации завершенности (напр., "completed")
-    filter_option = params.get(
-        settings.tasks.FILTER.name, settings.tasks.FILTER.default_html
-    )
-    assert isinstance(filter_option, str)
-    # Подставляем соответствующее значение для фильтрации в бд (напр., "true")
-    assert isinstance(settings.tasks.FILTER.db_map, dict)
-    filter_for_db = settings.tasks.FILTER.db_map.get(
-        filter_option, settings.tasks.FILTER.default_db
-    )
-    assert isinstance(filter_for_db, list)
 
-    # Получаем строку для поиска по названию задачи
-    search_query = params.get(
-        settings.tasks.SEARCH.name, settings.tasks.SEARCH.default_db
-    )
-    assert isinstance(search_query, str)
+@router.post("/bulk", response_class=HTMLResponse, response_model=None)
+async def bulk_tasks_action(
+    request: Request,
+    user: User = Depends(check_auth),  # noqa B008
+    session: AsyncSession = Depends(db_helper.session_getter),  # noqa B008
+) -> HTMLResponse | RedirectResponse:
+    """
+    Обрабатывает действие с задачами, выбранными на странице /tasks.
 
-    # Получаем задачи с учетом всех параметров
-    tasks = await tsk.get_all_tasks(
-        id_users=user.id,
-        sorted_for_db=sorted_for_db,
-        completed=filter_for_db,
-        search_query=search_query,
-        session=session,
+    Получает значения из формы:
+    - ids: ID выбранных задач.
+    - action: действие ('complete', 'uncomplete' или 'delete').
+    - query: параметры списка задач для возврата на ту же страницу.
+
+    Отметка выполнения выполняется одним запросом, после чего
+    происходит редирект на список задач. Для удаления отображается одна
+    страница подтверждения для всех выбранных задач и устанавливается
+    Cookie 'allow_delete_tasks' (см. task_ids_token).
+
+    Args:
+        request (Request): объект запроса FastAPI.
+        user (User): объект текущего пользователя.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        HTMLResponse | RedirectResponse:
+            - RedirectResponse — редирект на страницу со списком задач.
+            - HTMLResponse — страница подтверждения удаления задач.
+    """
+    form_data = await request.form()
+    task_ids = parse_task_ids(form_data.getlist("ids"))
+    action = form_data.get("action")
+    query = form_data.get("query")
+
+    if action in ("complete", "uncomplete"):
+        await tsk.set_tasks_completed(
+            id_users=user.id,
+            task_ids=task_ids,
+            completed=action == "complete",
+            session=session,
+        )
+    elif action == "delete":
+        tasks = await tsk.get_tasks_by_ids(
+            id_users=user.id,
+            task_ids=task_ids,
+            session=session,
+        )
+        if tasks:
+            template_response = templates.TemplateResponse(
+                name="delete_tasks.html",
+                context={
+                    "request": request,
+                    "tasks": tasks,
+                    "query": query or "",
+                },
+            )
+            template_response.set_cookie(
+                key="allow_delete_tasks",
+                value=task_ids_token([task.id for task in tasks]),
+                httponly=True,
+            )
+            return template_response
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown action: {action}",
+        )
+
+    return RedirectResponse(
+        tasks_list_url(query),
+        status_code=status.HTTP_303_SEE_OTHER,
     )
 
-    return templates.TemplateResponse(
-        "tasks.html",
-        {
-            "request": request,
-            "tasks": tasks,
-            "html_param": settings.tasks,
-            "sort_option": sort_option,
-            "filter_option": filter_option,
-            "search_query": search_query,
-        },
+
+@router.post(
+    "/bulk/delete",
+    response_class=HTMLResponse,
+    response_model=None,
+)
+async def bulk_delete_tasks(
+    request: Request,
+    allow_delete_tasks: str | None = Cookie(default=None),  # noqa B008
+    user: User = Depends(check_auth),  # noqa B008
+    session: AsyncSession = Depends(db_helper.session_getter),  # noqa B008
+) -> HTMLResponse | RedirectResponse:
+    """
+    Удаляет выбранные задачи одним запросом, если удаление было
+    подтверждено, или отменяет удаление (кнопка "Нет / отмена").
+
+    Для подтверждения используется Cookie 'allow_delete_tasks', значение
+    которого должно совпадать с хэшем списка ID задач (см.
+    task_ids_token). Если Cookie отсутствует или не совпадает,
+    возвращается страница ошибки (403). После выполнения операции
+    Cookie 'allow_delete_tasks' удаляется.
+
+    Args:
+        request (Request): объект запроса FastAPI.
+        allow_delete_tasks (str | None): Cookie, подтверждающий удаление
+            задач.
+        user (User): объект текущего пользователя.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        HTMLResponse | RedirectResponse:
+            - RedirectResponse — редирект на страницу со списком задач.
+            - HTMLResponse — страница ошибки, если удаление не подтверждено.
+    """
+    form_data = await request.form()
+    task_ids = parse_task_ids(form_data.getlist("ids"))
+
+    if allow_delete_tasks != task_ids_token(task_ids):
+        template_response = templates.TemplateResponse(
+            name="mistakes.html",
+            context={
+                "request": request,
+                "code": 403,
+                "message": "Deletion not confirmed",
+            },
+        )
+        template_response.delete_cookie(
+            key="allow_delete_tasks",
+            httponly=True,
+        )
+        return template_response
+
+    if "confirm" in form_data:
+        await tsk.delete_tasks(
+            id_users=user.id,
+            task_ids=task_ids,
+            session=session,
+        )
+
+    response = RedirectResponse(
+        tasks_list_url(form_data.get("query")),
+        status_code=status.HTTP_303_SEE_OTHER,
     )
+    response.delete_cookie(key="allow_delete_tasks", httponly=True)
+    return response
 
 
-@router.get("/{task_id}", response_class=HTMLResponse)
+@router.get("/{task_id}", response_class=HTMLResponse, response_model=None)
 async def show_task_id_form(
     task_id: int,
     request: Request,
     user: User = Depends(check_auth),  # noqa B008
-    session: AsyncSession = Depends(db_helper.session_getter),  # noqa B008
-) -> HTMLResponse:
+    session: AsyncSession = Depends(db_helper.read_session_getter),  # noqa B008
+) -> Response:
     """
     Отображает страницу задачу по ID.
 
+    Страница отдается с ETag из версии задач пользователя; если задачи не
+    менялись, на If-None-Match возвращается 304.
+
     Args:
         task_id (int): ID задачи.
         request (Request): объект запроса FastAPI.
@@ -173,8 +347,13 @@ async def show_task_id_form(
         session (AsyncSession): асинхронная сессия SQLAlchemy.
 
     Returns:
-        HTMLResponse: страница с задачами пользователя.
+        Response: страница задачи (HTMLResponse) или ответ 304.
     """
+    version = await tsk.get_tasks_version(user.id, session)
+    etag = tasks_etag(request, user.id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     form = ChangeTaskForm()
     edit_mode = False
     task = await tsk.get_task_by_id(
@@ -183,7 +362,7 @@ async def show_task_id_form(
         session=session,
     )
 
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         name="task_id.html",
         context={
             "request": request,
@@ -192,6 +371,8 @@ async def show_task_id_form(
             "form": form,
         },
     )
+    response.headers.update(etag_headers(etag))
+    return response
 
 
 @router.post("/{task_id}", response_class=HTMLResponse)
@@ -223,50 +404,32 @@ async def show_task_id_change(
     form = ChangeTaskForm(form_data)
     edit_mode = False
 
-    task = await tsk.get_task_by_id(
-        id_users=user.id,
-        task_id=task_id,
-        session=session,
-    )
-    if task is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task with id={task_id} not found",
-        )
-
-    if "change" in form_data:
-        edit_mode = True
-
-    elif "save" in form_data and form.validate():
-        edit_mode = False
+    task: Task | None
+    if "save" in form_data and form.validate():
         describe = form.describe.data
         assert isinstance(describe, str)
 
-        completed = form_data.get("completed")
-
-        if completed == "True":
-            await tsk.complete_task_by_id(
-                id_users=user.id,
-                task_id=task_id,
-                session=session,
-            )
-
-        else:
-            await tsk.not_completed_task_by_id(
-                id_users=user.id,
-                task_id=task_id,
-                session=session,
-            )
-
-        await tsk.change_describe_task_by_id(
+        # Описание и статус сохраняются одним UPDATE ... RETURNING
+        task = await tsk.save_task(
             id_users=user.id,
             task_id=task_id,
             describe=describe,
+            completed=form_data.get("completed") == "True",
             session=session,
         )
 
-        task: Task | None = await tsk.get_task_by_id(  # type: ignore[no-redef]
-            id_users=user.id, task_id=task_id, session=session
+    else:
+        edit_mode = "change" in form_data
+        task = await tsk.get_task_by_id(
+            id_users=user.id,
+            task_id=task_id,
+            session=session,
+        )
+
+    if task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with id={task_id} not found",
         )
 
     return templates.TemplateResponse(
@@ -285,7 +448,7 @@ async def before_delete_task_by_id(
     task_id: int,
     request: Request,
     user: User = Depends(check_auth),  # noqa B008
-    session: AsyncSession = Depends(db_helper.session_getter),  # noqa B008
+    session: AsyncSession = Depends(db_helper.read_session_getter),  # noqa B008
 ) -> HTMLResponse:
     """
     Отображает страницу с подтверждением удаления задачи по ееID.
@@ -1,11 +1,14 @@
 from api.utils import check_auth
+from core.analytics import WEEKDAYS, format_duration
 from core.config import settings
 from core.models import User, db_helper
 from core.schemas.users import LoginForm, RegistrationForm, UserCreate
+from crud.task import get_completion_report, get_daily_stats
 from crud.user import check_name_exists, create_user
 from fastapi import APIRouter, Cookie, Depends, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from security.utils import create_jwt_token, get_password_hash, verify_password
+from security.hashing import password_hasher
+from security.utils import create_jwt_token
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(tags=["Users"])
@@ -58,7 +61,7 @@ async def process_registration(
             str(form.email.data),
             str(form.password.data),
         )
-        hashed_password = get_password_hash(password)
+        hashed_password = await password_hasher.hash(password)
         new_user = UserCreate(
             name=name,
             email=email,
@@ -148,7 +151,7 @@ async def process_login(
         if not (user := await check_name_exists(session, name)):
             raise auth_exception
 
-        if not verify_password(password, user.hashed_password):
+        if not await password_hasher.verify(password, user.hashed_password):
             raise auth_exception
 
         token = create_jwt_token(user.id)
@@ -187,17 +190,57 @@ async def logout_user(
 async def user_page(
     request: Request,
     user: User = Depends(check_auth),  # noqa B008
+    session: AsyncSession = Depends(db_helper.session_getter),  # noqa B008
 ) -> HTMLResponse:
     """
-    Отображает личную страницу пользователя (home page).
+    Отображает личную страницу пользователя (home page) со статистикой
+    созданных и выполненных задач за последние дни.
 
     Args:
         request (Request): объект запроса FastAPI.
         user (User): объект текущего пользователя.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
 
     Returns:
         HTMLResponse: HTML-страница пользователя.
     """
+    stats = await get_daily_stats(
+        user.id,
+        settings.tasks.stats_days,
+        session,
+    )
+    return templates.TemplateResponse(
+        name="user_page.html",
+        context={"request": request, "name": user.name, "stats": stats},
+    )
+
+
+@router.get("/users/report", response_class=HTMLResponse)
+async def completion_report_page(
+    request: Request,
+    user: User = Depends(check_auth),  # noqa B008
+    session: AsyncSession = Depends(db_helper.session_getter),  # noqa B008
+) -> HTMLResponse:
+    """
+    Отображает отчет о выполнении задач пользователя: процентили и
+    гистограмму времени выполнения, распределение по дням недели и часам
+    и серии дней подряд (см. crud.task.get_completion_report).
+
+    Args:
+        request (Request): объект запроса FastAPI.
+        user (User): объект текущего пользователя.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        HTMLResponse: HTML-страница отчета.
+    """
+    report = await get_completion_report(user.id, session)
     return templates.TemplateResponse(
-        name="user_page.html", context={"request": request, "name": user.name}
+        name="report.html",
+        context={
+            "request": request,
+            "report": report,
+            "weekdays": WEEKDAYS,
+            "format_duration": format_duration,
+        },
     )
@@ -1,17 +1,80 @@
+import datetime
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator
+
+from core import static
+from core.config import settings
 from core.models import User, db_helper
-from crud.user import get_user_by_id
-from fastapi import Cookie, Depends, HTTPException, Request
+from core.static import static_url
+from crud.user import get_user_by_id_cached
+from fastapi import Cookie, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from jinja2 import Environment, FileSystemBytecodeCache
 from security.utils import get_user_id_from_token
 from sqlalchemy.ext.asyncio import AsyncSession
 
+try:
+    import orjson
+except ImportError:  # orjson входит в зависимости; json - запасной вариант
+    orjson = None  # type: ignore[assignment]
+
+# URL статики с хэшем содержимого (см. core.static)
+settings.templates.env.globals["static_url"] = static_url
+
+# Окружение Jinja2 с async-шаблонами для потоковой отрисовки страниц.
+# Собственный кэш шаблонов: скомпилированные sync-шаблоны для него не годятся
+stream_env = settings.templates.env.overlay(enable_async=True, cache_size=400)
+
+
+def setup_templates() -> None:
+    """
+    Подключает к окружениям Jinja2 кэш байткода (settings.jinja) и, если
+    включено, заранее компилирует все шаблоны, чтобы первые запросы после
+    запуска воркера не тратили время на компиляцию.
+
+    Окружения sync и async компилируют шаблоны в разный код, поэтому у
+    каждого своя папка кэша.
+    """
+    environments: dict[str, Environment] = {
+        "sync": settings.templates.env,
+        "async": stream_env,
+    }
+    for kind, env in environments.items():
+        if settings.jinja.bytecode_cache_dir is not None:
+            directory = settings.jinja.bytecode_cache_dir / kind
+            directory.mkdir(parents=True, exist_ok=True)
+            env.bytecode_cache = FileSystemBytecodeCache(str(directory))
+
+        if settings.jinja.preload:
+            for name in env.list_templates():
+                env.get_template(name)
+
+
+async def _get_user(token: str | None, session: AsyncSession) -> User | None:
+    """
+    Возвращает пользователя по JWT-токену из cookie или None, если токена
+    нет или пользователь не существует. Пользователь берется из кэша
+    (см. get_user_by_id_cached).
+    """
+    if not token:
+        return None
+
+    user_id = get_user_id_from_token(token)
+    assert isinstance(user_id, int)
+    return await get_user_by_id_cached(session, user_id)
+
 
 async def check_auth(
     request: Request,
     token=Cookie(default=None),  # noqa B008
-    session: AsyncSession = Depends(db_helper.session_getter),  # noqa B008
+    session: AsyncSession = Depends(db_helper.read_session_getter),  # noqa B008
 ) -> User | None:
     """
     Проверяет наличие токена в cookie и существование пользователя по ID.
+    Пользователь берется из кэша (см. get_user_by_id_cached).
 
     Args:
         request (Request): объект запроса FastAPI.
@@ -22,12 +85,348 @@ async def check_auth(
         User | None: объект пользователя, если токен валиден и пользователь
         существует, иначе вызывает HTTPException с редиректом на /login.
     """
-    if not token:
+    if not (user := await _get_user(token, session)):
         raise HTTPException(status_code=303, headers={"Location": "/login"})
 
-    user_id = get_user_id_from_token(token)
-    assert isinstance(user_id, int)
-    if not (user := await get_user_by_id(session, user_id)):
-        raise HTTPException(status_code=303, headers={"Location": "/login"})
+    return user
+
+
+async def check_api_auth(
+    token=Cookie(default=None),  # noqa B008
+    session: AsyncSession = Depends(db_helper.read_session_getter),  # noqa B008
+) -> User:
+    """
+    Проверяет авторизацию запроса к JSON API (см. check_auth). Вместо
+    редиректа на /login отвечает 401.
+
+    Args:
+        token (str | None): JWT-токен из cookie; None, если токен отсутствует.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        User: объект пользователя, если токен валиден и пользователь
+        существует, иначе вызывает HTTPException 401.
+    """
+    if not (user := await _get_user(token, session)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+        )
 
     return user
+
+
+@dataclass
+class TasksQuery:
+    """
+    Параметры списка задач из URL (см. settings.tasks).
+
+    Attributes:
+        sort_option (str): сортировка из URL (напр., "up").
+        filter_option (str): фильтр по статусу из URL (напр., "all").
+        sorted_for_db (str): поле для сортировки в SQL-запросе.
+        completed (list[bool]): статусы задач для фильтрации.
+        search_query (str): поисковая строка (поиск по названию задачи).
+        after (str): курсор, после которого начинается страница.
+        before (str): курсор, перед которым заканчивается страница.
+    """
+
+    sort_option: str
+    filter_option: str
+    sorted_for_db: str
+    completed: list[bool]
+    search_query: str
+    after: str
+    before: str
+
+    def page_params(self) -> dict[str, Any]:
+        """
+        Параметры выборки страницы задач (см. crud.task.get_tasks_page).
+        """
+        return {
+            "sorted_for_db": self.sorted_for_db,
+            "completed": self.completed,
+            "search_query": self.search_query,
+            "after": self.after,
+            "before": self.before,
+        }
+
+
+def tasks_query(request: Request) -> TasksQuery:
+    """
+    Получает параметры сортировки, фильтрации, поиска и курсоры страниц
+    из URL. Неизвестные значения заменяются значениями по умолчанию.
+
+    Args:
+        request (Request): объект запроса FastAPI.
+
+    Returns:
+        TasksQuery: параметры списка задач.
+    """
+    params = request.query_params
+
+    # Получаем параметр сортировки из URL (напр., "up" или "down")
+    sort_option = params.get(
+        settings.tasks.SORTED.name, settings.tasks.SORTED.default_html
+    )
+    assert isinstance(sort_option, str)
+    #  Подставляем соответствующее SQL-значение (напр., "created_at")
+    assert isinstance(settings.tasks.SORTED.db_map, dict)
+    sorted_for_db = settings.tasks.SORTED.db_map.get(
+        sort_option, settings.tasks.SORTED.default_db
+    )
+    assert isinstance(sorted_for_db, str)
+
+    # Получаем параметр фильтрации завершенности (напр., "completed")
+    filter_option = params.get(
+        settings.tasks.FILTER.name, settings.tasks.FILTER.default_html
+    )
+    assert isinstance(filter_option, str)
+    # Подставляем соответствующее значение для фильтрации в бд (напр., "true")
+    assert isinstance(settings.tasks.FILTER.db_map, dict)
+    filter_for_db = settings.tasks.FILTER.db_map.get(
+        filter_option, settings.tasks.FILTER.default_db
+    )
+    assert isinstance(filter_for_db, list)
+
+    # Получаем строку для поиска по названию задачи
+    search_query = params.get(
+        settings.tasks.SEARCH.name, settings.tasks.SEARCH.default_db
+    )
+    assert isinstance(search_query, str)
+
+    # Получаем курсоры страниц (пустая строка - первая страница)
+    after = params.get(
+        settings.tasks.AFTER.name,
+        settings.tasks.AFTER.default_db,
+    )
+    assert isinstance(after, str)
+    before = params.get(
+        settings.tasks.BEFORE.name,
+        settings.tasks.BEFORE.default_db,
+    )
+    assert isinstance(before, str)
+
+    return TasksQuery(
+        sort_option=sort_option,
+        filter_option=filter_option,
+        sorted_for_db=sorted_for_db,
+        completed=filter_for_db,
+        search_query=search_query,
+        after=after,
+        before=before,
+    )
+
+
+async def _buffered(
+    chunks: AsyncIterator[str],
+    chunk_size: int,
+) -> AsyncIterator[str]:
+    """
+    Склеивает мелкие фрагменты отрисовки шаблона в блоки не меньше
+    chunk_size символов, чтобы не отправлять клиенту каждый фрагмент
+    отдельным сообщением.
+    """
+    buffer: list[str] = []
+    size = 0
+    async for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def stream_template(
+    name: str,
+    context: dict[str, Any],
+    chunk_size: int = 4096,
+) -> StreamingResponse:
+    """
+    Отрисовывает шаблон потоком: начало страницы уходит клиенту сразу,
+    не дожидаясь отрисовки всего шаблона.
+
+    Асинхронные итераторы в контексте (напр., строки из БД) читаются по
+    мере отрисовки, поэтому страница целиком в памяти не собирается.
+
+    Args:
+        name (str): имя шаблона.
+        context (dict[str, Any]): контекст шаблона.
+        chunk_size (int): минимальный размер отправляемого блока.
+
+    Returns:
+        StreamingResponse: потоковый HTML-ответ.
+    """
+    template = stream_env.get_template(name)
+    return StreamingResponse(
+        _buffered(template.generate_async(context), chunk_size),
+        media_type="text/html",
+    )
+
+
+@lru_cache(maxsize=1)
+def build_id() -> str:
+    """
+    Возвращает идентификатор сборки: хэш manifest статики и исходников
+    шаблонов. Меняется после деплоя с новой разметкой или статикой.
+
+    Вычисляется при первом обращении, когда статика уже собрана.
+
+    Returns:
+        str: идентификатор сборки.
+    """
+    env = settings.templates.env
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(json.dumps(static.manifest, sort_keys=True).encode())
+    assert env.loader is not None
+    for name in sorted(env.list_templates()):
+        source, _, _ = env.loader.get_source(env, name)
+        digest.update(name.encode())
+        digest.update(source.encode())
+    return digest.hexdigest()
+
+
+def tasks_etag(request: Request, user_id: int, version: int) -> str:
+    """
+    Строит слабый ETag страницы задач из версии задач пользователя,
+    пути и параметров запроса (сортировка, фильтр, поиск, курсоры).
+
+    ID пользователя входит в ETag, чтобы страница одного пользователя не
+    подтвердилась для другого в том же браузере, а идентификатор сборки
+    (build_id) - чтобы после деплоя браузер не показывал старую разметку.
+
+    Args:
+        request (Request): объект запроса FastAPI.
+        user_id (int): ID пользователя.
+        version (int): версия задач пользователя.
+
+    Returns:
+        str: значение заголовка ETag.
+    """
+    query = sorted(request.query_params.multi_items())
+    key = f"{build_id()}:{user_id}:{request.url.path}?{query}"
+    digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+    return f'W/"{version}-{digest}"'
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    """
+    Заголовки страницы с ETag: браузер хранит ее, но перед показом
+    каждый раз перепроверяет (If-None-Match).
+    """
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Проверяет, совпадает ли ETag с одним из значений If-None-Match
+    (слабое сравнение).
+
+    Args:
+        request (Request): объект запроса FastAPI.
+        etag (str): текущий ETag страницы.
+
+    Returns:
+        bool: True, если у клиента актуальная версия страницы.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Ответ 304 Not Modified без тела.
+
+    Args:
+        etag (str): текущий ETag страницы.
+
+    Returns:
+        Response: ответ 304.
+    """
+    return Response(status_code=304, headers=etag_headers(etag))
+
+
+def parse_task_ids(values: list[Any]) -> list[int]:
+    """
+    Разбирает ID задач, выбранных на странице /tasks (поля формы ids).
+
+    Args:
+        values (list[Any]): значения полей формы.
+
+    Returns:
+        list[int]: ID задач по возрастанию, без повторов.
+    """
+    try:
+        task_ids = sorted({int(value) for value in values})
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid task id",
+        )
+    if len(task_ids) > settings.api.bulk_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many tasks: {len(task_ids)}",
+        )
+    return task_ids
+
+
+def task_ids_token(task_ids: list[int]) -> str:
+    """
+    Значение Cookie 'allow_delete_tasks' для подтверждения удаления
+    выбранных задач: хэш списка ID (сам список может не поместиться в
+    Cookie).
+
+    Args:
+        task_ids (list[int]): ID задач (см. parse_task_ids).
+
+    Returns:
+        str: хэш списка ID.
+    """
+    key = ",".join(map(str, task_ids))
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def tasks_list_url(query: Any) -> str:
+    """
+    Адрес страницы /tasks с параметрами списка (сортировка, фильтр,
+    поиск), с которой были выбраны задачи (поле формы query).
+    """
+    return f"/tasks?{query}" if isinstance(query, str) and query else "/tasks"
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Сериализация значений, которые не поддерживает json (без orjson).
+    """
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON-ответ, сериализуемый orjson (в несколько раз быстрее json и сам
+    сериализует datetime); без orjson - стандартным json.
+
+    Содержимое отдается как есть, без проверки и преобразования
+    response_model, поэтому обработчик должен сам собрать словари.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=_json_default,
+        ).encode("utf-8")
@@ -0,0 +1,6 @@
+from fastapi import APIRouter
+
+from .tasks import router as tasks_router
+
+router = APIRouter(prefix="/api/v1")
+router.include_router(tasks_router)
@@ -0,0 +1,359 @@
+from dataclasses import asdict
+from typing import Any, AsyncIterator
+
+from api.utils import (
+    FastJSONResponse,
+    check_api_auth,
+    etag_headers,
+    etag_matches,
+    not_modified,
+    tasks_etag,
+    tasks_query,
+)
+from core.compression import gzip_stream
+from core.config import settings
+from core.csv_import import ImportFormatError
+from core.models import Task, User, db_helper
+from core.schemas.tasks import CreateTaskForm, TaskBulkCreate, TaskCreate
+from crud import task as tsk
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter(tags=["Tasks API"], prefix="/tasks")
+
+# Поля задачи, доступные в ответах API (параметр fields)
+TASK_FIELDS = (
+    "id",
+    "name",
+    "describe",
+    "created_at",
+    "completed",
+    "completed_at",
+)
+
+# Формат выгрузки -> тип содержимого
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def parse_fields(fields: str) -> tuple[str, ...]:
+    """
+    Разбирает параметр fields - список полей задачи через запятую.
+
+    Args:
+        fields (str): значение параметра; пустая строка - все поля.
+
+    Returns:
+        tuple[str, ...]: поля задачи в порядке перечисления, без повторов.
+    """
+    if not fields:
+        return TASK_FIELDS
+
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",")))
+    unknown = [name for name in names if name not in TASK_FIELDS]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. "
+            f"Available: {', '.join(TASK_FIELDS)}",
+        )
+    return names
+
+
+def task_to_dict(
+    task: Task | dict[str, Any],
+    fields: tuple[str, ...],
+) -> dict[str, Any]:
+    """
+    Собирает словарь с выбранными полями задачи для JSON-ответа.
+
+    Args:
+        task (Task | dict[str, Any]): задача или ее строка со страницы
+            задач (см. crud.task.TaskPage).
+        fields (tuple[str, ...]): поля задачи (см. parse_fields).
+
+    Returns:
+        dict[str, Any]: поле задачи -> значение.
+    """
+    if isinstance(task, dict):
+        return {field: task[field] for field in fields}
+    return {field: getattr(task, field) for field in fields}
+
+
+def validate_new_task(
+    item: Any,
+    id_users: int,
+) -> tuple[TaskCreate | None, dict[str, Any]]:
+    """
+    Проверяет данные одной задачи из запроса массового создания по
+    правилам формы создания задачи (CreateTaskForm).
+
+    Args:
+        item (Any): данные задачи из JSON ({"name": ..., "describe": ...}).
+        id_users (int): ID пользователя, создающего задачу.
+
+    Returns:
+        tuple[TaskCreate | None, dict[str, Any]]: задача (None, если
+            данные некорректны) и ошибки по полям.
+    """
+    if not isinstance(item, dict):
+        return None, {"task": ["Task must be an object"]}
+
+    errors: dict[str, Any] = {
+        field: ["Field must be a string"]
+        for field in ("name", "describe")
+        if not isinstance(item.get(field, ""), str)
+    }
+    if errors:
+        return None, errors
+
+    form = CreateTaskForm(data=item)
+    if not form.validate():
+        return None, dict(form.errors)
+
+    task = TaskCreate(
+        id_users=id_users,
+        name=str(form.name.data),
+        describe=str(form.describe.data),
+    )
+    return task, {}
+
+
+@router.post("/bulk", response_class=FastJSONResponse, response_model=None)
+async def create_tasks_bulk(
+    body: TaskBulkCreate,
+    user: User = Depends(check_api_auth),  # noqa B008
+    session: AsyncSession = Depends(db_helper.session_getter),  # noqa B008
+) -> Response:
+    """
+    Создает пакет задач пользователя одним запросом к БД в одной
+    транзакции (см. crud.task.create_tasks).
+
+    Каждая задача проверяется отдельно: некорректные задачи пропускаются
+    и перечисляются в ответе, корректные создаются.
+
+    Args:
+        body (TaskBulkCreate): {"tasks": [{"name": ..., "describe": ...}]}.
+        user (User): объект текущего пользователя.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        Response: {"created": <число созданных задач>,
+            "errors": [{"index": <номер задачи>, "errors": {...}}]}.
+    """
+    if len(body.tasks) > settings.api.bulk_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many tasks: {len(body.tasks)} "
+            f"(max {settings.api.bulk_max_size})",
+        )
+
+    tasks: list[TaskCreate] = []
+    errors: list[dict[str, Any]] = []
+    for index, item in enumerate(body.tasks):
+        task, item_errors = validate_new_task(item, user.id)
+        if task is None:
+            errors.append({"index": index, "errors": item_errors})
+        else:
+            tasks.append(task)
+
+    created = await tsk.create_tasks(tasks, session)
+    return FastJSONResponse({"created": created, "errors": errors})
+
+
+@router.post("/import", response_class=FastJSONResponse, response_model=None)
+async def import_tasks(
+    request: Request,
+    user: User = Depends(check_api_auth),  # noqa B008
+    session: AsyncSession = Depends(db_helper.session_getter),  # noqa B008
+) -> Response:
+    """
+    Импортирует задачи пользователя из CSV-файла в теле запроса
+    (см. crud.task.import_tasks).
+
+    Первая строка файла - заголовок: обязательны столбцы name и describe,
+    необязательны created_at, completed и completed_at (формат выгрузки
+    /api/v1/tasks/export?format=csv). Строки проверяются по правилам
+    формы создания задачи: некорректные пропускаются и перечисляются в
+    ответе, корректные создаются.
+
+    Args:
+        request (Request): объект запроса FastAPI (тело - файл CSV).
+        user (User): объект текущего пользователя.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        Response: {"imported": <число созданных задач>,
+            "rejected": <число отклоненных строк>,
+            "errors": [{"line": <номер строки>, "errors": {...}}]};
+            400 - файл нельзя разобрать (задачи не создаются).
+    """
+    try:
+        report = await tsk.import_tasks(user.id, request.stream(), session)
+    except ImportFormatError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error),
+        )
+    return FastJSONResponse(asdict(report))
+
+
+@router.get("", response_class=FastJSONResponse, response_model=None)
+async def list_tasks(
+    request: Request,
+    fields: str = Query(default=""),  # noqa B008
+    limit: int = Query(  # noqa B008
+        default=settings.tasks.page_size,
+        ge=1,
+        le=settings.api.max_page_size,
+    ),
+    user: User = Depends(check_api_auth),  # noqa B008
+    session: AsyncSession = Depends(db_helper.read_session_getter),  # noqa B008
+) -> Response:
+    """
+    Возвращает страницу задач пользователя в JSON.
+
+    Параметры сортировки, фильтрации, поиска и курсоры страниц те же,
+    что у страницы /tasks (sorted, filter, search, after, before).
+    Дополнительно:
+    - fields: поля задачи через запятую (по умолчанию все); столбцы,
+        которые не запрошены, не читаются из БД.
+    - limit: количество задач на странице.
+
+    Как и страница /tasks, ответ отдается с ETag из версии задач
+    пользователя и параметров запроса.
+
+    Args:
+        request (Request): объект запроса FastAPI.
+        fields (str): поля задачи через запятую.
+        limit (int): количество задач на странице.
+        user (User): объект текущего пользователя.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        Response: {"tasks": [...], "next_cursor": ..., "prev_cursor": ...}
+            (FastJSONResponse) или ответ 304.
+    """
+    version = await tsk.get_tasks_version(user.id, session)
+    etag = tasks_etag(request, user.id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    columns = parse_fields(fields)
+    page = await tsk.get_tasks_page(
+        id_users=user.id,
+        session=session,
+        limit=limit,
+        columns=columns,
+        version=version,
+        **tasks_query(request).page_params(),
+    )
+    content = {
+        "tasks": [task_to_dict(task, columns) for task in page.tasks],
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+    }
+    return FastJSONResponse(content, headers=etag_headers(etag))
+
+
+@router.get("/export", response_model=None)
+async def export_tasks(
+    request: Request,
+    export_format: str = Query(  # noqa B008
+        default="csv",
+        alias="format",
+        pattern="^(csv|ndjson)$",
+    ),
+    gzip: bool = Query(default=False),  # noqa B008
+    user: User = Depends(check_api_auth),  # noqa B008
+) -> StreamingResponse:
+    """
+    Выгружает все задачи пользователя файлом CSV или NDJSON
+    (см. crud.task.iter_tasks_export).
+
+    Файл отдается потоком прямо из COPY ... TO STDOUT в отдельной сессии
+    чтения (сессии зависимостей закрываются до отправки тела ответа);
+    память не зависит от числа задач.
+
+    Args:
+        request (Request): объект запроса FastAPI.
+        export_format (str): формат выгрузки (параметр format: "csv" или
+            "ndjson").
+        gzip (bool): сжать файл gzip на лету.
+        user (User): объект текущего пользователя.
+
+    Returns:
+        StreamingResponse: файл выгрузки (tasks.csv, tasks.ndjson или
+            tasks.*.gz).
+    """
+
+    async def export() -> AsyncIterator[bytes]:
+        read_session_factory = db_helper.read_session_factory(request)
+        async with read_session_factory() as session:
+            async for chunk in tsk.iter_tasks_export(
+                user.id,
+                export_format,
+                session,
+            ):
+                yield chunk
+
+    body = export()
+    filename = f"tasks.{export_format}"
+    media_type = EXPORT_MEDIA_TYPES[export_format]
+    if gzip:
+        body = gzip_stream(body, settings.compression.gzip_level)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/{task_id}", response_class=FastJSONResponse, response_model=None)
+async def get_task(
+    task_id: int,
+    request: Request,
+    fields: str = Query(default=""),  # noqa B008
+    user: User = Depends(check_api_auth),  # noqa B008
+    session: AsyncSession = Depends(db_helper.read_session_getter),  # noqa B008
+) -> Response:
+    """
+    Возвращает задачу пользователя по ID в JSON.
+
+    Args:
+        task_id (int): ID задачи.
+        request (Request): объект запроса FastAPI.
+        fields (str): поля задачи через запятую (по умолчанию все).
+        user (User): объект текущего пользователя.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        Response: выбранные поля задачи (FastJSONResponse) или ответ 304.
+    """
+    version = await tsk.get_tasks_version(user.id, session)
+    etag = tasks_etag(request, user.id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    columns = parse_fields(fields)
+    task = await tsk.get_task_by_id(
+        id_users=user.id,
+        task_id=task_id,
+        session=session,
+    )
+    if task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with id={task_id} not found",
+        )
+
+    return FastJSONResponse(
+        task_to_dict(task, columns),
+        headers=etag_headers(etag),
+    )
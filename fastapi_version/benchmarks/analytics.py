@@ -0,0 +1,240 @@
+"""
+Бенчмарк отчета о выполнении задач (crud.task.get_completion_report).
+
+Создает пользователя с заданным числом задач (INSERT ... SELECT
+generate_series, 80% задач выполнены за случайное время до 10 дней за
+последние 2 года) и строит отчет тремя способами:
+- columnar - два массива в одном запросе (array_send) и NumPy;
+- rows - строки (created_at, completed_at) и расчет на Python;
+- orm - ORM-объекты Task и расчет на Python.
+Выводит время чтения, расчета и общее; результаты сверяются. В конце
+пользователь и его задачи удаляются.
+
+Запуск из папки fastapi_version (нужна БД из .env):
+    python -m benchmarks.analytics [число задач]
+"""
+
+import asyncio
+import bisect
+import datetime
+import math
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+from typing import Any, Awaitable, Callable
+
+from core.analytics import (
+    DURATION_BINS,
+    PERCENTILES,
+    CompletionReport,
+    completion_report,
+    decode_float8_array,
+)
+from core.models import Task, db_helper
+from crud import task as tsk
+from sqlalchemy import select, text
+from sqlalchemy.orm import load_only
+
+Times = list[tuple[datetime.datetime, datetime.datetime]]
+
+
+async def prepare_user(count: int) -> int:
+    """
+    Создает пользователя с count задачами; возвращает его ID.
+    """
+    async with db_helper.session_factory() as session:
+        user_id = await session.scalar(
+            text(
+                "INSERT INTO users (name, email, hashed_password) "
+                "VALUES (:name, 'bench@mail.ru', '-') RETURNING id"
+            ),
+            {"name": f"b{uuid.uuid4().hex[:8]}"},
+        )
+        await session.execute(
+            text(
+                "INSERT INTO tasks (id_users, name, describe, created_at, "
+                "completed, completed_at) "
+                "SELECT :user_id, 'task ' || n, 'описание', created_at, "
+                "n % 5 <> 0, CASE WHEN n % 5 <> 0 "
+                "THEN created_at + random() * interval '10 days' END "
+                "FROM (SELECT n, localtimestamp - random() "
+                "* interval '730 days' AS created_at "
+                "FROM generate_series(1, :count) AS n) AS t"
+            ),
+            {"user_id": user_id, "count": count},
+        )
+        await session.commit()
+    assert isinstance(user_id, int)
+    return user_id
+
+
+async def drop_user(user_id: int) -> None:
+    async with db_helper.session_factory() as session:
+        params = {"user_id": user_id}
+        await session.execute(
+            text("DELETE FROM tasks WHERE id_users = :user_id"),
+            params,
+        )
+        await session.execute(
+            text("DELETE FROM users WHERE id = :user_id"),
+            params,
+        )
+        await session.commit()
+
+
+def python_report(times: Times, today: datetime.date) -> CompletionReport:
+    """
+    Тот же отчет, что core.analytics.completion_report, циклами Python
+    по задачам (для сравнения и сверки результатов).
+    """
+    report = CompletionReport(completed=len(times))
+    durations = [
+        seconds
+        for created_at, completed_at in times
+        if (seconds := (completed_at - created_at).total_seconds()) >= 0
+    ]
+    if durations:
+        quantiles = statistics.quantiles(durations, n=100, method="inclusive")
+        report.percentiles = [(p, quantiles[p - 1]) for p in PERCENTILES]
+        report.mean = statistics.fmean(durations)
+    upper_bounds = [upper for _, upper in DURATION_BINS[:-1]]
+    counts = Counter(
+        bisect.bisect_right(upper_bounds, seconds) for seconds in durations
+    )
+    report.histogram = [
+        (name, counts[index]) for index, (name, _) in enumerate(DURATION_BINS)
+    ]
+
+    heatmap = [[0] * 24 for _ in range(7)]
+    days = set()
+    for _, completed_at in times:
+        heatmap[completed_at.weekday()][completed_at.hour] += 1
+        days.add(completed_at.date())
+    report.heatmap = heatmap
+    report.heatmap_max = max(max(row) for row in heatmap)
+
+    report.active_days = len(days)
+    streak = 0
+    previous = None
+    for day in sorted(days):
+        streak = streak + 1 if previous == day - datetime.timedelta(1) else 1
+        report.longest_streak = max(report.longest_streak, streak)
+        previous = day
+    if previous and previous >= today - datetime.timedelta(1):
+        report.current_streak = streak
+    return report
+
+
+async def columnar(user_id: int) -> tuple[float, CompletionReport]:
+    async with db_helper.session_factory() as session:
+        started = time.perf_counter()
+        result = await session.execute(
+            tsk._COMPLETION_TIMES,
+            {"user_id": user_id},
+        )
+        created_at, completed_at = result.one()
+        fetched = time.perf_counter() - started
+        report = completion_report(
+            decode_float8_array(created_at),
+            decode_float8_array(completed_at),
+            datetime.date.today(),
+        )
+    return fetched, report
+
+
+async def rows(user_id: int) -> tuple[float, CompletionReport]:
+    async with db_helper.session_factory() as session:
+        started = time.perf_counter()
+        result = await session.execute(
+            select(Task.created_at, Task.completed_at).where(
+                Task.id_users == user_id,
+                Task.completed,
+                Task.completed_at.is_not(None),
+            )
+        )
+        times: Times = [
+            (created_at, completed_at)
+            for created_at, completed_at in result
+            if completed_at is not None
+        ]
+        fetched = time.perf_counter() - started
+    return fetched, python_report(times, datetime.date.today())
+
+
+async def orm(user_id: int) -> tuple[float, CompletionReport]:
+    async with db_helper.session_factory() as session:
+        started = time.perf_counter()
+        tasks = await session.scalars(
+            select(Task)
+            .options(load_only(Task.created_at, Task.completed_at))
+            .where(
+                Task.id_users == user_id,
+                Task.completed,
+                Task.completed_at.is_not(None),
+            )
+        )
+        times: Times = [
+            (task.created_at, task.completed_at)
+            for task in tasks
+            if task.completed_at is not None
+        ]
+        fetched = time.perf_counter() - started
+    return fetched, python_report(times, datetime.date.today())
+
+
+def check(expected: CompletionReport, report: CompletionReport) -> None:
+    """
+    Сверяет отчеты (процентили и среднее - с точностью до 1 мс).
+    """
+    assert report.histogram == expected.histogram
+    assert report.heatmap == expected.heatmap
+    assert report.active_days == expected.active_days
+    assert report.longest_streak == expected.longest_streak
+    assert report.current_streak == expected.current_streak
+    assert math.isclose(report.mean, expected.mean, abs_tol=1e-3)
+    for (_, value), (_, expected_value) in zip(
+        report.percentiles,
+        expected.percentiles,
+    ):
+        assert math.isclose(value, expected_value, abs_tol=1e-3)
+
+
+async def measure(
+    name: str,
+    method: Callable[[int], Awaitable[tuple[float, CompletionReport]]],
+    user_id: int,
+) -> CompletionReport:
+    started = time.perf_counter()
+    fetched, report = await method(user_id)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<9} tasks={report.completed}  fetch={fetched:7.2f} s  "
+        f"compute={elapsed - fetched:7.2f} s  total={elapsed:7.2f} s"
+    )
+    return report
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    user_id = await prepare_user(count)
+    try:
+        # Первый запрос открывает соединения с БД и прогревает кэш
+        await columnar(user_id)
+        reports: dict[str, Any] = {}
+        for name, method in (
+            ("columnar", columnar),
+            ("rows", rows),
+            ("orm", orm),
+        ):
+            reports[name] = await measure(name, method, user_id)
+        check(reports["rows"], reports["columnar"])
+        check(reports["rows"], reports["orm"])
+    finally:
+        await drop_user(user_id)
+        await db_helper.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""
+Микробенчмарк подготовки SQL-запросов списка задач на стороне Python.
+
+Сравнивает сборку запроса страницы задач на каждый вызов (как было до
+кэша запросов) с запросом из кэша crud.task._tasks_page_stmt. В обоих
+случаях учитывается вычисление ключа кэша компиляции SQLAlchemy, которое
+выполняется при каждом execute; для справки выводится и полная
+компиляция запроса (без кэша компиляции SQLAlchemy).
+
+Запуск из папки fastapi_version:
+    python -m benchmarks.crud_statements [число запросов]
+"""
+
+import sys
+import timeit
+
+from crud.task import _tasks_page_stmt
+from sqlalchemy.dialects import postgresql
+
+# Формы запроса: (сортировка, поиск, обратный порядок, вид курсора)
+SHAPES = [
+    ("created_at", False, False, None),
+    ("created_at DESC", False, True, "value"),
+    ("completed_at", True, False, "null"),
+    ("name", True, False, "value"),
+]
+
+
+def bench(number: int, build) -> float:
+    """
+    Возвращает среднее время подготовки одного запроса, в микросекундах.
+    """
+
+    def run() -> None:
+        for shape in SHAPES:
+            build(*shape)._generate_cache_key()
+
+    return timeit.timeit(run, number=number) / number / len(SHAPES) * 1e6
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    dialect = postgresql.asyncpg.dialect()  # type: ignore[attr-defined]
+
+    rebuilt = bench(number, _tasks_page_stmt.__wrapped__)
+    cached = bench(number, _tasks_page_stmt)
+    compiled = (
+        timeit.timeit(
+            lambda: _tasks_page_stmt(*SHAPES[1]).compile(dialect=dialect),
+            number=number // 10,
+        )
+        / (number // 10)
+        * 1e6
+    )
+    print(f"queries:                {number * len(SHAPES)}")
+    print(f"rebuilt per request:    {rebuilt:8.2f} us/query")
+    print(f"cached statement:       {cached:8.2f} us/query")
+    print(f"full compile (no cache):{compiled:8.2f} us/query")
+    print(f"saved per request:      {rebuilt - cached:8.2f} us/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Бенчмарк выгрузки задач пользователя (/api/v1/tasks/export).
+
+Создает пользователя с заданным числом задач (INSERT ... SELECT
+generate_series), запускает приложение в отдельном процессе uvicorn и
+выгружает задачи в каждом формате. Для каждой выгрузки выводит размер,
+время, скорость и прирост памяти (RSS) процесса сервера. Для сравнения
+выводится время и пик памяти загрузки тех же задач списком
+(crud.task.get_all_tasks). В конце пользователь и его задачи удаляются.
+
+Запуск из папки fastapi_version (нужна БД из .env, Linux - RSS читается
+из /proc):
+    python -m benchmarks.export [число задач]
+"""
+
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+import httpx
+from core.models import db_helper
+from crud import task as tsk
+from security.utils import create_jwt_token
+from sqlalchemy import text
+
+EXPORTS = (
+    "format=csv",
+    "format=ndjson",
+    "format=csv&gzip=1",
+    "format=ndjson&gzip=1",
+)
+
+
+def rss_kib(pid: int) -> int:
+    """
+    Возвращает резидентную память (RSS) процесса, в КиБ.
+    """
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1])
+    return 0
+
+
+async def prepare_user(count: int) -> int:
+    """
+    Создает пользователя с count задачами; возвращает его ID.
+    """
+    async with db_helper.session_factory() as session:
+        user_id = await session.scalar(
+            text(
+                "INSERT INTO users (name, email, hashed_password) "
+                "VALUES (:name, 'bench@mail.ru', '-') RETURNING id"
+            ),
+            {"name": f"b{uuid.uuid4().hex[:8]}"},
+        )
+        await session.execute(
+            text(
+                "INSERT INTO tasks (id_users, name, describe) "
+                "SELECT :user_id, 'task ' || n, repeat('описание ', 8) "
+                "FROM generate_series(1, :count) AS n"
+            ),
+            {"user_id": user_id, "count": count},
+        )
+        await session.commit()
+    assert isinstance(user_id, int)
+    return user_id
+
+
+async def drop_user(user_id: int) -> None:
+    async with db_helper.session_factory() as session:
+        params = {"user_id": user_id}
+        await session.execute(
+            text("DELETE FROM tasks WHERE id_users = :user_id"),
+            params,
+        )
+        await session.execute(
+            text("DELETE FROM users WHERE id = :user_id"),
+            params,
+        )
+        await session.commit()
+
+
+async def measure_list(user_id: int) -> None:
+    """
+    Загрузка всех задач списком (как до выгрузки потоком).
+    """
+    async with db_helper.session_factory() as session:
+        tracemalloc.start()
+        started = time.perf_counter()
+        tasks = await tsk.get_all_tasks(
+            user_id,
+            "created_at",
+            [True, False],
+            "",
+            session,
+        )
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    print(
+        f"{'get_all_tasks (list)':<22} rows={len(tasks)}  "
+        f"time={elapsed:6.2f} s  peak={peak / 1024**2:7.1f} MiB"
+    )
+
+
+async def measure_export(
+    client: httpx.AsyncClient,
+    query: str,
+    server_pid: int,
+) -> None:
+    rss_before = rss_max = rss_kib(server_pid)
+    size = 0
+    started = time.perf_counter()
+    async with client.stream("GET", f"/api/v1/tasks/export?{query}") as r:
+        assert r.status_code == 200, r.status_code
+        async for chunk in r.aiter_raw():
+            size += len(chunk)
+            rss_max = max(rss_max, rss_kib(server_pid))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{query:<22} size={size / 1024**2:7.1f} MiB  "
+        f"time={elapsed:6.2f} s  "
+        f"speed={size / 1024**2 / elapsed:6.1f} MiB/s  "
+        f"server RSS +{(rss_max - rss_before) / 1024:5.1f} MiB"
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    user_id = await prepare_user(count)
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:main_app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ]
+    )
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            cookies={"token": create_jwt_token(user_id)},
+            timeout=None,
+        ) as client:
+            for _ in range(100):
+                try:
+                    await client.get("/stats")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            # Первый запрос открывает соединения с БД
+            await client.get("/api/v1/tasks?limit=1")
+            for query in EXPORTS:
+                await measure_export(client, query, server.pid)
+        await measure_list(user_id)
+    finally:
+        server.terminate()
+        server.wait()
+        await drop_user(user_id)
+        await db_helper.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
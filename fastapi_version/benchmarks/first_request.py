@@ -0,0 +1,146 @@
+"""
+Бенчмарк первых запросов нового воркера: компиляция шаблонов Jinja2 при
+первом обращении против кэша байткода и предварительной компиляции
+(settings.jinja, api.utils.setup_templates).
+
+Каждый замер выполняется в новом процессе: после импорта приложения
+выполняется подготовка шаблонов (как в lifespan), запрос /users/home
+(открывает соединение с БД и кэширует пользователя, чтобы они не
+влияли на замер), затем первые запросы к /tasks, /tasks/{id} и
+/tasks/create. Для /tasks отключена потоковая отдача, чтобы время
+включало отрисовку всей страницы.
+
+Запуск из папки fastapi_version (нужна БД из .env):
+    python -m benchmarks.first_request [число процессов на режим]
+"""
+
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+PATHS = ("/tasks", "/tasks/{task_id}", "/tasks/create")
+
+# Режим: (кэш байткода, предварительная компиляция)
+MODES = {
+    "lazy (before)": (False, False),
+    "bytecode cache": (True, False),
+    "bytecode + preload": (True, True),
+}
+
+
+async def child(
+    token: str,
+    task_id: int,
+    cache_dir: str,
+    preload: bool,
+) -> None:
+    """
+    Запускается в отдельном процессе: готовит шаблоны и печатает время
+    подготовки и первых запросов в формате JSON.
+    """
+    from core.config import settings
+
+    settings.jinja.bytecode_cache_dir = Path(cache_dir) if cache_dir else None
+    settings.jinja.preload = preload
+    settings.tasks.stream = False
+
+    from api.utils import setup_templates
+    from main import main_app
+
+    started = time.perf_counter()
+    setup_templates()
+    timings = {"startup": (time.perf_counter() - started) * 1000}
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=main_app),
+        base_url="http://test",
+        cookies={"token": token},
+    ) as client:
+        await client.get("/users/home")
+        for path in PATHS:
+            started = time.perf_counter()
+            response = await client.get(path.format(task_id=task_id))
+            assert response.status_code == 200, (path, response.status_code)
+            timings[path] = (time.perf_counter() - started) * 1000
+
+    print(json.dumps(timings))
+
+
+def run_child(
+    token: str,
+    task_id: int,
+    cache_dir: str,
+    preload: bool,
+) -> dict:
+    args = [token, str(task_id), cache_dir, "1" if preload else ""]
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.first_request", "--child", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+async def prepare_user() -> tuple[str, int]:
+    """
+    Регистрирует пользователя с одной задачей; возвращает JWT и ID задачи.
+    """
+    from main import main_app
+
+    name, password = f"b{uuid.uuid4().hex[:8]}", "password"
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=main_app),
+        base_url="http://test",
+    ) as client:
+        form = {"name": name, "password": password}
+        await client.post(
+            "/registration",
+            data={**form, "email": "bench@mail.ru", "confirm": password},
+        )
+        response = await client.post("/login", data=form)
+        token = response.cookies["token"]
+        client.cookies.set("token", token)
+        await client.post(
+            "/tasks/create",
+            data={"name": "benchmark", "describe": "first request"},
+        )
+        response = await client.get("/tasks")
+        task_id = int(response.text.split("/tasks/", 1)[1].split("'", 1)[0])
+    return token, task_id
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    token, task_id = asyncio.run(prepare_user())
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Первый запуск заполняет кэш байткода
+        run_child(token, task_id, cache_dir, preload=True)
+
+        for title, (use_cache, preload) in MODES.items():
+            directory = cache_dir if use_cache else ""
+            args = (token, task_id, directory, preload)
+            results = [run_child(*args) for _ in range(runs)]
+            medians = {
+                key: statistics.median(result[key] for result in results)
+                for key in ("startup", *PATHS)
+            }
+            columns = [f"{key}={ms:6.1f} ms" for key, ms in medians.items()]
+            print(f"{title:<20}", "  ".join(columns))
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        token, task_id, cache_dir, preload = sys.argv[2:6]
+        asyncio.run(child(token, int(task_id), cache_dir, bool(preload)))
+    else:
+        main()
@@ -0,0 +1,56 @@
+"""
+Микробенчмарк проверки JWT-токена при авторизации запроса.
+
+Сравнивает стоимость get_user_id_from_token без кэша (полная проверка
+подписи на каждый запрос) и с кэшем проверенных токенов (jwt_cache).
+
+Запуск из папки fastapi_version:
+    python -m benchmarks.jwt_auth [число запросов]
+"""
+
+import sys
+import timeit
+
+from security.utils import create_jwt_token, get_user_id_from_token, jwt_cache
+
+
+def bench_uncached(token: str, number: int) -> float:
+    """
+    Возвращает среднее время проверки токена без кэша, в микросекундах.
+    """
+
+    def run() -> None:
+        jwt_cache.clear()
+        get_user_id_from_token(token)
+
+    return timeit.timeit(run, number=number) / number * 1e6
+
+
+def bench_cached(token: str, number: int) -> float:
+    """
+    Возвращает среднее время проверки уже проверенного токена,
+    в микросекундах.
+    """
+    jwt_cache.clear()
+    get_user_id_from_token(token)
+    return (
+        timeit.timeit(lambda: get_user_id_from_token(token), number=number)
+        / number
+        * 1e6
+    )
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    token = create_jwt_token(user_id=1)
+
+    uncached = bench_uncached(token, number)
+    cached = bench_cached(token, number)
+    print(f"requests:        {number}")
+    print(f"without cache:   {uncached:8.2f} us/request")
+    print(f"with jwt_cache:  {cached:8.2f} us/request")
+    print(f"speedup:         {uncached / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
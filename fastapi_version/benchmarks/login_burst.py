@@ -0,0 +1,84 @@
+"""
+Задержка /tasks во время всплеска авторизаций.
+
+Запускает приложение в одном event loop (как один воркер uvicorn) и
+измеряет задержку запросов /tasks без нагрузки и во время одновременных
+POST /login. Пока bcrypt выполняется в пуле (security.hashing), p99
+/tasks под нагрузкой не должен заметно расти.
+
+Нужна БД из настроек приложения. Запуск из папки fastapi_version:
+    python -m benchmarks.login_burst [число логинов]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+
+import httpx
+from main import main_app
+from security.hashing import password_hasher
+
+
+async def measure_tasks(
+    client: httpx.AsyncClient,
+    count: int,
+    interval: float = 0.005,
+) -> list[float]:
+    """
+    Возвращает задержки count последовательных запросов /tasks, в мс.
+    """
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = await client.get("/tasks")
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200
+        await asyncio.sleep(interval)
+    return latencies
+
+
+def report(title: str, latencies: list[float]) -> None:
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{title:<22} p50={percentiles[49]:7.1f} ms  "
+        f"p99={percentiles[98]:7.1f} ms  max={max(latencies):7.1f} ms"
+    )
+
+
+async def main() -> None:
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    name, password = f"b{uuid.uuid4().hex[:8]}", "password"
+    transport = httpx.ASGITransport(app=main_app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://test",
+    ) as client:
+        form = {"name": name, "password": password}
+        await client.post(
+            "/registration",
+            data={**form, "email": "bench@mail.ru", "confirm": password},
+        )
+        response = await client.post("/login", data=form)
+        client.cookies.set("token", response.cookies["token"])
+
+        report("/tasks idle", await measure_tasks(client, 200))
+
+        async def login() -> None:
+            async with httpx.AsyncClient(
+                transport=transport,
+                base_url="http://test",
+            ) as anonymous:
+                await anonymous.post("/login", data=form)
+
+        burst = asyncio.gather(*(login() for _ in range(logins)))
+        report(f"/tasks + {logins} logins", await measure_tasks(client, 200))
+        await burst
+
+    print(password_hasher.stats())
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Команды обслуживания приложения.
+
+Запуск из папки fastapi_version:
+    python cli.py import-tasks <имя пользователя> <файл CSV или ->
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import AsyncIterator, BinaryIO
+
+from core.csv_import import ImportFormatError
+from core.models import db_helper
+from crud import task as tsk
+from crud.user import check_name_exists
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def read_chunks(file: BinaryIO) -> AsyncIterator[bytes]:
+    while data := file.read(CHUNK_SIZE):
+        yield data
+
+
+async def import_tasks(username: str, file: BinaryIO) -> int:
+    """
+    Импортирует задачи пользователя из CSV-файла (см.
+    crud.task.import_tasks) и выводит отчет.
+
+    Args:
+        username (str): имя пользователя.
+        file (BinaryIO): файл CSV.
+
+    Returns:
+        int: код завершения (0 - файл импортирован).
+    """
+    try:
+        async with db_helper.session_factory() as session:
+            user = await check_name_exists(session, username)
+            if user is None:
+                print(f"User {username!r} not found", file=sys.stderr)
+                return 1
+
+            started = time.perf_counter()
+            try:
+                report = await tsk.import_tasks(
+                    user.id,
+                    read_chunks(file),
+                    session,
+                )
+            except ImportFormatError as error:
+                print(f"Import failed: {error}", file=sys.stderr)
+                return 1
+            elapsed = time.perf_counter() - started
+    finally:
+        await db_helper.dispose()
+
+    print(
+        f"Imported: {report.imported}, rejected: {report.rejected} "
+        f"({elapsed:.2f} s, {report.imported / elapsed:.0f} rows/s)"
+    )
+    for rejected in report.errors:
+        line = rejected["line"]
+        for field, messages in rejected["errors"].items():
+            print(f"line {line}: {field}: {' '.join(messages)}")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser(
+        "import-tasks",
+        help="импорт задач пользователя из CSV",
+    )
+    import_parser.add_argument("user", help="имя пользователя")
+    import_parser.add_argument(
+        "file",
+        type=argparse.FileType("rb"),
+        help="файл CSV (- для stdin)",
+    )
+    args = parser.parse_args()
+    with args.file:
+        sys.exit(asyncio.run(import_tasks(args.user, args.file)))
+
+
+if __name__ == "__main__":
+    main()
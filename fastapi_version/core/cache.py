@@ -0,0 +1,358 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+import asyncpg  # type: ignore[import-untyped]
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Версия данных, значение и его размер
+Entry = tuple[int, V, int]
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Ограниченный по размеру кэш в памяти процесса с вытеснением давно
+    неиспользуемых записей (LRU) и временем жизни записей (TTL).
+
+    Кэш не потокобезопасен: рассчитан на использование из одного event loop.
+
+    Attributes:
+        maxsize (int): максимальное число записей.
+        ttl (float): время жизни записи по умолчанию, в секундах.
+        hits (int): число найденных в кэше значений.
+        misses (int): число промахов (в т.ч. устаревших записей).
+        evictions (int): число записей, вытесненных из-за maxsize.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Args:
+            maxsize (int): максимальное число записей.
+            ttl (float): время жизни записи по умолчанию, в секундах.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Значение и момент (time.monotonic), после которого оно устарело
+        self._data: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        """
+        Возвращает значение по ключу, если оно есть в кэше и не устарело.
+
+        Args:
+            key (K): ключ.
+
+        Returns:
+            V | None: значение или None при промахе.
+        """
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """
+        Сохраняет значение в кэше, вытесняя самые давние записи сверх
+        maxsize.
+
+        Args:
+            key (K): ключ.
+            value (V): значение.
+            ttl (float | None): время жизни записи, в секундах
+                (по умолчанию self.ttl).
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: K) -> None:
+        """
+        Удаляет запись из кэша, если она есть.
+
+        Args:
+            key (K): ключ.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Удаляет все записи из кэша.
+        """
+        self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Возвращает счетчики кэша для подбора его размера и TTL.
+
+        Returns:
+            dict[str, Any]: размер, попадания, промахи, доля попаданий и
+                число вытесненных записей.
+        """
+        requests = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / requests if requests else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class ResultCache(Generic[K, V]):
+    """
+    Кэш результатов запросов пользователей в памяти процесса с бюджетом
+    памяти и вытеснением давно неиспользуемых записей (LRU).
+
+    Каждая запись хранит версию данных пользователя, для которой она
+    получена: запись с другой версией считается устаревшей. Так кэш
+    остается верным, даже если данные изменил другой процесс. Записи
+    пользователя, измененные в этом процессе, удаляются сразу
+    (invalidate).
+
+    Кэш не потокобезопасен: рассчитан на использование из одного event loop.
+
+    Attributes:
+        maxbytes (int): бюджет памяти, в байтах (по оценке sizeof).
+        hits (int): число найденных в кэше значений.
+        misses (int): число промахов (в т.ч. устаревших записей).
+        evictions (int): число записей, вытесненных из-за maxbytes.
+        invalidations (int): число записей, удаленных invalidate.
+    """
+
+    def __init__(self, maxbytes: int, sizeof: Callable[[V], int]):
+        """
+        Args:
+            maxbytes (int): бюджет памяти, в байтах.
+            sizeof (Callable[[V], int]): оценка размера значения, в байтах.
+        """
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bytes = 0
+        # Записи по (ID пользователя, ключ)
+        self._data: OrderedDict[tuple[int, K], Entry[V]] = OrderedDict()
+        self._user_keys: dict[int, set[K]] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, user_id: int, key: K, version: int) -> V | None:
+        """
+        Возвращает значение, если оно есть в кэше и получено для версии
+        version данных пользователя.
+
+        Args:
+            user_id (int): ID пользователя.
+            key (K): ключ (параметры запроса).
+            version (int): текущая версия данных пользователя.
+
+        Returns:
+            V | None: значение или None при промахе.
+        """
+        item = self._data.get((user_id, key))
+        if item is None or item[0] != version:
+            self.misses += 1
+            return None
+
+        self._data.move_to_end((user_id, key))
+        self.hits += 1
+        return item[1]
+
+    def set(self, user_id: int, key: K, version: int, value: V) -> None:
+        """
+        Сохраняет значение, вытесняя самые давние записи сверх бюджета
+        памяти. Значение больше всего бюджета не сохраняется.
+
+        Args:
+            user_id (int): ID пользователя.
+            key (K): ключ (параметры запроса).
+            version (int): версия данных пользователя.
+            value (V): значение.
+        """
+        size = self.sizeof(value)
+        current = self._data.get((user_id, key))
+        if current is not None and current[0] > version:
+            # Другой запрос уже сохранил результат для новой версии
+            return
+
+        self._remove(user_id, key)
+        if size > self.maxbytes:
+            return
+
+        self._data[(user_id, key)] = (version, value, size)
+        self._user_keys.setdefault(user_id, set()).add(key)
+        self.bytes += size
+        while self.bytes > self.maxbytes:
+            (old_user_id, old_key), _ = next(iter(self._data.items()))
+            self._remove(old_user_id, old_key)
+            self.evictions += 1
+
+    def _remove(self, user_id: int, key: K) -> bool:
+        """
+        Удаляет запись, если она есть.
+        """
+        item = self._data.pop((user_id, key), None)
+        if item is None:
+            return False
+
+        self.bytes -= item[2]
+        keys = self._user_keys[user_id]
+        keys.discard(key)
+        if not keys:
+            del self._user_keys[user_id]
+        return True
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Удаляет все записи пользователя.
+
+        Args:
+            user_id (int): ID пользователя.
+        """
+        for key in list(self._user_keys.get(user_id, ())):
+            if self._remove(user_id, key):
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """
+        Удаляет все записи из кэша.
+        """
+        self._data.clear()
+        self._user_keys.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Возвращает счетчики кэша для подбора его бюджета памяти.
+
+        Returns:
+            dict[str, Any]: число записей, занятая память и бюджет,
+                попадания, промахи, доля попаданий, число вытесненных и
+                сброшенных записей.
+        """
+        requests = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "users": len(self._user_keys),
+            "bytes": self.bytes,
+            "maxbytes": self.maxbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / requests if requests else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class PgListener:
+    """
+    Подписка на канал PostgreSQL (LISTEN/NOTIFY) для сброса кэшей во всех
+    процессах (воркерах uvicorn) приложения.
+
+    Держит отдельное соединение asyncpg вне пула SQLAlchemy. Пока
+    соединения нет, уведомления теряются, поэтому при каждом (пере)подключении
+    вызывается on_reset, который должен сбросить кэш целиком.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_reset: Callable[[], None],
+        reconnect_delay: float = 1.0,
+    ):
+        """
+        Args:
+            dsn (str): строка подключения asyncpg (postgresql://...).
+            channel (str): имя канала NOTIFY.
+            on_notify (Callable[[str], None]): обработчик payload уведомления.
+            on_reset (Callable[[], None]): сброс кэша при (пере)подключении.
+            reconnect_delay (float): пауза перед повторным подключением,
+                в секундах.
+        """
+        self.dsn = dsn
+        self.channel = channel
+        self.on_notify = on_notify
+        self.on_reset = on_reset
+        self.reconnect_delay = reconnect_delay
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """
+        Запускает фоновую задачу прослушивания канала.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Останавливает прослушивание и закрывает соединение.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _handle(self, conn: Any, pid: int, channel: str, payload: str) -> None:
+        self.on_notify(payload)
+
+    async def _listen(self) -> None:
+        """
+        Подключается, подписывается на канал и ждет разрыва соединения.
+        """
+        conn = await asyncpg.connect(self.dsn)
+        lost = asyncio.Event()
+        conn.add_termination_listener(lambda _: lost.set())
+        try:
+            await conn.add_listener(self.channel, self._handle)
+            # Изменения, сделанные без подписки, могли быть пропущены
+            self.on_reset()
+            await lost.wait()
+        finally:
+            if not conn.is_closed():
+                await conn.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+                logger.warning("LISTEN %s: connection lost", self.channel)
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                logger.exception("LISTEN %s: connection failed", self.channel)
+
+            self.on_reset()
+            await asyncio.sleep(self.reconnect_delay)
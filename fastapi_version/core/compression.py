@@ -0,0 +1,216 @@
+import zlib
+from typing import AsyncIterator, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # brotli - необязательная зависимость
+    brotli = None
+
+
+class Encoder(Protocol):
+    """
+    Потоковое сжатие тела ответа.
+    """
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Сжимает очередной фрагмент и сбрасывает накопленные данные, чтобы
+        клиент получил фрагмент сразу (для потоковых ответов).
+        """
+
+    def finish(self) -> bytes:
+        """
+        Завершает сжатый поток.
+        """
+
+
+class GzipEncoder:
+    def __init__(self, level: int):
+        # wbits 16 + MAX_WBITS - формат gzip (заголовок и контрольная сумма)
+        wbits = 16 + zlib.MAX_WBITS
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, data: bytes) -> bytes:
+        compressed = self._compressor.compress(data)
+        return compressed + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+async def gzip_stream(
+    chunks: AsyncIterator[bytes],
+    level: int,
+) -> AsyncIterator[bytes]:
+    """
+    Сжимает поток фрагментов в формат gzip (напр., файл выгрузки) по мере
+    получения фрагментов.
+
+    Args:
+        chunks (AsyncIterator[bytes]): исходные фрагменты.
+        level (int): уровень сжатия gzip (1-9).
+
+    Yields:
+        bytes: фрагменты файла gzip.
+    """
+    encoder = GzipEncoder(level)
+    async for chunk in chunks:
+        if compressed := encoder.compress(chunk):
+            yield compressed
+    yield encoder.finish()
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """
+    Проверяет, принимает ли клиент сжатие encoding
+    (заголовок Accept-Encoding).
+
+    Args:
+        accept_encoding (str): значение заголовка Accept-Encoding.
+        encoding (str): название сжатия (напр., "gzip").
+
+    Returns:
+        bool: True, если сжатие указано и его вес (q) больше нуля.
+    """
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        if name.strip().lower() != encoding:
+            continue
+        quality = params.strip().removeprefix("q=")
+        try:
+            return not params or float(quality) > 0
+        except ValueError:
+            return True
+    return False
+
+
+class CompressionMiddleware:
+    """
+    ASGI-middleware сжатия ответов (brotli, если установлен, или gzip).
+
+    Сжимаются ответы с типом содержимого из media_types, без
+    Content-Encoding. Ответ известного размера сжимается, только если он
+    не меньше minimum_size байт. Потоковый ответ сжимается по мере
+    отправки: каждый фрагмент уходит клиенту сразу, страница целиком в
+    памяти не собирается.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        gzip_level: int,
+        brotli_quality: int,
+        media_types: list[str],
+    ):
+        """
+        Args:
+            app (ASGIApp): приложение.
+            minimum_size (int): минимальный размер сжимаемого ответа,
+                в байтах.
+            gzip_level (int): уровень сжатия gzip (1-9).
+            brotli_quality (int): уровень сжатия brotli (0-11).
+            media_types (list[str]): сжимаемые типы содержимого.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.media_types = frozenset(media_types)
+
+    def _encoding(self, scope: Scope) -> str | None:
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        if brotli is not None and accepts_encoding(accept_encoding, "br"):
+            return "br"
+        if accepts_encoding(accept_encoding, "gzip"):
+            return "gzip"
+        return None
+
+    def _encoder(self, encoding: str) -> Encoder:
+        if encoding == "br":
+            return BrotliEncoder(self.brotli_quality)
+        return GzipEncoder(self.gzip_level)
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        encoding = self._encoding(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message = {}
+        # None - тело отдается без сжатия
+        encoder: Encoder | None = None
+        started = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, started
+            if message["type"] == "http.response.start":
+                # Заголовки отправляются вместе с первым фрагментом тела,
+                # когда известно, сжимается ли ответ
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if not started:
+                started = True
+                headers = MutableHeaders(raw=start["headers"])
+                content_type = headers.get("content-type", "")
+                media_type = content_type.partition(";")[0].strip()
+                # Размер известен из Content-Length (в т.ч. если ответ
+                # разбит на фрагменты промежуточным middleware) или из
+                # единственного фрагмента; размер потокового ответа - нет
+                size: int | None = None
+                if "content-length" in headers:
+                    size = int(headers["content-length"])
+                elif not more_body:
+                    size = len(body)
+                if (
+                    start["status"] not in (204, 304)
+                    and "content-encoding" not in headers
+                    and media_type in self.media_types
+                    and (size is None or size >= self.minimum_size)
+                ):
+                    encoder = self._encoder(encoding)
+                    headers["Content-Encoding"] = encoding
+                    headers.add_vary_header("Accept-Encoding")
+                    if "content-length" in headers:
+                        del headers["Content-Length"]
+                    if not more_body:
+                        body = encoder.compress(body) + encoder.finish()
+                        headers["Content-Length"] = str(len(body))
+                        encoder = None
+                        message = {**message, "body": body}
+                await send(start)
+
+            if encoder is not None:
+                body = encoder.compress(body) if body else b""
+                if not more_body:
+                    body += encoder.finish()
+                message = {**message, "body": body}
+
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -1,10 +1,13 @@
-from typing import Any
+from pathlib import Path
+from typing import Any, Literal
 
 from pydantic import BaseModel, PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from sqlalchemy import desc
 from starlette.templating import Jinja2Templates
 
+# Значение сортировки по схожести названия задачи с поисковой строкой
+SORT_BY_RELEVANCE = "relevance"
+
 
 class RunConfig(BaseModel):
     """
@@ -13,10 +16,14 @@ class RunConfig(BaseModel):
     Attributes:
         host (str): хост подключения.
         port (int): порт подключения.
+        stats (bool): подключать /stats - счетчики кэшей и пулов процесса
+            без авторизации (только для подбора размеров, не для
+            публичного доступа).
     """
 
     host: str = "0.0.0.0"
     port: int = 8000
+    stats: bool = False
 
 
 class DatabaseConfig(BaseSettings):
@@ -29,6 +36,10 @@ class DatabaseConfig(BaseSettings):
         echo_pool (bool): логирование работы пула соединений.
         pool_size (int): размер пула соединений.
         max_overflow (int): максимальное число дополнительных соединений.
+        replica_urls (list[str]): строки подключения к репликам для
+            чтения (по умолчанию реплик нет).
+        read_your_writes (float): сколько секунд после записи запросы
+            пользователя читают с основной БД, а не с реплик.
     """
 
     url: PostgresDsn
@@ -36,6 +47,8 @@ class DatabaseConfig(BaseSettings):
     echo_pool: bool = False
     pool_size: int = 50
     max_overflow: int = 10
+    replica_urls: list[PostgresDsn] = []
+    read_your_writes: float = 5.0
 
 
 class JwtConfig(BaseModel):
@@ -53,6 +66,115 @@ class JwtConfig(BaseModel):
     access_token_expire: int = 60
 
 
+class CacheConfig(BaseModel):
+    """
+    Конфигурация кэшей в памяти процесса.
+
+    Attributes:
+        users_maxsize (int): максимальное число пользователей в кэше.
+        users_ttl (int): время жизни пользователя в кэше, в секундах.
+        jwt_maxsize (int): максимальное число проверенных JWT в кэше.
+        tasks_maxbytes (int): бюджет памяти кэша страниц задач
+            (crud.task.get_tasks_page), в байтах.
+    """
+
+    users_maxsize: int = 10_000
+    users_ttl: int = 60
+    jwt_maxsize: int = 10_000
+    tasks_maxbytes: int = 32 * 1024 * 1024
+
+
+class HashingConfig(BaseModel):
+    """
+    Конфигурация пула для хэширования паролей.
+
+    Attributes:
+        executor (str): тип пула: "thread" (bcrypt отпускает GIL) или
+            "process".
+        max_workers (int): максимальное число одновременных вычислений.
+    """
+
+    executor: Literal["thread", "process"] = "thread"
+    max_workers: int = 4
+
+
+class JinjaConfig(BaseModel):
+    """
+    Конфигурация компиляции шаблонов Jinja2.
+
+    Attributes:
+        bytecode_cache_dir (Path | None): папка кэша байткода шаблонов,
+            общая для всех воркеров; None - без кэша.
+        preload (bool): компилировать все шаблоны при запуске приложения,
+            а не при первом запросе.
+    """
+
+    bytecode_cache_dir: Path | None = Path(".jinja_cache")
+    preload: bool = True
+
+
+class StaticConfig(BaseModel):
+    """
+    Конфигурация отдачи статики.
+
+    Attributes:
+        build_dir (Path): папка собранной статики: файлы с хэшем
+            содержимого в имени и их сжатые варианты (см. core.static).
+        max_age (int): время хранения файла с хэшем в кэше браузера,
+            в секундах.
+    """
+
+    build_dir: Path = Path(".static_build")
+    max_age: int = 365 * 24 * 60 * 60
+
+
+class CompressionConfig(BaseModel):
+    """
+    Конфигурация сжатия ответов (core.compression.CompressionMiddleware).
+
+    Attributes:
+        minimum_size (int): минимальный размер сжимаемого ответа, в байтах
+            (потоковые ответы сжимаются всегда).
+        gzip_level (int): уровень сжатия gzip (1-9).
+        brotli_quality (int): уровень сжатия brotli (0-11), если
+            установлен пакет brotli.
+        media_types (list[str]): сжимаемые типы содержимого.
+    """
+
+    minimum_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 5
+    media_types: list[str] = [
+        "text/html",
+        "text/css",
+        "text/plain",
+        "application/json",
+        "application/javascript",
+        "image/svg+xml",
+    ]
+
+
+class ApiConfig(BaseModel):
+    """
+    Конфигурация JSON API (/api/v1).
+
+    Attributes:
+        max_page_size (int): максимальное количество задач на одной
+            странице (параметр limit).
+        bulk_max_size (int): максимальное количество задач в одном
+            запросе массового создания.
+        import_batch_size (int): количество задач в одном COPY при
+            импорте из CSV.
+        import_max_errors (int): сколько отклоненных строк импорта
+            перечислять в ответе (считаются все).
+    """
+
+    max_page_size: int = 500
+    bulk_max_size: int = 10_000
+    import_batch_size: int = 10_000
+    import_max_errors: int = 100
+
+
 class ParamConfig(BaseModel):
     """
     Класс-шаблон для хранения параметров сортировки/фильтрации/поиска
@@ -83,6 +205,12 @@ class AllTaskParams(BaseModel):
         SORTED (ParamConfig): параметры сортировки задач.
         FILTER (ParamConfig): параметры фильтрации задач по статусу выполнения.
         SEARCH (ParamConfig): параметры поиска задач по имени.
+        AFTER (ParamConfig): курсор страницы, после которой идет текущая.
+        BEFORE (ParamConfig): курсор страницы, перед которой идет текущая.
+        page_size (int): количество задач на одной странице.
+        stream (bool): отдавать страницу со списком задач потоком.
+        stats_days (int): количество дней в статистике на странице
+            пользователя.
     """
 
     SORTED: ParamConfig = ParamConfig(
@@ -91,15 +219,17 @@ class AllTaskParams(BaseModel):
         default_html="up",
         db_map={
             "up": "created_at",
-            "down": desc("created_at"),
+            "down": "created_at DESC",
             "completed": "completed_at",
             "name": "name",
+            "relevance": SORT_BY_RELEVANCE,
         },
         html_map={
             "up": "Сначала старые",
             "down": "Сначала новые",
             "completed": "По дате завершения",
             "name": "По названию",
+            "relevance": "По релевантности",
         },
     )
 
@@ -125,6 +255,12 @@ class AllTaskParams(BaseModel):
 
     SEARCH: ParamConfig = ParamConfig(name="search", default_db="")
 
+    AFTER: ParamConfig = ParamConfig(name="after", default_db="")
+    BEFORE: ParamConfig = ParamConfig(name="before", default_db="")
+    stream: bool = True
+    page_size: int = 50
+    stats_days: int = 14
+
 
 class Settings(BaseSettings):
     """
@@ -135,6 +271,12 @@ class Settings(BaseSettings):
         run (RunConfig): запуска приложения.
         templates (Any): папка для хранения html форм.
         jwt (JwtConfig): конфигурация JWT.
+        cache (CacheConfig): конфигурация кэшей в памяти процесса.
+        hashing (HashingConfig): конфигурация пула хэширования паролей.
+        jinja (JinjaConfig): конфигурация компиляции шаблонов.
+        static (StaticConfig): конфигурация отдачи статики.
+        compression (CompressionConfig): конфигурация сжатия ответов.
+        api (ApiConfig): конфигурация JSON API.
         tasks (AllTaskParams): параметры сортировки, фильтрации и поиска задач.
     """
 
@@ -148,6 +290,12 @@ class Settings(BaseSettings):
     templates: Any = Jinja2Templates(directory="templates")
     db: DatabaseConfig
     jwt: JwtConfig
+    cache: CacheConfig = CacheConfig()
+    hashing: HashingConfig = HashingConfig()
+    jinja: JinjaConfig = JinjaConfig()
+    static: StaticConfig = StaticConfig()
+    compression: CompressionConfig = CompressionConfig()
+    api: ApiConfig = ApiConfig()
     tasks: AllTaskParams = AllTaskParams()
 
 
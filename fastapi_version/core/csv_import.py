@@ -0,0 +1,265 @@
+import codecs
+import csv
+import io
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from core.schemas.tasks import CreateTaskForm
+from wtforms import validators
+
+# Столбцы таблицы 'tasks', которые заполняет импорт (порядок записей)
+IMPORT_COLUMNS = (
+    "id_users",
+    "name",
+    "describe",
+    "created_at",
+    "completed",
+    "completed_at",
+)
+
+TRUE_VALUES = frozenset(("true", "t", "yes", "y", "on", "1"))
+FALSE_VALUES = frozenset(("false", "f", "no", "n", "off", "0", ""))
+
+# Максимальная длина одной строки CSV (незакрытая кавычка не должна
+# накапливать в памяти весь файл)
+MAX_RECORD_SIZE = 1024 * 1024
+
+_FRACTION = re.compile(r"\.(\d{1,6})(?!\d)")
+
+
+class ImportFormatError(ValueError):
+    """
+    Файл нельзя импортировать целиком: нет обязательных столбцов,
+    неверная кодировка или синтаксис CSV.
+    """
+
+
+@dataclass
+class ImportReport:
+    """
+    Результат импорта задач.
+
+    Attributes:
+        imported (int): количество импортированных задач.
+        rejected (int): количество отклоненных строк.
+        errors (list[dict[str, Any]]): ошибки отклоненных строк
+            ({"line": <номер строки файла>, "errors": {<поле>: [...]}}),
+            не больше max_errors первых.
+    """
+
+    imported: int = 0
+    rejected: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _length_limits(name: str) -> tuple[int, int]:
+    """
+    Возвращает ограничения длины поля формы CreateTaskForm
+    (validators.Length), чтобы импорт проверял строки по тем же правилам,
+    что и форма, без создания формы на каждую строку.
+    """
+    unbound = getattr(CreateTaskForm, name)
+    length = next(
+        validator
+        for validator in unbound.args[1]
+        if isinstance(validator, validators.Length)
+    )
+    return length.min, length.max
+
+
+def _parse_datetime(value: str) -> datetime:
+    """
+    Разбирает дату и время в формате ISO 8601 (как в выгрузке CSV).
+    Дробная часть секунд дополняется до 6 цифр: PostgreSQL отбрасывает
+    конечные нули, а datetime.fromisoformat до Python 3.11 их требует.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        padded = _FRACTION.sub(lambda m: "." + m[1].ljust(6, "0"), value, 1)
+        parsed = datetime.fromisoformat(padded)
+    if parsed.tzinfo is not None:
+        # Столбцы TIMESTAMP хранят местное время без часового пояса
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+class TaskCsvParser:
+    """
+    Потоковый разбор CSV-файла с задачами пользователя.
+
+    Файл передается фрагментами (feed) в любом месте, в том числе внутри
+    строки или символа UTF-8; разбираются только завершенные строки CSV,
+    остаток ждет следующего фрагмента. Первая строка - заголовок:
+    обязательны столбцы name и describe, необязательны created_at,
+    completed и completed_at, остальные (напр., id из выгрузки)
+    пропускаются.
+
+    Строки проверяются по ограничениям CreateTaskForm; корректные
+    возвращаются записями для COPY (в порядке IMPORT_COLUMNS),
+    некорректные учитываются в report.
+
+    Attributes:
+        report (ImportReport): результат разбора.
+    """
+
+    def __init__(self, id_users: int, max_errors: int) -> None:
+        self.report = ImportReport()
+        self._id_users = id_users
+        self._max_errors = max_errors
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._pending = ""
+        self._line = 0
+        self._columns: dict[str, int] | None = None
+        self._width = 0
+        self._now = datetime.now()
+        self._name_min, self._name_max = _length_limits("name")
+        self._describe_min, self._describe_max = _length_limits("describe")
+
+    def feed(self, data: bytes) -> list[tuple[Any, ...]]:
+        """
+        Разбирает очередной фрагмент файла.
+
+        Args:
+            data (bytes): фрагмент файла (UTF-8).
+
+        Returns:
+            list[tuple[Any, ...]]: корректные задачи из завершенных строк.
+        """
+        try:
+            text = self._pending + self._decoder.decode(data)
+        except UnicodeDecodeError:
+            raise ImportFormatError("File must be UTF-8 encoded") from None
+
+        # Строка завершена, если перевод строки стоит вне кавычек:
+        # до него четное число кавычек
+        end = text.rfind("\n") + 1
+        while end and text.count('"', 0, end) % 2:
+            end = text.rfind("\n", 0, end - 1) + 1
+        self._pending = text[end:]
+        if len(self._pending) > MAX_RECORD_SIZE:
+            raise ImportFormatError(f"Line {self._line + 1} is too long")
+        return self._parse(text[:end])
+
+    def close(self) -> list[tuple[Any, ...]]:
+        """
+        Разбирает остаток файла после последнего фрагмента.
+
+        Returns:
+            list[tuple[Any, ...]]: корректные задачи из остатка.
+        """
+        try:
+            text = self._pending + self._decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            raise ImportFormatError("File must be UTF-8 encoded") from None
+        self._pending = ""
+        tasks = self._parse(text)
+        if self._columns is None:
+            raise ImportFormatError("File is empty")
+        return tasks
+
+    def _parse(self, text: str) -> list[tuple[Any, ...]]:
+        tasks: list[tuple[Any, ...]] = []
+        if not text:
+            return tasks
+
+        reader = csv.reader(io.StringIO(text))
+        parse_row = self._parse_row
+        try:
+            if self._columns is None:
+                self._set_header(next(reader))
+            for row in reader:
+                if not row:
+                    continue
+                task = parse_row(row)
+                if isinstance(task, tuple):
+                    tasks.append(task)
+                else:
+                    self._reject(self._line + reader.line_num, task)
+        except csv.Error as error:
+            line = self._line + reader.line_num
+            raise ImportFormatError(f"Line {line}: {error}") from None
+        self._line += reader.line_num
+        self.report.imported += len(tasks)
+        return tasks
+
+    def _reject(self, line: int, errors: dict[str, list[str]]) -> None:
+        self.report.rejected += 1
+        if len(self.report.errors) < self._max_errors:
+            self.report.errors.append({"line": line, "errors": errors})
+
+    def _set_header(self, header: list[str]) -> None:
+        columns = {name.strip(): index for index, name in enumerate(header)}
+        required = ("name", "describe")
+        missing = [name for name in required if name not in columns]
+        if missing:
+            names = ", ".join(missing)
+            raise ImportFormatError(f"Missing required columns: {names}")
+        self._columns = columns
+        self._width = len(header)
+        self._name = columns["name"]
+        self._describe = columns["describe"]
+        self._created_at = columns.get("created_at")
+        self._completed = columns.get("completed")
+        self._completed_at = columns.get("completed_at")
+
+    def _parse_row(
+        self,
+        row: list[str],
+    ) -> tuple[Any, ...] | dict[str, list[str]]:
+        """
+        Проверяет строку файла; возвращает запись задачи для COPY или
+        ошибки по полям, если строка некорректна.
+        """
+        if len(row) < self._width:
+            row += [""] * (self._width - len(row))
+        errors: dict[str, list[str]] = {}
+
+        name = row[self._name]
+        if not self._name_min <= len(name) <= self._name_max:
+            errors["name"] = [self._length_message("name")]
+        describe = row[self._describe]
+        if not self._describe_min <= len(describe) <= self._describe_max:
+            errors["describe"] = [self._length_message("describe")]
+
+        created_at: datetime | None = self._now
+        index = self._created_at
+        if index is not None and (value := row[index]):
+            try:
+                created_at = _parse_datetime(value)
+            except ValueError:
+                errors["created_at"] = ["Not a valid datetime value."]
+
+        completed = False
+        if self._completed is not None:
+            value = row[self._completed].strip().lower()
+            if value in TRUE_VALUES:
+                completed = True
+            elif value not in FALSE_VALUES:
+                errors["completed"] = ["Not a valid boolean value."]
+
+        completed_at: datetime | None = None
+        index = self._completed_at
+        if index is not None and (value := row[index]):
+            try:
+                completed_at = _parse_datetime(value)
+            except ValueError:
+                errors["completed_at"] = ["Not a valid datetime value."]
+
+        if errors:
+            return errors
+        return (
+            self._id_users,
+            name,
+            describe,
+            created_at,
+            completed,
+            completed_at,
+        )
+
+    def _length_message(self, field_name: str) -> str:
+        # Сообщение validators.Length
+        message = "Field must be between {} and {} characters long."
+        return message.format(*_length_limits(field_name))
@@ -2,10 +2,13 @@ __all__ = (
     "db_helper",
     "Base",
     "User",
+    "USERS_CHANGED_CHANNEL",
     "Task",
+    "UserDailyStat",
 )
 
 from .base import Base
 from .db_helper import db_helper
 from .task import Task
-from .user import User
+from .user import USERS_CHANGED_CHANNEL, User
+from .user_daily_stat import UserDailyStat
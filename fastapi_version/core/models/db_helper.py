@@ -1,19 +1,39 @@
-from typing import AsyncGenerator
+import math
+import time
+from itertools import cycle
+from typing import AsyncGenerator, Iterator
 
 from core.config import settings
+from fastapi import Request, Response
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
+
+# Cookie с моментом (epoch), до которого чтение идет с основной БД
+PRIMARY_UNTIL_COOKIE = "db_primary_until"
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_write(session: Session) -> None:
+    """
+    Отмечает в состоянии запроса, что запрос записал данные в БД
+    (см. DatabaseHelper.session_getter).
+    """
+    if (state := session.info.get("request_state")) is not None:
+        state.db_write = True
 
 
 class DatabaseHelper:
     """
     Инициализирует объект DatabaseHelper.
 
-    Создает асинхронный движок SQLAlchemy и фабрику сессий.
+    Создает асинхронный движок SQLAlchemy и фабрику сессий для основной БД
+    и, если заданы, для реплик только для чтения.
 
     Args:
         url (str): строка подключения к БД.
@@ -21,6 +41,9 @@ class DatabaseHelper:
         echo_pool (bool): логирование работы пула соединений.
         pool_size (int): размер пула соединений.
         max_overflow (int): максимальное число дополнительных соединений.
+        replica_urls (list[str]): строки подключения к репликам.
+        read_your_writes (float): сколько секунд после записи запросы
+            пользователя читают с основной БД.
     """
 
     def __init__(
@@ -30,7 +53,10 @@ class DatabaseHelper:
         echo_pool: bool = False,
         pool_size: int = 5,
         max_overflow: int = 10,
+        replica_urls: list[str] | None = None,
+        read_your_writes: float = 5.0,
     ):
+        self.read_your_writes = read_your_writes
         self.engine: AsyncEngine = create_async_engine(
             url=url,
             echo=echo,
@@ -40,28 +66,124 @@ class DatabaseHelper:
         )
         # Фабрика для создания асинхронных сессий SQLAlchemy
         self.session_factory: async_sessionmaker[AsyncSession] = (
-            async_sessionmaker(  # noqa E501
-                bind=self.engine,
-                autoflush=False,
-                autocommit=False,
-                expire_on_commit=False,
+            self._make_session_factory(self.engine)
+        )
+
+        self.replica_engines: list[AsyncEngine] = [
+            create_async_engine(
+                url=replica_url,
+                echo=echo,
+                echo_pool=echo_pool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
             )
+            for replica_url in replica_urls or []
+        ]
+        self.replica_factories = [
+            self._make_session_factory(replica_engine)
+            for replica_engine in self.replica_engines
+        ]
+        # Реплики выбираются по кругу
+        self._replicas: Iterator[async_sessionmaker[AsyncSession]] = cycle(
+            self.replica_factories
+        )
+
+    @staticmethod
+    def _make_session_factory(
+        engine: AsyncEngine,
+    ) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(
+            bind=engine,
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
         )
 
     async def dispose(self) -> None:
         """
-        Освобождает ресурсы и закрывает асинхронный движок SQLAlchemy.
+        Освобождает ресурсы и закрывает асинхронные движки SQLAlchemy.
         """
         await self.engine.dispose()
+        for engine in self.replica_engines:
+            await engine.dispose()
 
-    async def session_getter(self) -> AsyncGenerator[AsyncSession, None]:
+    async def session_getter(
+        self,
+        request: Request,
+    ) -> AsyncGenerator[AsyncSession, None]:
         """
-        Асинхронный генератор для предоставления сессий.
+        Асинхронный генератор для предоставления сессий основной БД.
         Гарантирует корректное закрытие сессии после использования.
+
+        Если в сессии была запись (commit), следующие
+        read_your_writes секунд запросы пользователя читают с основной БД
+        (см. set_primary_cookie).
         """
         async with self.session_factory() as session:
+            session.info["request_state"] = request.state
+            yield session
+
+    def read_session_factory(
+        self,
+        request: Request | None = None,
+    ) -> async_sessionmaker[AsyncSession]:
+        """
+        Возвращает фабрику сессий для чтения: очередную реплику или
+        основную БД, если реплик нет или пользователь недавно записывал
+        данные (cookie PRIMARY_UNTIL_COOKIE).
+
+        Args:
+            request (Request | None): объект запроса FastAPI.
+
+        Returns:
+            async_sessionmaker[AsyncSession]: фабрика сессий.
+        """
+        if not self.replica_factories:
+            return self.session_factory
+
+        if request is not None:
+            try:
+                until = float(request.cookies.get(PRIMARY_UNTIL_COOKIE, 0))
+            except ValueError:
+                until = 0
+            if until > time.time():
+                return self.session_factory
+
+        return next(self._replicas)
+
+    async def read_session_getter(
+        self,
+        request: Request,
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Асинхронный генератор сессий только для чтения (см.
+        read_session_factory). Для маршрутов, которые ничего не пишут в БД.
+        """
+        async with self.read_session_factory(request)() as session:
             yield session
 
+    def set_primary_cookie(self, request: Request, response: Response) -> None:
+        """
+        Если запрос записал данные в БД и реплики настроены, ставит cookie,
+        по которой следующие read_your_writes секунд чтение идет с основной
+        БД (реплики могут еще не получить запись).
+
+        Args:
+            request (Request): объект запроса FastAPI.
+            response (Response): ответ на запрос.
+        """
+        if not self.replica_factories:
+            return
+        if not getattr(request.state, "db_write", False):
+            return
+
+        response.set_cookie(
+            key=PRIMARY_UNTIL_COOKIE,
+            value=str(time.time() + self.read_your_writes),
+            max_age=math.ceil(self.read_your_writes),
+            httponly=True,
+        )
+
 
 db_helper = DatabaseHelper(
     url=str(settings.db.url),
@@ -69,4 +191,6 @@ db_helper = DatabaseHelper(
     echo_pool=settings.db.echo_pool,
     pool_size=settings.db.pool_size,
     max_overflow=settings.db.max_overflow,
+    replica_urls=[str(url) for url in settings.db.replica_urls],
+    read_your_writes=settings.db.read_your_writes,
 )
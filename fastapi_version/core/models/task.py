@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import TEXT, VARCHAR, ForeignKey, false, func
+from sqlalchemy import TEXT, VARCHAR, ForeignKey, Index, false, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -25,8 +25,54 @@ class Task(Base):
 
     Связи:
         users (User): связь многие-к-одному с таблицей пользователей.
+
+    Индексы:
+        Составные индексы под выборку списка задач пользователя: для каждого
+        порядка из AllTaskParams.SORTED (с фильтром по статусу и без него).
+        Столбец id в конце задает однозначный порядок при равных значениях.
+        Триграммный GIN-индекс (pg_trgm + btree_gin) для поиска по названию
+        в пределах задач пользователя.
     """
 
+    __table_args__ = (
+        Index("ix_tasks_id_users_created_at", "id_users", "created_at", "id"),
+        Index(
+            "ix_tasks_id_users_completed_at",
+            "id_users",
+            "completed_at",
+            "id",
+        ),
+        Index("ix_tasks_id_users_name", "id_users", "name", "id"),
+        Index(
+            "ix_tasks_id_users_completed_created_at",
+            "id_users",
+            "completed",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_tasks_id_users_completed_completed_at",
+            "id_users",
+            "completed",
+            "completed_at",
+            "id",
+        ),
+        Index(
+            "ix_tasks_id_users_completed_name",
+            "id_users",
+            "completed",
+            "name",
+            "id",
+        ),
+        Index(
+            "ix_tasks_id_users_name_trgm",
+            "id_users",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
     id_users: Mapped[int] = mapped_column(
         ForeignKey("users.id"),
         nullable=False,
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import VARCHAR, func
+from sqlalchemy import VARCHAR, BigInteger, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -9,6 +9,11 @@ from .base import Base
 if TYPE_CHECKING:
     from .task import Task
 
+# Канал NOTIFY, в который триггер users_changed_notify (миграция
+# add_users_changed_notify) отправляет ID измененного или удаленного
+# пользователя
+USERS_CHANGED_CHANNEL = "users_changed"
+
 
 class User(Base):
     """
@@ -20,6 +25,8 @@ class User(Base):
         email (str): email пользователя (макс. 30 символов).
         hashed_password (str): захэшированный пароль (макс. 80 символов).
         created_at (datetime): время создания (по умолчанию текущее).
+        tasks_version (int): версия задач пользователя, увеличивается при
+            каждом изменении его задач (для ETag страниц задач).
 
     Связи:
         tasks (list[Task]): связь один-ко-многим с таблицей задач.
@@ -31,6 +38,9 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(
         default=datetime.now, server_default=func.now()
     )
+    tasks_version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0"
+    )
 
     tasks: Mapped[list["Task"]] = relationship(
         back_populates="users", cascade="all, delete-orphan"
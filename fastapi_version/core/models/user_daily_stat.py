@@ -0,0 +1,45 @@
+from datetime import date
+
+from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class UserDailyStat(Base):
+    """
+    ORM-модель таблицы 'user_daily_stats': число созданных и выполненных
+    задач пользователя за день.
+
+    Таблицу заполняют триггеры на таблице 'tasks' (миграция
+    add_user_daily_stats) при каждом добавлении, изменении и удалении
+    задач, поэтому приложение ее только читает.
+
+    Поля:
+        id (int): первичный ключ.
+        id_users (int): внешний ключ на таблицу 'users'.
+        day (date): день.
+        created (int): число задач, созданных в этот день.
+        completed (int): число задач, выполненных в этот день.
+
+    Ограничения:
+        Уникальная пара (id_users, day) - ключ обновления счетчиков и
+        индекс выборки за последние дни.
+    """
+
+    __tablename__ = "user_daily_stats"
+    __table_args__ = (
+        UniqueConstraint(
+            "id_users",
+            "day",
+            name="uq_user_daily_stats_id_users_day",
+        ),
+    )
+
+    id_users: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    day: Mapped[date] = mapped_column(nullable=False)
+    created: Mapped[int] = mapped_column(default=0, server_default="0")
+    completed: Mapped[int] = mapped_column(default=0, server_default="0")
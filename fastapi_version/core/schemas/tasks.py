@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel
 from wtforms import Form, StringField, validators
 
@@ -12,6 +14,16 @@ class TaskCreate(BaseModel):
     describe: str
 
 
+class TaskBulkCreate(BaseModel):
+    """
+    Тело запроса массового создания задач. Каждая задача проверяется
+    отдельно (CreateTaskForm и TaskCreate), чтобы ошибка в одной не
+    отменяла остальные.
+    """
+
+    tasks: list[Any]
+
+
 class CreateTaskForm(Form):
     """
     WTForms-форма для создания задачи (валидация в веб-форме).
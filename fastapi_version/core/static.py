@@ -0,0 +1,155 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+from core.compression import accepts_encoding
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.types import Scope
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # brotli - необязательная зависимость
+    brotli = None
+
+# Исходный путь файла (напр., "style.css") -> путь с хэшем содержимого
+# (напр., "style.3f2a9c1b7d4e.css"); заполняется build_static
+manifest: dict[str, str] = {}
+# Пути с хэшем, которые отдаются из папки собранной статики
+_hashed_paths: set[str] = set()
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+# Доступные сжатия: Content-Encoding -> (суффикс файла, функция сжатия),
+# в порядке предпочтения
+COMPRESSORS: dict[str, tuple[str, Callable[[bytes], bytes]]] = {
+    "gzip": (".gz", _gzip),
+}
+if brotli is not None:
+    COMPRESSORS = {"br": (".br", brotli.compress), **COMPRESSORS}
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """
+    Записывает файл через временный файл, чтобы воркеры, собирающие
+    статику одновременно, не видели недописанный файл.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent)
+    with os.fdopen(fd, "wb") as tmp:
+        tmp.write(data)
+    os.replace(tmp_name, path)
+
+
+def build_static(source: Path, target: Path) -> dict[str, str]:
+    """
+    Копирует файлы статики в target под именами с хэшем содержимого и
+    записывает рядом сжатые варианты (.gz и, если установлен brotli, .br),
+    если они меньше исходного файла. Уже собранные файлы не
+    перезаписываются.
+
+    Args:
+        source (Path): папка исходной статики.
+        target (Path): папка собранной статики.
+
+    Returns:
+        dict[str, str]: manifest - исходный путь -> путь с хэшем.
+    """
+    built: dict[str, str] = {}
+    for path in sorted(source.rglob("*")):
+        if not path.is_file():
+            continue
+
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        name = path.relative_to(source)
+        hashed = name.with_name(f"{name.stem}.{digest}{name.suffix}")
+        built[name.as_posix()] = hashed.as_posix()
+
+        hashed_path = target / hashed
+        if hashed_path.exists():
+            continue
+        hashed_path.parent.mkdir(parents=True, exist_ok=True)
+        for suffix, compress in COMPRESSORS.values():
+            compressed = compress(data)
+            if len(compressed) < len(data):
+                variant = hashed_path.with_name(hashed_path.name + suffix)
+                _write_atomic(variant, compressed)
+        # Основной файл пишется последним: его наличие означает, что
+        # сборка файла завершена
+        _write_atomic(hashed_path, data)
+
+    manifest.clear()
+    manifest.update(built)
+    _hashed_paths.clear()
+    _hashed_paths.update(built.values())
+    return built
+
+
+def static_url(path: str) -> str:
+    """
+    Возвращает URL файла статики с хэшем содержимого (для шаблонов).
+    Если файла нет в manifest, возвращает обычный URL.
+
+    Args:
+        path (str): путь файла относительно папки статики.
+
+    Returns:
+        str: URL файла статики.
+    """
+    return f"/static/{manifest.get(path, path)}"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles, отдающий файлы с хэшем содержимого в имени из папки
+    собранной статики (см. build_static): сжатый вариант по
+    Accept-Encoding и Cache-Control: immutable. Остальные пути отдаются
+    из исходной папки как обычно.
+    """
+
+    def __init__(self, *, directory: Path, build_dir: Path, max_age: int):
+        """
+        Args:
+            directory (Path): папка исходной статики.
+            build_dir (Path): папка собранной статики.
+            max_age (int): время хранения файла с хэшем в кэше браузера,
+                в секундах.
+        """
+        super().__init__(directory=directory)
+        self.build_dir = build_dir
+        self.max_age = max_age
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        hashed = Path(path).as_posix()
+        if hashed not in _hashed_paths:
+            return await super().get_response(path, scope)
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+
+        headers = {
+            "Cache-Control": f"public, max-age={self.max_age}, immutable",
+            "Vary": "Accept-Encoding",
+        }
+        file = self.build_dir / hashed
+        media_type = mimetypes.guess_type(hashed)[0] or "text/plain"
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        for encoding, (suffix, _) in COMPRESSORS.items():
+            if not accepts_encoding(accept_encoding, encoding):
+                continue
+            compressed = file.with_name(file.name + suffix)
+            if compressed.is_file():
+                return FileResponse(
+                    compressed,
+                    headers={**headers, "Content-Encoding": encoding},
+                    media_type=media_type,
+                )
+        return FileResponse(file, headers=headers, media_type=media_type)
@@ -1,9 +1,274 @@
+import asyncio
+import base64
 import datetime
+import json
+import sys
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any, AsyncIterator, cast
 
-from core.models import Task
+from core.analytics import (
+    CompletionReport,
+    completion_report,
+    decode_float8_array,
+)
+from core.cache import ResultCache
+from core.config import SORT_BY_RELEVANCE, settings
+from core.csv_import import IMPORT_COLUMNS, ImportReport, TaskCsvParser
+from core.models import Task, User, UserDailyStat
 from core.schemas.tasks import TaskCreate
-from sqlalchemy import delete, select
+from sqlalchemy import (
+    ARRAY,
+    TEXT,
+    VARCHAR,
+    ColumnElement,
+    Float,
+    Integer,
+    LargeBinary,
+    Select,
+    Table,
+    and_,
+    any_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+# Запросы по ID задачи собираются один раз; значения передаются
+# параметрами, поэтому SQLAlchemy не пересобирает и не перекомпилирует их.
+# Имена параметров UPDATE не должны совпадать с именами столбцов
+_TASK_BY_ID = select(Task).where(
+    Task.id_users == bindparam("user_id"),
+    Task.id == bindparam("task_id"),
+)
+_SAVE_TASK = (
+    update(Task)
+    .where(
+        Task.id_users == bindparam("user_id"),
+        Task.id == bindparam("task_id"),
+    )
+    .values(
+        describe=bindparam("new_describe"),
+        completed=bindparam("new_completed"),
+        completed_at=bindparam("new_completed_at"),
+    )
+    .returning(Task)
+)
+_DELETE_TASK = delete(Task).where(
+    Task.id == bindparam("task_id"),
+    Task.id_users == bindparam("user_id"),
+)
+# Действия с задачами, выбранными на странице /tasks: список ID
+# передается одним массивом, поэтому текст запроса не зависит от их числа
+_SELECTED_TASKS = and_(
+    Task.id_users == bindparam("user_id"),
+    Task.id == any_(bindparam("task_ids", type_=ARRAY(Integer))),
+)
+_TASKS_BY_IDS = select(Task).where(_SELECTED_TASKS).order_by(Task.id)
+_SET_TASKS_COMPLETED = (
+    update(Task)
+    .where(_SELECTED_TASKS, Task.completed != bindparam("new_completed"))
+    .values(
+        completed=bindparam("new_completed"),
+        completed_at=bindparam("new_completed_at"),
+    )
+    .execution_options(synchronize_session=False)
+)
+_DELETE_TASKS = (
+    delete(Task)
+    .where(_SELECTED_TASKS)
+    .execution_options(
+        synchronize_session=False,
+    )
+)
+# Счетчики задач пользователя по дням начиная с дня "since"
+# (ведутся триггерами на таблице tasks)
+_DAILY_STATS = (
+    select(UserDailyStat.day, UserDailyStat.created, UserDailyStat.completed)
+    .where(
+        UserDailyStat.id_users == bindparam("user_id"),
+        UserDailyStat.day >= bindparam("since"),
+    )
+    .order_by(UserDailyStat.day)
+)
+# Время создания и выполнения выполненных задач пользователя столбцами:
+# два массива float8 (секунды от эпохи) в двоичном формате (array_send),
+# которые разбираются в массивы NumPy без создания объекта на каждую задачу
+_COMPLETION_TIMES = select(
+    *(
+        func.array_send(
+            func.array_agg(func.date_part("epoch", column)),
+            type_=LargeBinary,
+        )
+        for column in (Task.created_at, Task.completed_at)
+    )
+).where(
+    Task.id_users == bindparam("user_id"),
+    Task.completed,
+    Task.completed_at.is_not(None),
+    Task.created_at.is_not(None),
+)
+# Вставка задач одним запросом: строки передаются массивами столбцов
+# ("id_users", "names", "describes"), поэтому текст запроса не зависит
+# от числа задач
+_NEW_TASKS = (
+    func.unnest(
+        bindparam("id_users", type_=ARRAY(Integer)),
+        bindparam("names", type_=ARRAY(VARCHAR)),
+        bindparam("describes", type_=ARRAY(TEXT)),
+    )
+    .table_valued("id_users", "name", "describe")
+    .render_derived("new_tasks")
+)
+# Вставка в таблицу (Core), а не в ORM-модель: ORM выполняет вставку с
+# параметрами как массовую вставку объектов, что не сочетается с SELECT
+_CREATE_TASKS = insert(cast(Table, Task.__table__)).from_select(
+    ["id_users", "name", "describe"],
+    select(_NEW_TASKS.c.id_users, _NEW_TASKS.c.name, _NEW_TASKS.c.describe),
+)
+# Запросы выгрузки всех задач пользователя (в порядке создания) для
+# COPY ... TO STDOUT: формат выгрузки -> (запрос, параметры COPY).
+# NDJSON собирает сервер (row_to_json); строки выгружаются как CSV с
+# разделителем и кавычкой, которых нет в JSON (управляющие символы в
+# JSON экранируются), поэтому выходят без изменений - по одной в строке
+_EXPORT_TASKS = select(
+    Task.id,
+    Task.name,
+    Task.describe,
+    Task.created_at,
+    Task.completed,
+    Task.completed_at,
+).where(Task.id_users == bindparam("user_id", type_=Integer))
+_EXPORT_ROWS = _EXPORT_TASKS.subquery("t")
+EXPORT_QUERIES: dict[str, tuple[Select[Any], dict[str, Any]]] = {
+    "csv": (
+        _EXPORT_TASKS.order_by(Task.id),
+        {"format": "csv", "header": True},
+    ),
+    "ndjson": (
+        select(func.row_to_json(literal_column(_EXPORT_ROWS.name)))
+        .select_from(_EXPORT_ROWS)
+        .order_by(_EXPORT_ROWS.c.id),
+        {"format": "csv", "delimiter": "\x02", "quote": "\x01"},
+    ),
+}
+# Версия задач пользователя (см. User.tasks_version)
+_TASKS_VERSION = select(User.tasks_version).where(
+    User.id == bindparam("user_id"),
+)
+_BUMP_TASKS_VERSION = (
+    update(User)
+    .where(User.id == bindparam("user_id"))
+    .values(tasks_version=User.tasks_version + 1)
+    .execution_options(synchronize_session=False)
+)
+
+
+@dataclass
+class TaskPage:
+    """
+    Страница списка задач при keyset-пагинации.
+
+    Attributes:
+        tasks (list[dict[str, Any]]): строки задач текущей страницы
+            (столбец -> значение); хранятся в tasks_cache без привязки к
+            сессии.
+        next_cursor (str | None): курсор следующей страницы, если она есть.
+        prev_cursor (str | None): курсор предыдущей страницы, если она есть.
+    """
+
+    tasks: list[dict[str, Any]]
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+def _page_size(page: TaskPage) -> int:
+    """
+    Приблизительно оценивает память, занятую страницей задач, в байтах.
+    """
+    size = sys.getsizeof(page) + sys.getsizeof(page.tasks)
+    for task in page.tasks:
+        size += sys.getsizeof(task)
+        size += sum(sys.getsizeof(value) for value in task.values())
+    return size
+
+
+# Ключ кэша: (сортировка, статусы, поиск, курсоры after и before, размер
+# страницы, загружаемые столбцы)
+TasksKey = tuple[
+    str,
+    tuple[bool, ...],
+    str,
+    str,
+    str,
+    int,
+    tuple[str, ...] | None,
+]
+
+# Страницы задач (get_tasks_page) для каждого пользователя; сбрасываются
+# функциями, изменяющими задачи (_tasks_changed)
+tasks_cache: ResultCache[TasksKey, TaskPage] = ResultCache(
+    maxbytes=settings.cache.tasks_maxbytes,
+    sizeof=_page_size,
+)
+
+# Все столбцы задачи (строка страницы при columns=None)
+_TASK_COLUMNS = tuple(column.key for column in inspect(Task).column_attrs)
+
+
+@dataclass
+class DayStats:
+    """
+    Число созданных и выполненных задач пользователя за день.
+
+    Attributes:
+        day (datetime.date): день.
+        created (int): число задач, созданных в этот день.
+        completed (int): число задач, выполненных в этот день.
+    """
+
+    day: datetime.date
+    created: int = 0
+    completed: int = 0
+
+
+async def _tasks_changed(id_users: int, session: AsyncSession) -> None:
+    """
+    Увеличивает версию задач пользователя в текущей транзакции и удаляет
+    его страницы из tasks_cache. Вызывается каждой функцией, изменяющей
+    задачи, до commit.
+
+    Args:
+        id_users (int): ID пользователя.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+    """
+    await session.execute(_BUMP_TASKS_VERSION, {"user_id": id_users})
+    tasks_cache.invalidate(id_users)
+
+
+async def get_tasks_version(id_users: int, session: AsyncSession) -> int:
+    """
+    Возвращает версию задач пользователя: число, которое меняется при
+    каждом изменении его задач. Используется для ETag страниц задач.
+
+    Args:
+        id_users (int): ID пользователя.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        int: версия задач пользователя.
+    """
+    version = await session.scalar(_TASKS_VERSION, {"user_id": id_users})
+    return version or 0
 
 
 async def create_task(task: TaskCreate, session: AsyncSession) -> Task:
@@ -19,10 +284,229 @@ async def create_task(task: TaskCreate, session: AsyncSession) -> Task:
     """
     new_task = Task(**task.model_dump())
     session.add(new_task)
+    await _tasks_changed(task.id_users, session)
     await session.commit()
     return new_task
 
 
+async def create_tasks(tasks: list[TaskCreate], session: AsyncSession) -> int:
+    """
+    Создает задачи в таблице 'tasks' одним запросом
+    INSERT ... SELECT FROM unnest(...) в одной транзакции.
+
+    Args:
+        tasks (list[TaskCreate]): данные новых задач.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        int: количество созданных задач.
+    """
+    if not tasks:
+        return 0
+
+    params = {
+        "id_users": [task.id_users for task in tasks],
+        "names": [task.name for task in tasks],
+        "describes": [task.describe for task in tasks],
+    }
+    await session.execute(_CREATE_TASKS, params)
+    for id_users in sorted({task.id_users for task in tasks}):
+        await _tasks_changed(id_users, session)
+    await session.commit()
+    return len(tasks)
+
+
+@lru_cache(maxsize=32)
+def _sort_key(
+    sorted_for_db: str,
+    search: bool,
+) -> tuple[ColumnElement[Any], bool, bool]:
+    """
+    Разбирает значение сортировки из AllTaskParams.SORTED.db_map.
+
+    Args:
+        sorted_for_db (str): поле для сортировки (напр., "created_at DESC").
+        search (bool): задана ли поисковая строка (для сортировки по
+            релевантности; сама строка - параметр "search_query").
+
+    Returns:
+        tuple[ColumnElement[Any], bool, bool]: выражение сортировки,
+            признак сортировки по убыванию и признак того, что выражение
+            может принимать NULL.
+    """
+    if sorted_for_db == SORT_BY_RELEVANCE:
+        if search:
+            similarity = func.word_similarity(
+                bindparam("search_query"),
+                Task.name,
+                type_=Float,
+            )
+            return similarity, True, False
+        # Без поисковой строки ранжировать не по чему
+        sorted_for_db = str(settings.tasks.SORTED.default_db)
+
+    column_name, _, direction = sorted_for_db.partition(" ")
+    column = Task.__table__.c[column_name]
+    return column, direction.upper() == "DESC", bool(column.nullable)
+
+
+def _select_tasks(search: bool) -> Select[tuple[Task]]:
+    """
+    Формирует запрос задач пользователя с фильтром по статусу и поиском
+    по названию.
+
+    Параметры: "id_users", "completed" (список статусов) и, при поиске,
+    "search_pattern" (шаблон ILIKE). Поиск по подстроке обслуживается
+    триграммным GIN-индексом 'ix_tasks_id_users_name_trgm'.
+    """
+    stmt = select(Task).where(
+        Task.id_users == bindparam("id_users"),
+        Task.completed.in_(bindparam("completed", expanding=True)),
+    )
+    if search:
+        stmt = stmt.where(Task.name.ilike(bindparam("search_pattern")))
+    return stmt
+
+
+def _keyset_filter(
+    sort_expr: ColumnElement[Any],
+    descending: bool,
+    nullable: bool,
+    null_value: bool,
+) -> ColumnElement[bool]:
+    """
+    Условие "строка идет после курсора" в порядке (sort_expr, id)
+    ASC/DESC. NULL, как и в PostgreSQL, считается наибольшим значением.
+
+    Параметры: "cursor_value" (не используется при null_value) и
+    "cursor_id".
+    """
+    value = bindparam("cursor_value", type_=sort_expr.type)
+    task_id = bindparam("cursor_id", type_=Integer)
+    if descending:
+        if null_value:
+            return or_(
+                sort_expr.is_not(None),
+                and_(sort_expr.is_(None), Task.id < task_id),
+            )
+        return tuple_(sort_expr, Task.id) < tuple_(value, task_id)
+
+    if null_value:
+        return and_(sort_expr.is_(None), Task.id > task_id)
+    after = tuple_(sort_expr, Task.id) > tuple_(value, task_id)
+    return or_(after, sort_expr.is_(None)) if nullable else after
+
+
+def _order_by(
+    sort_expr: ColumnElement[Any],
+    descending: bool,
+) -> tuple[ColumnElement[Any], ...]:
+    """
+    Порядок строк: выражение сортировки и id для однозначности.
+    """
+    if descending:
+        return sort_expr.desc(), Task.id.desc()
+    return sort_expr, Task.id.asc()
+
+
+@lru_cache(maxsize=128)
+def _tasks_page_stmt(
+    sorted_for_db: str,
+    search: bool,
+    reverse: bool,
+    cursor: str | None,
+    columns: tuple[str, ...] | None = None,
+) -> Select[tuple[Task, Any]]:
+    """
+    Запрос страницы задач для одной формы (сортировка, поиск, направление,
+    вид курсора, загружаемые столбцы). Собирается один раз на форму,
+    значения передаются параметрами (см. _select_tasks, _keyset_filter и
+    "limit").
+
+    Args:
+        sorted_for_db (str): поле для сортировки в SQL-запросе.
+        search (bool): задана ли поисковая строка.
+        reverse (bool): выбирать строки в обратном порядке.
+        cursor (str | None): вид курсора: None - без курсора, "value" -
+            курсор со значением, "null" - курсор со значением NULL.
+        columns (tuple[str, ...] | None): загружаемые столбцы задачи;
+            None - все. Обращение к незагруженному столбцу вызывает ошибку.
+    """
+    sort_expr, _, nullable = _sort_key(sorted_for_db, search)
+    stmt = _select_tasks(search)
+    if columns is not None:
+        attributes = [getattr(Task, column) for column in columns]
+        stmt = stmt.options(load_only(*attributes, raiseload=True))
+    if cursor is not None:
+        after_cursor = _keyset_filter(
+            sort_expr,
+            reverse,
+            nullable,
+            null_value=cursor == "null",
+        )
+        stmt = stmt.where(after_cursor)
+    return (
+        stmt.add_columns(sort_expr)
+        .order_by(*_order_by(sort_expr, reverse))
+        .limit(bindparam("limit", type_=Integer))
+    )
+
+
+@lru_cache(maxsize=32)
+def _all_tasks_stmt(sorted_for_db: str, search: bool) -> Select[tuple[Task]]:
+    """
+    Запрос всех задач пользователя для одной формы (сортировка, поиск).
+    """
+    sort_expr, descending, _ = _sort_key(sorted_for_db, search)
+    return _select_tasks(search).order_by(*_order_by(sort_expr, descending))
+
+
+def _tasks_params(
+    id_users: int,
+    completed: list[bool],
+    search_query: str,
+) -> dict[str, Any]:
+    """
+    Значения параметров запросов _select_tasks и сортировки.
+    """
+    params: dict[str, Any] = {"id_users": id_users, "completed": completed}
+    if search_query:
+        params["search_pattern"] = f"%{search_query}%"
+        params["search_query"] = search_query
+    return params
+
+
+def _encode_cursor(value: Any, task_id: int) -> str:
+    """
+    Кодирует позицию строки (значение сортировки, id) в курсор для URL.
+    """
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, task_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(
+    cursor: str,
+    sort_expr: ColumnElement[Any],
+) -> tuple[Any, int] | None:
+    """
+    Декодирует курсор из URL. Возвращает None, если курсор некорректен.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, task_id = json.loads(raw)
+        is_datetime = sort_expr.type.python_type is datetime.datetime
+        if is_datetime and isinstance(value, str):
+            value = datetime.datetime.fromisoformat(value)
+    except (ValueError, TypeError, NotImplementedError):
+        return None
+
+    if not isinstance(task_id, int):
+        return None
+    return value, task_id
+
+
 async def get_all_tasks(
     id_users: int,
     sorted_for_db: str,
@@ -34,6 +518,9 @@ async def get_all_tasks(
     Возвращает список отсортированных и отфильтрованных задач.
     Ищет задачи по названию.
 
+    При сортировке SORT_BY_RELEVANCE задачи упорядочиваются по схожести
+    названия с поисковой строкой.
+
     Args:
         id_users (int): ID пользователя.
         sorted_for_db (str): поле для сортировки в SQL-запросе.
@@ -44,19 +531,284 @@ async def get_all_tasks(
     Returns:
         list[Task]: список задач, удовлетворяющих условиям фильтрации и поиска.
     """
-    stmt = (
-        select(Task)
-        .where(
-            Task.id_users == id_users,
-            Task.completed.in_(completed),
-            Task.name.ilike(f"%{search_query}%"),
-        )
-        .order_by(sorted_for_db)
-    )
-    result = await session.scalars(stmt)
+    stmt = _all_tasks_stmt(sorted_for_db, bool(search_query))
+    params = _tasks_params(id_users, completed, search_query)
+    result = await session.scalars(stmt, params)
     return list(result.all())
 
 
+def _task_row(task: Task, columns: tuple[str, ...] | None) -> dict[str, Any]:
+    """
+    Строка задачи для TaskPage: значения загруженных столбцов.
+    """
+    names = _TASK_COLUMNS if columns is None else ("id", *columns)
+    return {name: getattr(task, name) for name in names}
+
+
+def _page_key(
+    sorted_for_db: str,
+    completed: list[bool],
+    search_query: str,
+    after: str,
+    before: str,
+    limit: int,
+    columns: tuple[str, ...] | None,
+) -> TasksKey:
+    """
+    Ключ страницы задач в tasks_cache.
+    """
+    return (
+        sorted_for_db,
+        tuple(completed),
+        search_query,
+        after,
+        before,
+        limit,
+        columns,
+    )
+
+
+def get_cached_tasks_page(
+    id_users: int,
+    version: int,
+    sorted_for_db: str,
+    completed: list[bool],
+    search_query: str,
+    after: str = "",
+    before: str = "",
+    limit: int = settings.tasks.page_size,
+    columns: tuple[str, ...] | None = None,
+) -> TaskPage | None:
+    """
+    Возвращает страницу задач из tasks_cache, если она сохранена для
+    текущей версии задач пользователя (см. get_tasks_page).
+
+    Args:
+        id_users (int): ID пользователя.
+        version (int): версия задач пользователя (см. get_tasks_version).
+        sorted_for_db (str): поле для сортировки в SQL-запросе.
+        completed: (list[bool]): список со статусами задач для фильтрации.
+        search_query (str): поисковая строка (поиск по названию задачи).
+        after (str): курсор, после которого начинается страница.
+        before (str): курсор, перед которым заканчивается страница.
+        limit (int): количество задач на странице.
+        columns (tuple[str, ...] | None): загружаемые столбцы задачи
+            (id загружается всегда); None - все.
+
+    Returns:
+        TaskPage | None: страница или None при промахе.
+    """
+    key = _page_key(
+        sorted_for_db,
+        completed,
+        search_query,
+        after,
+        before,
+        limit,
+        columns,
+    )
+    page = tasks_cache.get(id_users, key, version)
+    if page is None:
+        return None
+    # Копия списка: вызывающий код не должен менять закэшированный
+    return replace(page, tasks=[*page.tasks])
+
+
+async def iter_tasks_page(
+    page: TaskPage,
+    id_users: int,
+    sorted_for_db: str,
+    completed: list[bool],
+    search_query: str,
+    session: AsyncSession,
+    after: str = "",
+    before: str = "",
+    limit: int = settings.tasks.page_size,
+    columns: tuple[str, ...] | None = None,
+    version: int | None = None,
+) -> AsyncIterator[Task]:
+    """
+    Выдает задачи одной страницы по мере чтения из БД, добавляя их строки
+    в page.tasks, и по окончании заполняет курсоры соседних страниц в page.
+    Если передана версия задач, прочитанная целиком страница сохраняется
+    в tasks_cache.
+
+    Использует keyset-пагинацию по паре (значение сортировки, id): страница
+    выбирается условием "после/до курсора" по тому же индексу, что и
+    сортировка, поэтому стоимость запроса не зависит от номера страницы.
+
+    Args:
+        page (TaskPage): страница, в которую записываются курсоры.
+        id_users (int): ID пользователя.
+        sorted_for_db (str): поле для сортировки в SQL-запросе.
+        completed: (list[bool]): список со статусами задач для фильтрации.
+        search_query (str): поисковая строка (поиск по названию задачи).
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+        after (str): курсор, после которого начинается страница.
+        before (str): курсор, перед которым заканчивается страница.
+        limit (int): количество задач на странице.
+        columns (tuple[str, ...] | None): загружаемые столбцы задачи
+            (id загружается всегда); None - все.
+        version (int | None): версия задач пользователя, прочитанная до
+            запроса страницы (см. get_tasks_version); None - не кэшировать.
+
+    Yields:
+        Task: задачи страницы в порядке сортировки.
+    """
+    search = bool(search_query)
+    sort_expr, descending, _ = _sort_key(sorted_for_db, search)
+
+    # При движении назад выбираем строки в обратном порядке и разворачиваем
+    backward = bool(before) and not after
+    cursor = _decode_cursor(before if backward else after, sort_expr)
+    if cursor is None:
+        backward = False
+
+    params = _tasks_params(id_users, completed, search_query)
+    params["limit"] = limit + 1
+    cursor_kind = None
+    if cursor is not None:
+        params["cursor_value"], params["cursor_id"] = cursor
+        cursor_kind = "value" if cursor[0] is not None else "null"
+    reverse = descending != backward
+    stmt = _tasks_page_stmt(
+        sorted_for_db,
+        search,
+        reverse,
+        cursor_kind,
+        columns,
+    )
+
+    # Строки вида (задача, значение сортировки)
+    first: Any = None
+    last: Any = None
+    has_more = False
+    result = await session.stream(stmt, params)
+
+    if backward:
+        # Страница ограничена limit, поэтому развернуть ее в памяти дешево
+        rows: list[Any] = list(await result.all())
+        has_more = len(rows) > limit
+        rows = rows[:limit][::-1]
+        if not rows:
+            # Перед курсором ничего не осталось - показываем первую страницу
+            async for task in iter_tasks_page(
+                page,
+                id_users,
+                sorted_for_db,
+                completed,
+                search_query,
+                session,
+                limit=limit,
+                columns=columns,
+                version=version,
+            ):
+                yield task
+            return
+
+        for row in rows:
+            page.tasks.append(_task_row(row[0], columns))
+            yield row[0]
+        first, last = rows[0], rows[-1]
+
+    else:
+        count = 0
+        async for row in result:
+            count += 1
+            if count > limit:
+                has_more = True
+                break
+            if first is None:
+                first = row
+            last = row
+            page.tasks.append(_task_row(row[0], columns))
+            yield row[0]
+        await result.close()
+
+    if last is not None:
+        has_next = True if backward else has_more
+        has_prev = has_more if backward else cursor is not None
+        if has_next:
+            page.next_cursor = _encode_cursor(last[1], last[0].id)
+        if has_prev:
+            page.prev_cursor = _encode_cursor(first[1], first[0].id)
+
+    if version is not None:
+        key = _page_key(
+            sorted_for_db,
+            completed,
+            search_query,
+            after,
+            before,
+            limit,
+            columns,
+        )
+        # Копия списка: вызывающий код не должен менять закэшированный
+        cached = replace(page, tasks=[*page.tasks])
+        tasks_cache.set(id_users, key, version, cached)
+
+
+async def get_tasks_page(
+    id_users: int,
+    sorted_for_db: str,
+    completed: list[bool],
+    search_query: str,
+    session: AsyncSession,
+    after: str = "",
+    before: str = "",
+    limit: int = settings.tasks.page_size,
+    columns: tuple[str, ...] | None = None,
+    version: int | None = None,
+) -> TaskPage:
+    """
+    Возвращает одну страницу отсортированных и отфильтрованных задач
+    (см. iter_tasks_page).
+
+    Страница берется из tasks_cache, если задачи пользователя не менялись
+    с момента ее сохранения (проверяется по версии задач).
+
+    Args:
+        id_users (int): ID пользователя.
+        sorted_for_db (str): поле для сортировки в SQL-запросе.
+        completed: (list[bool]): список со статусами задач для фильтрации.
+        search_query (str): поисковая строка (поиск по названию задачи).
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+        after (str): курсор, после которого начинается страница.
+        before (str): курсор, перед которым заканчивается страница.
+        limit (int): количество задач на странице.
+        columns (tuple[str, ...] | None): загружаемые столбцы задачи
+            (id загружается всегда); None - все.
+        version (int | None): версия задач пользователя, если уже
+            прочитана (напр., для ETag); None - читается из БД.
+
+    Returns:
+        TaskPage: строки задач страницы и курсоры соседних страниц.
+    """
+    if version is None:
+        version = await get_tasks_version(id_users, session)
+    query: dict[str, Any] = {
+        "sorted_for_db": sorted_for_db,
+        "completed": completed,
+        "search_query": search_query,
+        "after": after,
+        "before": before,
+        "limit": limit,
+        "columns": columns,
+    }
+    page = get_cached_tasks_page(id_users, version, **query)
+    if page is None:
+        page = TaskPage(tasks=[])
+        async for _ in iter_tasks_page(
+            page,
+            id_users=id_users,
+            session=session,
+            version=version,
+            **query,
+        ):
+            pass
+    return page
+
+
 async def get_task_by_id(
     id_users: int,
     task_id: int,
@@ -73,85 +825,347 @@ async def get_task_by_id(
     Returns:
         Task | None: словарь с данными задачи, если найдена, иначе None.
     """
-    stmt = select(Task).where(Task.id_users == id_users, Task.id == task_id)
-    result = await session.scalars(stmt)
+    params = {"user_id": id_users, "task_id": task_id}
+    result = await session.scalars(_TASK_BY_ID, params)
     return result.one_or_none()
 
 
-async def complete_task_by_id(
+async def save_task(
     id_users: int,
     task_id: int,
+    describe: str,
+    completed: bool,
     session: AsyncSession,
-) -> None:
+) -> Task | None:
     """
-    Помечает задачу как выполненную и устанавливает дату ее выполнения.
+    Сохраняет описание и статус выполнения задачи одним запросом
+    UPDATE ... RETURNING.
+
+    При выполнении задачи устанавливает дату ее выполнения, при снятии
+    отметки - удаляет ее.
 
     Args:
         id_users (int): ID пользователя.
         task_id (int): ID задачи.
+        describe (str): описание задачи.
+        completed (bool): статус выполнения задачи.
         session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        Task | None: обновленная задача, если найдена, иначе None.
     """
-    task: Task | None = await get_task_by_id(id_users, task_id, session)
-    if task:
-        task.completed = True
-        task.completed_at = datetime.datetime.now()
-        await session.commit()
+    completed_at = datetime.datetime.now() if completed else None
+    params = {
+        "user_id": id_users,
+        "task_id": task_id,
+        "new_describe": describe,
+        "new_completed": completed,
+        "new_completed_at": completed_at,
+    }
+    result = await session.scalars(_SAVE_TASK, params)
+    task = result.one_or_none()
+    if task is not None:
+        await _tasks_changed(id_users, session)
+    await session.commit()
+    return task
 
 
-async def not_completed_task_by_id(
+async def delete_task_by_id(
     id_users: int,
     task_id: int,
     session: AsyncSession,
 ) -> None:
     """
-    Помечает задачу как невыполненную и удаляет дату ее выполнения.
+    Удаляет задачу по ее ID для конкретного пользователя.
 
     Args:
         id_users (int): ID пользователя.
         task_id (int): ID задачи.
         session (AsyncSession): асинхронная сессия SQLAlchemy.
     """
-    task: Task | None = await get_task_by_id(id_users, task_id, session)
-    if task:
-        task.completed = False
-        task.completed_at = None
-        await session.commit()
+    params = {"user_id": id_users, "task_id": task_id}
+    result = await session.execute(_DELETE_TASK, params)
+    if result.rowcount:
+        await _tasks_changed(id_users, session)
+    await session.commit()
 
 
-async def change_describe_task_by_id(
+async def get_tasks_by_ids(
     id_users: int,
-    task_id: int,
-    describe: str,
+    task_ids: list[int],
     session: AsyncSession,
-) -> None:
+) -> list[Task]:
     """
-    Обновляет описание задачи по ее ID для конкретного пользователя.
+    Возвращает задачи пользователя с указанными ID одним запросом
+    (ID, которых нет у пользователя, пропускаются).
 
     Args:
         id_users (int): ID пользователя.
-        task_id (int): ID задачи.
-        describe (str): описание задачи.
+        task_ids (list[int]): ID задач.
         session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        list[Task]: найденные задачи по возрастанию ID.
     """
-    task: Task | None = await get_task_by_id(id_users, task_id, session)
-    if task:
-        task.describe = describe
-        await session.commit()
+    if not task_ids:
+        return []
 
+    params = {"user_id": id_users, "task_ids": task_ids}
+    result = await session.scalars(_TASKS_BY_IDS, params)
+    return list(result)
 
-async def delete_task_by_id(
+
+async def set_tasks_completed(
     id_users: int,
-    task_id: int,
+    task_ids: list[int],
+    completed: bool,
     session: AsyncSession,
-) -> None:
+) -> int:
     """
-    Удаляет задачу по ее ID для конкретного пользователя.
+    Отмечает задачи пользователя выполненными или невыполненными одним
+    запросом UPDATE ... WHERE id = ANY(...) в одной транзакции.
+
+    Меняются только задачи с другим статусом: у уже выполненных задач
+    дата выполнения сохраняется.
 
     Args:
         id_users (int): ID пользователя.
-        task_id (int): ID задачи.
+        task_ids (list[int]): ID задач.
+        completed (bool): новый статус выполнения.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        int: количество измененных задач.
+    """
+    if not task_ids:
+        return 0
+
+    params = {
+        "user_id": id_users,
+        "task_ids": task_ids,
+        "new_completed": completed,
+        "new_completed_at": datetime.datetime.now() if completed else None,
+    }
+    result = await session.execute(_SET_TASKS_COMPLETED, params)
+    if result.rowcount:
+        await _tasks_changed(id_users, session)
+    await session.commit()
+    return result.rowcount
+
+
+async def delete_tasks(
+    id_users: int,
+    task_ids: list[int],
+    session: AsyncSession,
+) -> int:
+    """
+    Удаляет задачи пользователя одним запросом
+    DELETE ... WHERE id = ANY(...) в одной транзакции.
+
+    Args:
+        id_users (int): ID пользователя.
+        task_ids (list[int]): ID задач.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        int: количество удаленных задач.
+    """
+    if not task_ids:
+        return 0
+
+    params = {"user_id": id_users, "task_ids": task_ids}
+    result = await session.execute(_DELETE_TASKS, params)
+    if result.rowcount:
+        await _tasks_changed(id_users, session)
+    await session.commit()
+    return result.rowcount
+
+
+async def get_daily_stats(
+    id_users: int,
+    days: int,
+    session: AsyncSession,
+) -> list[DayStats]:
+    """
+    Возвращает число созданных и выполненных задач пользователя за
+    каждый из последних days дней (включая сегодня).
+
+    Счетчики читаются из таблицы user_daily_stats, которую ведут триггеры
+    на таблице tasks, поэтому запрос читает не больше days строк
+    независимо от числа задач. Дни без задач дополняются нулями.
+
+    Args:
+        id_users (int): ID пользователя.
+        days (int): количество дней.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        list[DayStats]: счетчики по дням, от старых к новым.
+    """
+    today = datetime.date.today()
+    stats = [
+        DayStats(today - datetime.timedelta(days=offset))
+        for offset in range(days - 1, -1, -1)
+    ]
+    if not stats:
+        return stats
+
+    params = {"user_id": id_users, "since": stats[0].day}
+    by_day = {day_stats.day: day_stats for day_stats in stats}
+    for day, created, completed in await session.execute(_DAILY_STATS, params):
+        if day in by_day:
+            by_day[day].created = created
+            by_day[day].completed = completed
+    return stats
+
+
+async def iter_tasks_export(
+    id_users: int,
+    export_format: str,
+    session: AsyncSession,
+    max_chunks: int = 16,
+) -> AsyncIterator[bytes]:
+    """
+    Выгружает все задачи пользователя в CSV (с заголовком) или NDJSON
+    запросом COPY ... TO STDOUT (см. EXPORT_QUERIES): строки формирует
+    сервер БД, а фрагменты передаются дальше по мере получения.
+
+    COPY выполняется в отдельной задаче asyncio и передает фрагменты
+    через очередь из max_chunks фрагментов: если клиент читает медленно,
+    COPY приостанавливается, поэтому память не зависит от числа задач.
+
+    Args:
+        id_users (int): ID пользователя.
+        export_format (str): формат выгрузки ("csv" или "ndjson").
+        session (AsyncSession): асинхронная сессия SQLAlchemy (соединение
+            сессии занято до конца выгрузки).
+        max_chunks (int): размер очереди фрагментов.
+
+    Yields:
+        bytes: фрагменты выгрузки.
+    """
+    stmt, copy_options = EXPORT_QUERIES[export_format]
+    connection = await session.connection()
+    compiled = stmt.compile(dialect=connection.dialect)
+    params = compiled.construct_params({"user_id": id_users})
+    args = [params[name] for name in compiled.positiontup or ()]
+    raw_connection = await connection.get_raw_connection()
+    asyncpg_connection = raw_connection.driver_connection
+    assert asyncpg_connection is not None
+
+    chunks: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=max_chunks)
+
+    async def put_chunk(data: bytes) -> None:
+        # asyncpg передает bytearray, который переиспользует
+        await chunks.put(bytes(data))
+
+    async def copy() -> None:
+        try:
+            await asyncpg_connection.copy_from_query(
+                str(compiled),
+                *args,
+                output=put_chunk,
+                **copy_options,
+            )
+        finally:
+            await chunks.put(None)
+
+    task = asyncio.create_task(copy())
+    try:
+        while (chunk := await chunks.get()) is not None:
+            yield chunk
+        # Ошибка COPY передается вызывающему коду
+        await task
+    finally:
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+async def import_tasks(
+    id_users: int,
+    chunks: AsyncIterator[bytes],
+    session: AsyncSession,
+    batch_size: int = settings.api.import_batch_size,
+    max_errors: int = settings.api.import_max_errors,
+) -> ImportReport:
+    """
+    Импортирует задачи пользователя из CSV-файла (см.
+    core.csv_import.TaskCsvParser).
+
+    Файл разбирается по мере получения фрагментов; корректные строки
+    загружаются в таблицу 'tasks' пакетами по batch_size задач через
+    COPY ... FROM STDIN (двоичный формат asyncpg), поэтому память не
+    зависит от размера файла. Весь импорт - одна транзакция: если файл
+    нельзя разобрать целиком (ImportFormatError), задачи не создаются.
+
+    Args:
+        id_users (int): ID пользователя.
+        chunks (AsyncIterator[bytes]): фрагменты файла.
         session (AsyncSession): асинхронная сессия SQLAlchemy.
+        batch_size (int): количество задач в одном COPY.
+        max_errors (int): сколько отклоненных строк перечислять в отчете.
+
+    Returns:
+        ImportReport: количество импортированных задач и отклоненные
+            строки.
     """
-    stmt = delete(Task).where(Task.id == task_id, Task.id_users == id_users)
-    await session.execute(stmt)
+    parser = TaskCsvParser(id_users, max_errors)
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    asyncpg_connection = raw_connection.driver_connection
+    assert asyncpg_connection is not None
+
+    async def copy(tasks: list[tuple[Any, ...]]) -> None:
+        await asyncpg_connection.copy_records_to_table(
+            Task.__tablename__,
+            records=tasks,
+            columns=IMPORT_COLUMNS,
+        )
+
+    batch: list[tuple[Any, ...]] = []
+    async for data in chunks:
+        batch += parser.feed(data)
+        if len(batch) >= batch_size:
+            await copy(batch)
+            batch = []
+    batch += parser.close()
+    if batch:
+        await copy(batch)
+
+    if parser.report.imported:
+        await _tasks_changed(id_users, session)
     await session.commit()
+    return parser.report
+
+
+async def get_completion_report(
+    id_users: int,
+    session: AsyncSession,
+) -> CompletionReport:
+    """
+    Строит отчет о времени выполнения задач пользователя
+    (см. core.analytics.completion_report).
+
+    Время создания и выполнения всех выполненных задач читается одним
+    запросом двумя массивами и обрабатывается векторными операциями
+    NumPy: ни строк, ни ORM-объектов на каждую задачу не создается.
+
+    Args:
+        id_users (int): ID пользователя.
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+
+    Returns:
+        CompletionReport: отчет.
+    """
+    params = {"user_id": id_users}
+    result = await session.execute(_COMPLETION_TIMES, params)
+    created_at, completed_at = result.one()
+    return completion_report(
+        decode_float8_array(created_at),
+        decode_float8_array(completed_at),
+        datetime.date.today(),
+    )
@@ -1,8 +1,41 @@
-from core.models import User
+from core.cache import PgListener, TTLCache
+from core.config import settings
+from core.models import USERS_CHANGED_CHANNEL, User
 from core.schemas.users import UserCreate
-from sqlalchemy import select
+from sqlalchemy import bindparam, make_url, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# Запросы собираются один раз, значения передаются параметрами
+_USER_BY_NAME = select(User).where(User.name == bindparam("username"))
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+
+# Пользователи, прошедшие проверку авторизации, по ID
+users_cache: TTLCache[int, User] = TTLCache(
+    maxsize=settings.cache.users_maxsize,
+    ttl=settings.cache.users_ttl,
+)
+
+
+def _on_user_changed(payload: str) -> None:
+    """
+    Удаляет из кэша пользователя, ID которого пришел в уведомлении.
+    """
+    if payload.isdigit():
+        users_cache.pop(int(payload))
+    else:
+        users_cache.clear()
+
+
+# Сброс кэша во всех воркерах при изменении/удалении пользователя в БД
+users_listener = PgListener(
+    dsn=make_url(str(settings.db.url))
+    .set(drivername="postgresql")
+    .render_as_string(hide_password=False),
+    channel=USERS_CHANGED_CHANNEL,
+    on_notify=_on_user_changed,
+    on_reset=users_cache.clear,
+)
+
 
 async def create_user(
     session: AsyncSession,
@@ -39,8 +72,8 @@ async def check_name_exists(
         User | None: объект найденного пользователя, если такой существует,
             иначе None.
     """
-    stmt = select(User).filter_by(name=username)
-    result = await session.scalars(stmt)
+    params = {"username": username}
+    result = await session.scalars(_USER_BY_NAME, params)
     return result.one_or_none()
 
 
@@ -58,6 +91,32 @@ async def get_user_by_id(
     Returns:
         User | None: объект найденного пользователя, если найден, иначе None.
     """
-    stmt = select(User).filter_by(id=user_id)
-    result = await session.scalars(stmt)
+    params = {"user_id": user_id}
+    result = await session.scalars(_USER_BY_ID, params)
     return result.one_or_none()
+
+
+async def get_user_by_id_cached(
+    session: AsyncSession,
+    user_id: int,
+) -> User | None:
+    """
+    Возвращает пользователя по ID из кэша, а при промахе - из БД
+    (см. get_user_by_id) с сохранением в кэш.
+
+    Запись удаляется из кэша по истечении settings.cache.users_ttl или
+    по уведомлению об изменении пользователя в БД.
+
+    Args:
+        session (AsyncSession): асинхронная сессия SQLAlchemy.
+        user_id (int): ID пользователя для поиска.
+
+    Returns:
+        User | None: объект найденного пользователя, если найден, иначе None.
+    """
+    if (user := users_cache.get(user_id)) is not None:
+        return user
+
+    if (user := await get_user_by_id(session, user_id)) is not None:
+        users_cache.set(user_id, user)
+    return user
@@ -1,14 +1,18 @@
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Awaitable, Callable
 
 import uvicorn
 from api import router as api_router
+from api.utils import FastJSONResponse, setup_templates
+from core.compression import CompressionMiddleware
 from core.config import settings
 from core.models import db_helper
+from core.static import PrecompressedStaticFiles, build_static
+from crud.user import users_listener
 from fastapi import FastAPI, Request, Response
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
+from security.hashing import password_hasher
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 
@@ -16,9 +20,16 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:  # noqa B008
     """
     Контекстный менеджер жизненного цикла приложения.
-    При завершении работы приложения освобождает ресурсы подключения к БД.
+    При запуске подготавливает шаблоны (см. setup_templates) и
+    подписывается на уведомления для сброса кэша пользователей.
+    При завершении работы приложения освобождает ресурсы подключения к БД
+    и останавливает пул хэширования паролей.
     """
+    setup_templates()
+    users_listener.start()
     yield
+    await users_listener.stop()
+    password_hasher.shutdown()
     await db_helper.dispose()
 
 
@@ -27,13 +38,43 @@ templates = settings.templates
 
 main_app = FastAPI(lifespan=lifespan)
 main_app.include_router(api_router)
+static_build_dir = base_dir / settings.static.build_dir
+build_static(base_dir / "static", static_build_dir)
 main_app.mount(
     "/static",
-    StaticFiles(directory=base_dir / "static"),
+    PrecompressedStaticFiles(
+        directory=base_dir / "static",
+        build_dir=static_build_dir,
+        max_age=settings.static.max_age,
+    ),
     name="static",
 )
 
 
+@main_app.middleware("http")
+async def read_your_writes(
+    request: Request,
+    call_next: Callable[[Request], Awaitable[Response]],
+) -> Response:
+    """
+    После запроса, записавшего данные в БД, направляет чтение
+    пользователя на основную БД (см. DatabaseHelper.set_primary_cookie).
+    """
+    response = await call_next(request)
+    db_helper.set_primary_cookie(request, response)
+    return response
+
+
+# Добавлен последним - внешний слой: сжимает ответы всех обработчиков
+main_app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression.minimum_size,
+    gzip_level=settings.compression.gzip_level,
+    brotli_quality=settings.compression.brotli_quality,
+    media_types=settings.compression.media_types,
+)
+
+
 @main_app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(
     request: Request,
@@ -43,6 +84,7 @@ async def http_exception_handler(
     Обработчик исключений StarletteHTTPException.
 
     Если в заголовках присутствует ключ 'Location', выполняет редирект.
+    Для запросов к JSON API (/api/) возвращает JSON с кодом ошибки.
     В противном случае возвращает HTML-страницу с кодом ошибки и сообщением.
     """
     if exc.headers is not None and "Location" in exc.headers:
@@ -51,6 +93,13 @@ async def http_exception_handler(
             status_code=exc.status_code,
         )
 
+    if request.url.path.startswith("/api/"):
+        return FastJSONResponse(
+            {"detail": exc.detail},
+            status_code=exc.status_code,
+            headers=exc.headers,
+        )
+
     return templates.TemplateResponse(
         name="mistakes.html",
         context={
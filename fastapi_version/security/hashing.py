@@ -0,0 +1,150 @@
+import asyncio
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Callable, TypeVar
+
+from core.config import settings
+
+from .utils import get_password_hash, verify_password
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """
+    Хэширование и проверка паролей (bcrypt) в пуле потоков или процессов,
+    чтобы вычисление хэша не блокировало event loop.
+
+    Число одновременных вычислений ограничено max_workers, остальные
+    запросы ждут своей очереди (queued) без блокировки event loop.
+
+    Attributes:
+        executor_type (str): тип пула: "thread" или "process".
+        max_workers (int): максимальное число одновременных вычислений.
+        queued (int): текущее число запросов, ожидающих свободного места.
+        max_queued (int): максимальная длина очереди с момента запуска.
+        in_flight (int): текущее число выполняемых вычислений.
+        completed (int): число завершенных вычислений.
+        wait_seconds (float): суммарное время ожидания в очереди.
+    """
+
+    def __init__(self, executor_type: str, max_workers: int):
+        """
+        Args:
+            executor_type (str): тип пула: "thread" или "process".
+            max_workers (int): максимальное число одновременных вычислений.
+        """
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.queued = 0
+        self.max_queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.wait_seconds = 0.0
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        """
+        Создает пул при первом обращении (процессы не запускаются, пока
+        не понадобятся).
+        """
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers,
+                    thread_name_prefix="password-hasher",
+                )
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Выполняет func в пуле, дождавшись свободного места.
+        """
+        queued_at = time.monotonic()
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.wait_seconds += time.monotonic() - queued_at
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            return await loop.run_in_executor(executor, func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        """
+        Хэширует пароль пользователя (см. get_password_hash).
+
+        Args:
+            password (str): пароль пользователя.
+
+        Returns:
+            str: захешированный пароль.
+        """
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Проверяет совпадение введенного пароля с захешированным
+        (см. verify_password).
+
+        Args:
+            plain_password (str): пароль пользователя.
+            hashed_password (str): захешированный пароль.
+
+        Returns:
+            bool: True, если пароли совпадают, иначе False.
+        """
+        return await self._run(
+            verify_password,
+            plain_password,
+            hashed_password,
+        )
+
+    def shutdown(self) -> None:
+        """
+        Останавливает пул потоков/процессов.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Возвращает счетчики пула для подбора его размера.
+
+        Returns:
+            dict[str, Any]: тип и размер пула, длина очереди, число
+                выполняемых и завершенных вычислений, среднее ожидание.
+        """
+        avg_wait = self.wait_seconds / self.completed if self.completed else 0
+        return {
+            "executor": self.executor_type,
+            "max_workers": self.max_workers,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "avg_wait_ms": avg_wait * 1000,
+        }
+
+
+password_hasher = PasswordHasher(
+    executor_type=settings.hashing.executor,
+    max_workers=settings.hashing.max_workers,
+)
@@ -1,6 +1,10 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
+from typing import Any
 
 import jwt
+from core.cache import TTLCache
 from core.config import settings
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
@@ -9,6 +13,13 @@ from passlib.context import CryptContext
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
+# Проверенные JWT-токены: sha256 токена -> claims. Время жизни записи
+# задается для каждого токена по его exp
+jwt_cache: TTLCache[bytes, dict[str, Any]] = TTLCache(
+    maxsize=settings.cache.jwt_maxsize,
+    ttl=0,
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -58,6 +69,10 @@ def get_user_id_from_token(
     """
     Получает ID пользователя из JWT-токена.
 
+    Подпись токена проверяется один раз: claims проверенного токена
+    хранятся в jwt_cache до его exp, повторные запросы с тем же токеном
+    сравнивают только exp с текущим временем.
+
     Args:
         token (str): JWT-токен.
 
@@ -68,10 +83,23 @@ def get_user_id_from_token(
         HTTPException: при истечении срока действия токена или его
             некорректности.
     """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = jwt_cache.get(key)
     try:
-        payload = jwt.decode(
-            token, settings.jwt.secret_key, algorithms=[settings.jwt.algorithm]
-        )
+        if payload is None:
+            payload = jwt.decode(
+                token,
+                settings.jwt.secret_key,
+                algorithms=[settings.jwt.algorithm],
+            )
+            if isinstance(exp := payload.get("exp"), (int, float)):
+                jwt_cache.set(key, payload, ttl=exp - time.time())
+
+        # Та же граница, что и в jwt.decode: токен истек при exp <= now
+        elif payload["exp"] <= time.time():
+            jwt_cache.pop(key)
+            raise jwt.ExpiredSignatureError("Signature has expired")
+
         return payload.get("user_id")
     except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
         raise HTTPException(status_code=303, headers={"Location": "/login"})
@@ -1,8 +1,15 @@
+from core.config import settings
 from flask import Blueprint
 
+from .stats import app_route as app_stats
 from .task import app_route as app_task
+from .task_api import app_route as app_task_api
 from .user import app_route as app_user
 
 app_route = Blueprint("app", __name__)
 app_route.register_blueprint(app_user)
 app_route.register_blueprint(app_task)
+app_route.register_blueprint(app_task_api)
+# Счетчики пула и кэшей открыты без авторизации - только по настройке
+if settings.stats:
+    app_route.register_blueprint(app_stats)
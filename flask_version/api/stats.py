@@ -0,0 +1,21 @@
+from core.models import db
+from crud.task import tasks_cache
+from flask import Blueprint, jsonify
+from werkzeug import Response
+
+app_route = Blueprint("stats", __name__)
+
+
+@app_route.route("/stats")
+def show_stats() -> Response:
+    """
+    Возвращает счетчики пула соединений и кэша результатов процесса для
+    подбора их размеров.
+
+    Returns:
+        Response: статистика в формате JSON.
+    """
+    return jsonify(
+        db_pool=db.postgresql_pool.stats(),
+        tasks_cache=tasks_cache.stats(),
+    )
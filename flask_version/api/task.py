@@ -1,9 +1,21 @@
-from api.utils import check_user_login
+from typing import Any
+
+from api.utils import (
+    check_user_login,
+    not_modified,
+    parse_task_ids,
+    stream_page,
+    task_ids_token,
+    tasks_etag,
+    tasks_list_url,
+    with_etag,
+)
 from core.config import settings
 from core.schemas.task import ChangeTaskForm, CreateTaskForm
 from crud import task as tsk
 from flask import (
     Blueprint,
+    make_response,
     redirect,
     render_template,
     request,
@@ -52,7 +64,7 @@ def create_task_route() -> Response | str:
 
 @app_route.route("/tasks", methods=["GET", "POST"])
 @check_user_login
-def show_all_tasks() -> str:
+def show_all_tasks() -> Response:
     """
     Обрабатывает запрос на просмотр задач пользователя с параметрами
     сортировки, фильтрации и поиска.
@@ -62,13 +74,32 @@ def show_all_tasks() -> str:
     - filter: фильтрация по статусу выполнения
         ('all', 'completed', 'uncompleted').
     - search: поисковый запрос по названию задачи.
+    - after / before: курсор соседней страницы (keyset-пагинация).
 
     В зависимости от выбранных значений подставляет соответствующие
-    SQL-параметры и возвращает HTML-страницу с отфильтрованными задачами.
+    SQL-параметры и возвращает HTML-страницу с отфильтрованными задачами
+    (не более settings.tasks.page_size задач на странице).
+
+    Если включен settings.tasks.stream, страница отдается потоком: шапка
+    уходит клиенту сразу, а строки таблицы отрисовываются по мере чтения
+    из БД. Страница из кэша (crud.task.tasks_cache) отдается целиком.
+
+    Страница отдается с ETag из версии задач пользователя и параметров
+    запроса; если задачи не менялись, на If-None-Match возвращается 304
+    после одного запроса версии.
 
     Returns:
-        str: HTML-страница с задачами пользователя.
+        Response: HTML-страница с задачами пользователя (в т.ч. потоковая)
+            или ответ 304.
     """
+    user_id = session.get(settings.users_data.user_id)
+    assert isinstance(user_id, int)
+
+    version = tsk.get_tasks_version(user_id)
+    etag = tasks_etag(user_id, version)
+    if (response := not_modified(etag)) is not None:
+        return response
+
     # Получаем параметр сортировки из URL (напр., "up" или "down")
     sort_option = request.args.get(
         settings.tasks.SORTED.name, settings.tasks.SORTED.default_html
@@ -99,29 +130,155 @@ def show_all_tasks() -> str:
     )
     assert isinstance(search_query, str)
 
+    # Получаем курсоры страниц (пустая строка - первая страница)
+    after = request.args.get(
+        settings.tasks.AFTER.name,
+        settings.tasks.AFTER.default_db,
+    )
+    assert isinstance(after, str)
+    before = request.args.get(
+        settings.tasks.BEFORE.name,
+        settings.tasks.BEFORE.default_db,
+    )
+    assert isinstance(before, str)
+
+    context: dict[str, Any] = {
+        "html_param": settings.tasks,
+        "sort_option": sort_option,
+        "filter_option": filter_option,
+        "search_query": search_query,
+    }
+    query: dict[str, Any] = {
+        "user_id": user_id,
+        "sorted_for_db": sorted_for_db,
+        "completed": filter_for_db,
+        "search_query": search_query,
+        "after": after,
+        "before": before,
+    }
+
+    cached: tsk.TaskPage | None = None
+    if settings.tasks.stream:
+        # Страница из кэша отдается целиком: ждать чтения из БД не нужно
+        cached = tsk.get_cached_tasks_page(version=version, **query)
+
+    if settings.tasks.stream and cached is None:
+        # Курсоры страниц заполняются по мере чтения строк
+        page = tsk.TaskPage()
+        tasks = tsk.iter_tasks_page(page, version=version, **query)
+        response = stream_page("tasks.html", page=page, tasks=tasks, **context)
+    else:
+        # Получаем страницу задач с учетом всех параметров
+        page = cached or tsk.get_tasks_page(version=version, **query)
+        response = make_response(
+            render_template(
+                "tasks.html",
+                page=page,
+                tasks=page.tasks,
+                **context,
+            )
+        )
+
+    return with_etag(response, etag)
+
+
+@app_route.route("/tasks/bulk", methods=["POST"])
+@check_user_login
+def bulk_tasks_action() -> Response | str:
+    """
+    Обрабатывает действие с задачами, выбранными на странице /tasks.
+
+    Получает значения из формы:
+    - ids: ID выбранных задач.
+    - action: действие ('complete', 'uncomplete' или 'delete').
+    - query: параметры списка задач для возврата на ту же страницу.
+
+    Отметка выполнения выполняется одним запросом, после чего
+    происходит редирект на список задач. Для удаления отображается одна
+    страница подтверждения для всех выбранных задач, а в сессии
+    сохраняется флаг подтверждения (см. task_ids_token).
+
+    Returns:
+        Response: редирект на страницу со списком задач.
+        str: HTML-страница подтверждения удаления или с сообщением об
+            ошибке.
+    """
     user_id = session.get(settings.users_data.user_id)
     assert isinstance(user_id, int)
-    # Получаем задачи с учетом всех параметров
-    tasks = tsk.get_all_tasks(
-        user_id=user_id,
-        sorted_for_db=sorted_for_db,
-        completed=filter_for_db,
-        search_query=search_query,
-    )
 
-    return render_template(
-        "tasks.html",
-        tasks=tasks,
-        html_param=settings.tasks,
-        sort_option=sort_option,
-        filter_option=filter_option,
-        search_query=search_query,
-    )
+    task_ids = parse_task_ids(request.form.getlist("ids"))
+    if task_ids is None:
+        return render_template(
+            "mistakes.html",
+            code=400,
+            message="Invalid task id",
+        )
+    action = request.form.get("action")
+    query = request.form.get("query")
+
+    if action in ("complete", "uncomplete"):
+        tsk.set_tasks_completed(
+            user_id=user_id,
+            task_ids=task_ids,
+            completed=action == "complete",
+        )
+    elif action == "delete":
+        tasks = tsk.get_tasks_by_ids(user_id=user_id, task_ids=task_ids)
+        if tasks:
+            session["allow_delete_tasks"] = task_ids_token(
+                [task["id"] for task in tasks]
+            )
+            return render_template(
+                "delete_tasks.html",
+                tasks=tasks,
+                query=query or "",
+            )
+    else:
+        return render_template(
+            "mistakes.html",
+            code=400,
+            message=f"Unknown action: {action}",
+        )
+
+    return redirect(tasks_list_url(query))
+
+
+@app_route.route("/tasks/bulk/delete", methods=["POST"])
+@check_user_login
+def bulk_delete_tasks() -> Response | str:
+    """
+    Удаляет выбранные задачи одним запросом, если удаление было
+    подтверждено, или отменяет удаление (кнопка "Нет / отмена").
+
+    Флаг подтверждения в сессии должен совпадать с хэшем списка ID задач
+    (см. task_ids_token). Если флаг не найден или не совпадает,
+    возвращает страницу ошибки (403). После выполнения операции флаг
+    удаляется из сессии.
+
+    Returns:
+        Response: редирект на страницу со списком задач.
+        str: HTML-страница с сообщением об ошибке.
+    """
+    task_ids = parse_task_ids(request.form.getlist("ids"))
+    allow_delete = session.pop("allow_delete_tasks", None)
+    if task_ids is None or allow_delete != task_ids_token(task_ids):
+        return render_template(
+            "mistakes.html",
+            code=403,
+            message="Deletion not confirmed",
+        )
+
+    user_id = session.get(settings.users_data.user_id)
+    assert isinstance(user_id, int)
+
+    if "confirm" in request.form:
+        tsk.delete_tasks(user_id=user_id, task_ids=task_ids)
+    return redirect(tasks_list_url(request.form.get("query")))
 
 
 @app_route.route("/tasks/<int:task_id>", methods=["GET", "POST"])
 @check_user_login
-def show_task_by_id(task_id: int) -> str:
+def show_task_by_id(task_id: int) -> Response | str:
     """
     Отображает страницу задачу по ID. Также обрабатывает редактирование задачи.
 
@@ -135,15 +292,25 @@ def show_task_by_id(task_id: int) -> str:
 
     Если задача с указанным ID не найдена, возвращает страницу ошибки.
 
+    GET-запрос отдается с ETag из версии задач пользователя; если задачи
+    не менялись, на If-None-Match возвращается 304.
+
     Args:
         task_id (int): ID задачи, которую требуется отобразить или изменить.
 
     Returns:
-        str: HTML-страница с задачей или с сообщением об ошибке (404).
+        Response: HTML-страница с задачей или ответ 304.
+        str: HTML-страница с задачей после POST-запроса или с сообщением
+            об ошибке (404).
     """
     user_id = session.get(settings.users_data.user_id)
     assert isinstance(user_id, int)
 
+    if request.method == "GET":
+        etag = tasks_etag(user_id, tsk.get_tasks_version(user_id))
+        if (response := not_modified(etag)) is not None:
+            return response
+
     task = tsk.get_task_by_id(
         user_id=user_id,
         task_id=task_id,
@@ -190,12 +357,22 @@ def show_task_by_id(task_id: int) -> str:
                 task_id=task_id,
             )
 
-    return render_template(
-        "task_id.html",
-        task=task,
-        edit_mode=edit_mode,
-        form=form,
+        return render_template(
+            "task_id.html",
+            task=task,
+            edit_mode=edit_mode,
+            form=form,
+        )
+
+    response = make_response(
+        render_template(
+            "task_id.html",
+            task=task,
+            edit_mode=edit_mode,
+            form=form,
+        )
     )
+    return with_etag(response, etag)
 
 
 @app_route.route("/tasks/<int:task_id>/before_delete")
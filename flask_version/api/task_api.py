@@ -0,0 +1,167 @@
+from dataclasses import asdict
+from typing import Any, Iterator
+
+from api.utils import check_api_login
+from core.compression import gzip_stream
+from core.config import settings
+from core.csv_import import ImportFormatError
+from core.schemas.task import CreateTaskForm
+from crud import task as tsk
+from flask import Blueprint, jsonify, request, session
+from werkzeug import Response
+
+app_route = Blueprint("task_api", __name__, url_prefix="/api/v1")
+
+# Размер фрагмента тела запроса при импорте
+IMPORT_CHUNK_SIZE = 64 * 1024
+
+# Формат выгрузки -> тип содержимого
+EXPORT_MIMETYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def validate_new_task(item: Any) -> tuple[tuple[str, str] | None, dict]:
+    """
+    Проверяет данные одной задачи из запроса массового создания по
+    правилам формы создания задачи (CreateTaskForm).
+
+    Args:
+        item (Any): данные задачи из JSON ({"name": ..., "describe": ...}).
+
+    Returns:
+        tuple[tuple[str, str] | None, dict]: название и описание задачи
+            (None, если данные некорректны) и ошибки по полям.
+    """
+    if not isinstance(item, dict):
+        return None, {"task": ["Task must be an object"]}
+
+    errors = {
+        field: ["Field must be a string"]
+        for field in ("name", "describe")
+        if not isinstance(item.get(field, ""), str)
+    }
+    if errors:
+        return None, errors
+
+    form = CreateTaskForm(data=item)
+    if not form.validate():
+        return None, dict(form.errors)
+
+    return (str(form.name.data), str(form.describe.data)), {}
+
+
+@app_route.route("/tasks/bulk", methods=["POST"])
+@check_api_login
+def create_tasks_bulk() -> tuple[Response, int] | Response:
+    """
+    Создает пакет задач пользователя одним запросом к БД в одной
+    транзакции (см. crud.task.create_tasks).
+
+    Тело запроса: {"tasks": [{"name": ..., "describe": ...}, ...]}.
+    Каждая задача проверяется отдельно: некорректные задачи пропускаются
+    и перечисляются в ответе, корректные создаются.
+
+    Returns:
+        Response: {"created": <число созданных задач>,
+            "errors": [{"index": <номер задачи>, "errors": {...}}]};
+            400 - тело запроса некорректно, 413 - слишком много задач.
+    """
+    user_id = session.get(settings.users_data.user_id)
+    assert isinstance(user_id, int)
+
+    body = request.get_json(silent=True)
+    items = body.get("tasks") if isinstance(body, dict) else None
+    if not isinstance(items, list):
+        detail = 'Request body must be {"tasks": [...]}'
+        return jsonify(detail=detail), 400
+    if len(items) > settings.api.bulk_max_size:
+        max_size = settings.api.bulk_max_size
+        detail = f"Too many tasks: {len(items)} (max {max_size})"
+        return jsonify(detail=detail), 413
+
+    tasks: list[tuple[str, str]] = []
+    errors: list[dict[str, Any]] = []
+    for index, item in enumerate(items):
+        task, item_errors = validate_new_task(item)
+        if task is None:
+            errors.append({"index": index, "errors": item_errors})
+        else:
+            tasks.append(task)
+
+    created = tsk.create_tasks(user_id, tasks)
+    return jsonify(created=created, errors=errors)
+
+
+@app_route.route("/tasks/import", methods=["POST"])
+@check_api_login
+def import_tasks() -> tuple[Response, int] | Response:
+    """
+    Импортирует задачи пользователя из CSV-файла в теле запроса
+    (см. crud.task.import_tasks).
+
+    Первая строка файла - заголовок: обязательны столбцы name и describe,
+    необязательны created_at, completed и completed_at (формат выгрузки
+    /api/v1/tasks/export?format=csv). Строки проверяются по правилам
+    формы создания задачи: некорректные пропускаются и перечисляются в
+    ответе, корректные создаются.
+
+    Returns:
+        Response: {"imported": <число созданных задач>,
+            "rejected": <число отклоненных строк>,
+            "errors": [{"line": <номер строки>, "errors": {...}}]};
+            400 - файл нельзя разобрать (задачи не создаются).
+    """
+    user_id = session.get(settings.users_data.user_id)
+    assert isinstance(user_id, int)
+
+    chunks = iter(lambda: request.stream.read(IMPORT_CHUNK_SIZE), b"")
+    try:
+        report = tsk.import_tasks(user_id, chunks)
+    except ImportFormatError as error:
+        return jsonify(detail=str(error)), 400
+    return jsonify(asdict(report))
+
+
+@app_route.route("/tasks/export")
+@check_api_login
+def export_tasks() -> tuple[Response, int] | Response:
+    """
+    Выгружает все задачи пользователя файлом CSV или NDJSON
+    (см. crud.task.iter_tasks_export).
+
+    Получает значения из URL-параметров:
+    - format: формат выгрузки ('csv' - по умолчанию, 'ndjson').
+    - gzip: '1' - сжать файл gzip на лету.
+
+    Файл отдается потоком прямо из COPY ... TO STDOUT; память не зависит
+    от числа задач.
+
+    Returns:
+        Response: файл выгрузки (tasks.csv, tasks.ndjson или tasks.*.gz);
+            400 - неизвестный формат.
+    """
+    user_id = session.get(settings.users_data.user_id)
+    assert isinstance(user_id, int)
+
+    export_format = request.args.get("format", "csv")
+    if export_format not in EXPORT_MIMETYPES:
+        formats = ", ".join(EXPORT_MIMETYPES)
+        return jsonify(detail=f"Unknown format, available: {formats}"), 400
+
+    chunks = tsk.iter_tasks_export(user_id, export_format)
+    body: Iterator[bytes] = chunks
+    filename = f"tasks.{export_format}"
+    mimetype = EXPORT_MIMETYPES[export_format]
+    if request.args.get("gzip") == "1":
+        body = gzip_stream(chunks, settings.compression.gzip_level)
+        filename += ".gz"
+        mimetype = "application/gzip"
+
+    disposition = f'attachment; filename="{filename}"'
+    response = Response(body, mimetype=mimetype)
+    response.headers["Content-Disposition"] = disposition
+    # Выгрузка (и COPY) прерывается, если клиент отключился
+    response.call_on_close(chunks.close)
+    return response
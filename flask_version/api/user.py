@@ -1,6 +1,8 @@
 from api.utils import check_user_login
+from core.analytics import WEEKDAYS, format_duration
 from core.config import settings
 from core.schemas.user import LoginForm, RegistrationForm
+from crud.task import get_completion_report, get_daily_stats
 from crud.user import add_new_user, check_user_exists
 from flask import (
     Blueprint,
@@ -102,10 +104,38 @@ def logout_user() -> Response:
 @check_user_login
 def user_page() -> str:
     """
-    Загружает основную страницу пользователя.
+    Загружает основную страницу пользователя со статистикой созданных и
+    выполненных задач за последние дни.
 
     Returns:
         str: HTML-страница пользователя.
     """
+    user_id = session.get(settings.users_data.user_id)
+    assert isinstance(user_id, int)
+
     name = session.get(settings.users_data.name)
-    return render_template("user_page.html", name=name)
+    stats = get_daily_stats(user_id, settings.tasks.stats_days)
+    return render_template("user_page.html", name=name, stats=stats)
+
+
+@app_route.route("/users/report")
+@check_user_login
+def completion_report_page() -> str:
+    """
+    Загружает отчет о выполнении задач пользователя: процентили и
+    гистограмму времени выполнения, распределение по дням недели и часам
+    и серии дней подряд (см. crud.task.get_completion_report).
+
+    Returns:
+        str: HTML-страница отчета.
+    """
+    user_id = session.get(settings.users_data.user_id)
+    assert isinstance(user_id, int)
+
+    report = get_completion_report(user_id)
+    return render_template(
+        "report.html",
+        report=report,
+        weekdays=WEEKDAYS,
+        format_duration=format_duration,
+    )
@@ -1,8 +1,169 @@
-from functools import wraps
-from typing import Any, Callable
+import hashlib
+import mimetypes
+import os
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
 
+from core import static
+from core.compression import Encoder, brotli, make_encoder
 from core.config import settings
-from flask import redirect, session, url_for
+from flask import (
+    Flask,
+    current_app,
+    jsonify,
+    redirect,
+    request,
+    send_file,
+    session,
+    stream_template,
+    url_for,
+)
+from jinja2 import FileSystemBytecodeCache
+from werkzeug import Response
+
+
+def setup_templates(app: Flask) -> None:
+    """
+    Подключает к окружению Jinja2 приложения кэш байткода (settings.jinja)
+    и, если включено, заранее компилирует все шаблоны, чтобы первые
+    запросы после запуска воркера не тратили время на компиляцию.
+
+    Вызывается до первого обращения к app.jinja_env: параметры окружения
+    применяются при его создании.
+
+    Args:
+        app (Flask): приложение Flask.
+    """
+    if directory := settings.jinja.bytecode_cache_dir:
+        os.makedirs(directory, exist_ok=True)
+        app.jinja_options = {
+            **app.jinja_options,
+            "bytecode_cache": FileSystemBytecodeCache(directory),
+        }
+
+    if settings.jinja.preload:
+        for name in app.jinja_env.list_templates():
+            app.jinja_env.get_template(name)
+
+
+def static_url(path: str) -> str:
+    """
+    Возвращает URL файла статики с хэшем содержимого (для шаблонов).
+    Если файла нет в manifest, возвращает обычный URL.
+
+    Args:
+        path (str): путь файла относительно папки статики.
+
+    Returns:
+        str: URL файла статики.
+    """
+    return url_for("static", filename=static.manifest.get(path, path))
+
+
+def setup_static(app: Flask) -> None:
+    """
+    Собирает статику (core.static.build_static) и подменяет обработчик
+    /static: файлы с хэшем содержимого в имени отдаются из папки собранной
+    статики, сжатыми по Accept-Encoding и с Cache-Control: immutable.
+    Остальные пути отдаются как обычно.
+
+    Args:
+        app (Flask): приложение Flask.
+    """
+    assert app.static_folder is not None
+    build_dir = Path(app.root_path) / settings.static.build_dir
+    static.build_static(Path(app.static_folder), build_dir)
+
+    def send_built_file(filename: str) -> Response:
+        """
+        Отдает файл статики; файл с хэшем - из папки собранной статики.
+        """
+        if filename not in static.hashed_paths:
+            return app.send_static_file(filename)
+
+        file = build_dir / filename
+        encoding = None
+        for name, (suffix, _) in static.COMPRESSORS.items():
+            compressed = file.with_name(file.name + suffix)
+            if request.accept_encodings[name] and compressed.is_file():
+                file, encoding = compressed, name
+                break
+
+        response = send_file(
+            file,
+            mimetype=mimetypes.guess_type(filename)[0],
+            max_age=settings.static.max_age,
+        )
+        if encoding is not None:
+            response.content_encoding = encoding
+        response.vary.add("Accept-Encoding")
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    app.view_functions["static"] = send_built_file
+    app.add_template_global(static_url)
+
+
+def _compressed(chunks: Iterable[bytes], encoder: Encoder) -> Iterator[bytes]:
+    """
+    Сжимает потоковый ответ по фрагментам: каждый фрагмент уходит клиенту
+    сразу после отрисовки.
+    """
+    for chunk in chunks:
+        if chunk:
+            yield encoder.compress(chunk)
+    yield encoder.finish()
+
+
+def compress_response(response: Response) -> Response:
+    """
+    Сжимает ответ (brotli, если установлен, или gzip), если клиент это
+    поддерживает, тип содержимого входит в settings.compression.mimetypes,
+    а ответ не сжат и не меньше settings.compression.minimum_size байт.
+    Потоковый ответ сжимается по мере отправки, целиком в памяти не
+    собирается.
+
+    Args:
+        response (Response): ответ обработчика.
+
+    Returns:
+        Response: тот же ответ, при необходимости сжатый.
+    """
+    config = settings.compression
+    if (
+        response.status_code in (204, 304)
+        or response.direct_passthrough
+        or response.content_encoding
+        or response.mimetype not in config.mimetypes
+    ):
+        return response
+
+    if brotli is not None and request.accept_encodings["br"]:
+        encoding = "br"
+    elif request.accept_encodings["gzip"]:
+        encoding = "gzip"
+    else:
+        return response
+
+    encoder = make_encoder(encoding, config.gzip_level, config.brotli_quality)
+    if response.is_streamed:
+        # Исходный итератор закрывается вместе с ответом (Response.close)
+        original = response.response
+        response.response = _compressed(response.iter_encoded(), encoder)
+        if close := getattr(original, "close", None):
+            response.call_on_close(close)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < config.minimum_size:
+            return response
+        response.set_data(encoder.compress(data) + encoder.finish())
+
+    response.content_encoding = encoding
+    response.vary.add("Accept-Encoding")
+    return response
 
 
 def check_user_login(func) -> Callable:
@@ -40,3 +201,193 @@ def check_user_login(func) -> Callable:
             return redirect(url_for("app.user.login_user"))
 
     return wrapper
+
+
+def check_api_login(func) -> Callable:
+    """
+    Декоратор, проверяющий авторизацию запроса к JSON API (см.
+    check_user_login). Вместо редиректа на страницу логина отвечает 401.
+
+    Args:
+        func (Callable): функция, к которой применяется декоратор.
+
+    Returns:
+        Callable: обернутая функция, с выполненной проверкой авторизации.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        if session.get(settings.users_data.user_id):
+            return func(*args, **kwargs)
+        return jsonify(detail="Not authenticated"), 401
+
+    return wrapper
+
+
+def _buffered(chunks: Iterator[str], chunk_size: int) -> Iterator[str]:
+    """
+    Склеивает мелкие фрагменты отрисовки шаблона в блоки не меньше
+    chunk_size символов, чтобы не отправлять клиенту каждый фрагмент
+    отдельно.
+    """
+    buffer: list[str] = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def stream_page(
+    template_name: str,
+    chunk_size: int = 4096,
+    **context: Any,
+) -> Response:
+    """
+    Отрисовывает шаблон потоком: начало страницы уходит клиенту сразу,
+    не дожидаясь отрисовки всего шаблона.
+
+    Генераторы в контексте (напр., строки из БД) читаются по мере
+    отрисовки внутри контекста запроса (stream_with_context), поэтому
+    страница целиком в памяти не собирается.
+
+    Args:
+        template_name (str): имя шаблона.
+        chunk_size (int): минимальный размер отправляемого блока.
+        **context: контекст шаблона.
+
+    Returns:
+        Response: потоковый HTML-ответ.
+    """
+    chunks = stream_template(template_name, **context)
+    return Response(_buffered(chunks, chunk_size), mimetype="text/html")
+
+
+@lru_cache(maxsize=1)
+def build_id() -> str:
+    """
+    Возвращает идентификатор сборки: хэш manifest статики и исходников
+    шаблонов. Меняется после деплоя с новой разметкой или статикой.
+
+    Вычисляется при первом обращении (в контексте приложения), когда
+    статика уже собрана.
+
+    Returns:
+        str: идентификатор сборки.
+    """
+    env = current_app.jinja_env
+    digest = hashlib.blake2b(digest_size=8)
+    for path in sorted(static.manifest):
+        digest.update(f"{path}={static.manifest[path]}".encode())
+    assert env.loader is not None
+    for name in sorted(env.list_templates()):
+        source, _, _ = env.loader.get_source(env, name)
+        digest.update(name.encode())
+        digest.update(source.encode())
+    return digest.hexdigest()
+
+
+def tasks_etag(user_id: int, version: int) -> str:
+    """
+    Строит значение ETag страницы задач из версии задач пользователя,
+    пути и параметров запроса (сортировка, фильтр, поиск, курсоры).
+
+    ID пользователя входит в ETag, чтобы страница одного пользователя не
+    подтвердилась для другого в том же браузере, а идентификатор сборки
+    (build_id) - чтобы после деплоя браузер не показывал старую разметку.
+
+    Args:
+        user_id (int): ID пользователя.
+        version (int): версия задач пользователя.
+
+    Returns:
+        str: значение ETag (без кавычек).
+    """
+    query = sorted(request.args.items(multi=True))
+    key = f"{build_id()}:{user_id}:{request.path}?{query}"
+    digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+    return f"{version}-{digest}"
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    """
+    Добавляет к ответу слабый ETag: браузер хранит страницу, но перед
+    показом каждый раз перепроверяет ее (If-None-Match).
+
+    Args:
+        response (Response): ответ.
+        etag (str): значение ETag.
+
+    Returns:
+        Response: тот же ответ.
+    """
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def not_modified(etag: str) -> Response | None:
+    """
+    Возвращает ответ 304 Not Modified, если ETag совпадает с одним из
+    значений If-None-Match, иначе None.
+
+    Args:
+        etag (str): текущее значение ETag страницы.
+
+    Returns:
+        Response | None: ответ 304 или None.
+    """
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    return with_etag(Response(status=304), etag)
+
+
+def parse_task_ids(values: list[str]) -> list[int] | None:
+    """
+    Разбирает ID задач, выбранных на странице /tasks (поля формы ids).
+
+    Args:
+        values (list[str]): значения полей формы.
+
+    Returns:
+        list[int] | None: ID задач по возрастанию, без повторов; None,
+            если ID некорректны или их слишком много.
+    """
+    try:
+        task_ids = sorted({int(value) for value in values})
+    except ValueError:
+        return None
+    if len(task_ids) > settings.api.bulk_max_size:
+        return None
+    return task_ids
+
+
+def task_ids_token(task_ids: list[int]) -> str:
+    """
+    Флаг подтверждения удаления выбранных задач в сессии
+    ('allow_delete_tasks'): хэш списка ID (сам список может не
+    поместиться в Cookie сессии).
+
+    Args:
+        task_ids (list[int]): ID задач (см. parse_task_ids).
+
+    Returns:
+        str: хэш списка ID.
+    """
+    key = ",".join(map(str, task_ids))
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def tasks_list_url(query: str | None) -> str:
+    """
+    Адрес страницы /tasks с параметрами списка (сортировка, фильтр,
+    поиск), с которой были выбраны задачи (поле формы query).
+    """
+    url = url_for("app.task.show_all_tasks")
+    return f"{url}?{query}" if query else url
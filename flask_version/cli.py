@@ -0,0 +1,46 @@
+"""
+Команды обслуживания приложения (flask CLI).
+
+Запуск из папки flask_version:
+    flask --app main import-tasks <имя пользователя> <файл CSV или ->
+"""
+
+import time
+from typing import BinaryIO
+
+import click
+from core.csv_import import ImportFormatError
+from crud import task as tsk
+from crud.user import get_user_id
+
+CHUNK_SIZE = 64 * 1024
+
+
+@click.command("import-tasks")
+@click.argument("username")
+@click.argument("file", type=click.File("rb"))
+def import_tasks(username: str, file: BinaryIO) -> None:
+    """
+    Импортирует задачи пользователя USERNAME из CSV-файла FILE (см.
+    crud.task.import_tasks) и выводит отчет.
+    """
+    user_id = get_user_id(username)
+    if user_id is None:
+        raise click.ClickException(f"User {username!r} not found")
+
+    started = time.perf_counter()
+    chunks = iter(lambda: file.read(CHUNK_SIZE), b"")
+    try:
+        report = tsk.import_tasks(user_id, chunks)
+    except ImportFormatError as error:
+        raise click.ClickException(f"Import failed: {error}")
+    elapsed = time.perf_counter() - started
+
+    click.echo(
+        f"Imported: {report.imported}, rejected: {report.rejected} "
+        f"({elapsed:.2f} s, {report.imported / elapsed:.0f} rows/s)"
+    )
+    for rejected in report.errors:
+        line = rejected["line"]
+        for field, messages in rejected["errors"].items():
+            click.echo(f"line {line}: {field}: {' '.join(messages)}")
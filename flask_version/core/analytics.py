@@ -0,0 +1,180 @@
+import datetime
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+
+PERCENTILES = (50, 75, 90, 99)
+
+# Группы гистограммы времени выполнения: (название, верхняя граница в
+# секундах, не включая)
+DURATION_BINS: tuple[tuple[str, float], ...] = (
+    ("до 1 часа", 60 * 60),
+    ("1-6 часов", 6 * 60 * 60),
+    ("6-24 часа", 24 * 60 * 60),
+    ("1-3 дня", 3 * 24 * 60 * 60),
+    ("3-7 дней", 7 * 24 * 60 * 60),
+    ("1-4 недели", 28 * 24 * 60 * 60),
+    ("больше 4 недель", math.inf),
+)
+
+WEEKDAYS = ("Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс")
+
+SECONDS_PER_DAY = 24 * 60 * 60
+# День недели 1970-01-01 (четверг, date.weekday() == 3): отсчет дней
+# недели от эпохи
+EPOCH_WEEKDAY = 3
+EPOCH = datetime.date(1970, 1, 1)
+
+# Двоичный формат массива PostgreSQL (array_send): заголовок (число
+# измерений, флаг NULL, OID типа элемента, длина и нижняя граница
+# измерения), затем элементы - длина (int4) и значение (float8). Элемент
+# NULL записывается длиной -1 без значения и сбил бы шаг
+_ARRAY_HEADER_SIZE = 20
+_ARRAY_HAS_NULL = slice(4, 8)
+
+
+def decode_float8_array(data: bytes | memoryview | None) -> np.ndarray:
+    """
+    Разбирает массив float8[] без NULL в двоичном формате PostgreSQL
+    (результат array_send) в массив NumPy без цикла по элементам:
+    элементы лежат с постоянным шагом 12 байт.
+
+    Args:
+        data (bytes | memoryview | None): результат array_send
+            (None - array_agg по пустой выборке).
+
+    Returns:
+        np.ndarray: значения массива (float64).
+
+    Raises:
+        ValueError: в массиве есть элементы NULL.
+    """
+    if data is None or len(data) <= _ARRAY_HEADER_SIZE:
+        return np.empty(0)
+    if int.from_bytes(data[_ARRAY_HAS_NULL], "big"):
+        raise ValueError("float8[] array contains NULL elements")
+    items = np.frombuffer(
+        data,
+        dtype=np.dtype([("size", ">i4"), ("value", ">f8")]),
+        offset=_ARRAY_HEADER_SIZE,
+    )
+    return items["value"].astype(np.float64)
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Форматирует длительность для отчета (напр., '2 д 5 ч', '3 ч 20 мин').
+    """
+    minutes = int(seconds // 60)
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days} д {hours} ч"
+    if hours:
+        return f"{hours} ч {minutes} мин"
+    return f"{minutes} мин"
+
+
+@dataclass
+class CompletionReport:
+    """
+    Отчет о времени выполнения задач пользователя.
+
+    Attributes:
+        completed (int): число выполненных задач.
+        percentiles (list[tuple[int, float]]): процентили времени
+            выполнения (процентиль, секунды) для PERCENTILES.
+        mean (float): среднее время выполнения, в секундах.
+        histogram (list[tuple[str, int]]): число задач в каждой группе
+            DURATION_BINS.
+        heatmap (list[list[int]]): число выполненных задач по дням недели
+            (строки, с понедельника) и часам (столбцы).
+        heatmap_max (int): наибольшее значение heatmap.
+        active_days (int): число дней, в которые выполнялись задачи.
+        longest_streak (int): самая длинная серия дней подряд с
+            выполненными задачами.
+        current_streak (int): текущая серия (заканчивается сегодня или
+            вчера).
+    """
+
+    completed: int = 0
+    percentiles: list[tuple[int, float]] = field(default_factory=list)
+    mean: float = 0.0
+    histogram: list[tuple[str, int]] = field(default_factory=list)
+    heatmap: list[list[int]] = field(default_factory=list)
+    heatmap_max: int = 0
+    active_days: int = 0
+    longest_streak: int = 0
+    current_streak: int = 0
+
+
+def _streaks(days: np.ndarray, today: int) -> tuple[int, int]:
+    """
+    Возвращает самую длинную и текущую серии дней подряд для
+    отсортированных номеров дней без повторов.
+    """
+    if not days.size:
+        return 0, 0
+    # Серия обрывается там, где следующий день не идет сразу за текущим
+    ends = np.flatnonzero(np.diff(days) != 1)
+    starts = np.concatenate(([0], ends + 1))
+    ends = np.append(ends, days.size - 1)
+    lengths = ends - starts + 1
+    current = int(lengths[-1]) if days[-1] >= today - 1 else 0
+    return int(lengths.max()), current
+
+
+def completion_report(
+    created_at: np.ndarray,
+    completed_at: np.ndarray,
+    today: datetime.date,
+) -> CompletionReport:
+    """
+    Считает отчет о выполнении задач векторными операциями NumPy.
+
+    Время передается секундами от эпохи (date_part('epoch', ...)) для
+    столбцов TIMESTAMP: местное время без часового пояса, поэтому день,
+    день недели и час считаются от эпохи без поправок. Задачи, выполненные
+    раньше создания (напр., после импорта), не учитываются во времени
+    выполнения, но учитываются в распределении по дням и часам.
+
+    Args:
+        created_at (np.ndarray): время создания выполненных задач.
+        completed_at (np.ndarray): время выполнения тех же задач.
+        today (datetime.date): текущий день (для текущей серии).
+
+    Returns:
+        CompletionReport: отчет.
+    """
+    report = CompletionReport(completed=int(completed_at.size))
+
+    durations = completed_at - created_at
+    durations = durations[durations >= 0]
+    if durations.size:
+        values = np.percentile(durations, PERCENTILES)
+        report.percentiles = list(zip(PERCENTILES, values.tolist()))
+        report.mean = float(durations.mean())
+    upper_bounds = [upper for _, upper in DURATION_BINS[:-1]]
+    counts = np.bincount(
+        np.searchsorted(upper_bounds, durations, side="right"),
+        minlength=len(DURATION_BINS),
+    )
+    names = [name for name, _ in DURATION_BINS]
+    report.histogram = list(zip(names, counts.tolist()))
+
+    days = np.floor_divide(completed_at, SECONDS_PER_DAY).astype(np.int64)
+    hours = (completed_at - days * SECONDS_PER_DAY) // 3600
+    weekdays = (days + EPOCH_WEEKDAY) % 7
+    cells = (weekdays * 24 + hours).astype(np.int64)
+    heatmap = np.bincount(cells, minlength=7 * 24).reshape(7, 24)
+    report.heatmap = heatmap.tolist()
+    report.heatmap_max = int(heatmap.max())
+
+    active_days = np.unique(days)
+    report.active_days = int(active_days.size)
+    report.longest_streak, report.current_streak = _streaks(
+        active_days,
+        (today - EPOCH).days,
+    )
+    return report
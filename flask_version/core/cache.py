@@ -0,0 +1,163 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Версия данных, значение и его размер
+Entry = tuple[int, V, int]
+
+
+class ResultCache(Generic[K, V]):
+    """
+    Потокобезопасный кэш результатов запросов пользователей в памяти
+    процесса с бюджетом памяти и вытеснением давно неиспользуемых записей
+    (LRU).
+
+    Каждая запись хранит версию данных пользователя, для которой она
+    получена: запись с другой версией считается устаревшей. Так кэш
+    остается верным, даже если данные изменил другой процесс. Записи
+    пользователя, измененные в этом процессе, удаляются сразу
+    (invalidate).
+
+    Attributes:
+        maxbytes (int): бюджет памяти, в байтах (по оценке sizeof).
+        hits (int): число найденных в кэше значений.
+        misses (int): число промахов (в т.ч. устаревших записей).
+        evictions (int): число записей, вытесненных из-за maxbytes.
+        invalidations (int): число записей, удаленных invalidate.
+    """
+
+    def __init__(self, maxbytes: int, sizeof: Callable[[V], int]):
+        """
+        Args:
+            maxbytes (int): бюджет памяти, в байтах.
+            sizeof (Callable[[V], int]): оценка размера значения, в байтах.
+        """
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        # Записи по (ID пользователя, ключ)
+        self._data: OrderedDict[tuple[int, K], Entry[V]] = OrderedDict()
+        self._user_keys: dict[int, set[K]] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, user_id: int, key: K, version: int) -> V | None:
+        """
+        Возвращает значение, если оно есть в кэше и получено для версии
+        version данных пользователя.
+
+        Args:
+            user_id (int): ID пользователя.
+            key (K): ключ (параметры запроса).
+            version (int): текущая версия данных пользователя.
+
+        Returns:
+            V | None: значение или None при промахе.
+        """
+        with self._lock:
+            item = self._data.get((user_id, key))
+            if item is None or item[0] != version:
+                self.misses += 1
+                return None
+
+            self._data.move_to_end((user_id, key))
+            self.hits += 1
+            return item[1]
+
+    def set(self, user_id: int, key: K, version: int, value: V) -> None:
+        """
+        Сохраняет значение, вытесняя самые давние записи сверх бюджета
+        памяти. Значение больше всего бюджета не сохраняется.
+
+        Args:
+            user_id (int): ID пользователя.
+            key (K): ключ (параметры запроса).
+            version (int): версия данных пользователя.
+            value (V): значение.
+        """
+        size = self.sizeof(value)
+        with self._lock:
+            current = self._data.get((user_id, key))
+            if current is not None and current[0] > version:
+                # Другой поток уже сохранил результат для новой версии
+                return
+
+            self._remove(user_id, key)
+            if size > self.maxbytes:
+                return
+
+            self._data[(user_id, key)] = (version, value, size)
+            self._user_keys.setdefault(user_id, set()).add(key)
+            self.bytes += size
+            while self.bytes > self.maxbytes:
+                (old_user_id, old_key), _ = next(iter(self._data.items()))
+                self._remove(old_user_id, old_key)
+                self.evictions += 1
+
+    def _remove(self, user_id: int, key: K) -> bool:
+        """
+        Удаляет запись, если она есть. Вызывается под self._lock.
+        """
+        item = self._data.pop((user_id, key), None)
+        if item is None:
+            return False
+
+        self.bytes -= item[2]
+        keys = self._user_keys[user_id]
+        keys.discard(key)
+        if not keys:
+            del self._user_keys[user_id]
+        return True
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Удаляет все записи пользователя.
+
+        Args:
+            user_id (int): ID пользователя.
+        """
+        with self._lock:
+            for key in list(self._user_keys.get(user_id, ())):
+                if self._remove(user_id, key):
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """
+        Удаляет все записи из кэша.
+        """
+        with self._lock:
+            self._data.clear()
+            self._user_keys.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Возвращает счетчики кэша для подбора его бюджета памяти.
+
+        Returns:
+            dict[str, Any]: число записей, занятая память и бюджет,
+                попадания, промахи, доля попаданий, число вытесненных и
+                сброшенных записей.
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "users": len(self._user_keys),
+                "bytes": self.bytes,
+                "maxbytes": self.maxbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / requests if requests else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
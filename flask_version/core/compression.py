@@ -0,0 +1,89 @@
+import zlib
+from typing import Iterable, Iterator, Protocol
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # brotli - необязательная зависимость
+    brotli = None
+
+
+class Encoder(Protocol):
+    """
+    Потоковое сжатие тела ответа.
+    """
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Сжимает очередной фрагмент и сбрасывает накопленные данные, чтобы
+        клиент получил фрагмент сразу (для потоковых ответов).
+        """
+
+    def finish(self) -> bytes:
+        """
+        Завершает сжатый поток.
+        """
+
+
+class GzipEncoder:
+    def __init__(self, level: int):
+        # wbits 16 + MAX_WBITS - формат gzip (заголовок и контрольная сумма)
+        wbits = 16 + zlib.MAX_WBITS
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, data: bytes) -> bytes:
+        compressed = self._compressor.compress(data)
+        return compressed + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int) -> Iterator[bytes]:
+    """
+    Сжимает поток фрагментов в формат gzip (напр., файл выгрузки) по мере
+    получения фрагментов.
+
+    Args:
+        chunks (Iterable[bytes]): исходные фрагменты.
+        level (int): уровень сжатия gzip (1-9).
+
+    Yields:
+        bytes: фрагменты файла gzip.
+    """
+    encoder = GzipEncoder(level)
+    for chunk in chunks:
+        if compressed := encoder.compress(chunk):
+            yield compressed
+    yield encoder.finish()
+
+
+def make_encoder(
+    encoding: str,
+    gzip_level: int,
+    brotli_quality: int,
+) -> Encoder:
+    """
+    Создает потоковое сжатие.
+
+    Args:
+        encoding (str): "br" или "gzip".
+        gzip_level (int): уровень сжатия gzip (1-9).
+        brotli_quality (int): уровень сжатия brotli (0-11).
+
+    Returns:
+        Encoder: потоковое сжатие.
+    """
+    if encoding == "br":
+        return BrotliEncoder(brotli_quality)
+    return GzipEncoder(gzip_level)
@@ -5,6 +5,9 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Значение сортировки по схожести названия задачи с поисковой строкой
+SORT_BY_RELEVANCE = "relevance"
+
 
 @dataclass
 class DatabaseConfig:
@@ -16,12 +19,27 @@ class DatabaseConfig:
         user (str | None): имя пользователя.
         password (str | None): пароль пользователя.
         host (str | None): адрес хоста базы данных.
+        itersize (int): число строк, выбираемых серверным курсором за один
+            запрос к БД.
+        minconn (int): число соединений, открываемых при запуске.
+        maxconn (int): максимальное число соединений в пуле.
+        pool_timeout (float): максимальное ожидание свободного соединения,
+            в секундах.
+        pool_recycle (float): время жизни соединения, в секундах.
+        pool_ping_after (float): время простоя, после которого соединение
+            проверяется перед выдачей, в секундах.
     """
 
     database: str | None = os.getenv("DATABASE")
     user: str | None = os.getenv("USER")
     password: str | None = os.getenv("PASSWORD")
     host: str | None = os.getenv("HOST")
+    itersize: int = int(os.getenv("DB_ITERSIZE", 2000))
+    minconn: int = int(os.getenv("DB_MINCONN", 1))
+    maxconn: int = int(os.getenv("DB_MAXCONN", 10))
+    pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    pool_recycle: float = float(os.getenv("DB_POOL_RECYCLE", 3600))
+    pool_ping_after: float = float(os.getenv("DB_POOL_PING_AFTER", 30))
 
 
 @dataclass
@@ -38,6 +56,97 @@ class UserAuth:
     name: str = "name"
 
 
+@dataclass
+class JinjaConfig:
+    """
+    Конфигурация компиляции шаблонов Jinja2.
+
+    Attributes:
+        bytecode_cache_dir (str): папка кэша байткода шаблонов, общая для
+            всех воркеров; пустая строка - без кэша.
+        preload (bool): компилировать все шаблоны при запуске приложения,
+            а не при первом запросе.
+    """
+
+    bytecode_cache_dir: str = os.getenv("JINJA_CACHE_DIR", ".jinja_cache")
+    preload: bool = os.getenv("JINJA_PRELOAD", "1") == "1"
+
+
+@dataclass
+class StaticConfig:
+    """
+    Конфигурация отдачи статики.
+
+    Attributes:
+        build_dir (str): папка собранной статики: файлы с хэшем
+            содержимого в имени и их сжатые варианты (см. core.static).
+        max_age (int): время хранения файла с хэшем в кэше браузера,
+            в секундах.
+    """
+
+    build_dir: str = os.getenv("STATIC_BUILD_DIR", ".static_build")
+    max_age: int = int(os.getenv("STATIC_MAX_AGE", 365 * 24 * 60 * 60))
+
+
+@dataclass
+class CompressionConfig:
+    """
+    Конфигурация сжатия ответов (api.utils.compress_response).
+
+    Attributes:
+        minimum_size (int): минимальный размер сжимаемого ответа, в байтах
+            (потоковые ответы сжимаются всегда).
+        gzip_level (int): уровень сжатия gzip (1-9).
+        brotli_quality (int): уровень сжатия brotli (0-11), если
+            установлен пакет brotli.
+        mimetypes (tuple[str, ...]): сжимаемые типы содержимого.
+    """
+
+    minimum_size: int = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    gzip_level: int = int(os.getenv("COMPRESS_GZIP_LEVEL", 6))
+    brotli_quality: int = int(os.getenv("COMPRESS_BROTLI_QUALITY", 5))
+    mimetypes: tuple[str, ...] = (
+        "text/html",
+        "text/css",
+        "text/plain",
+        "application/json",
+        "application/javascript",
+        "image/svg+xml",
+    )
+
+
+@dataclass
+class ApiConfig:
+    """
+    Конфигурация JSON API (/api/v1).
+
+    Attributes:
+        bulk_max_size (int): максимальное количество задач в одном
+            запросе массового создания.
+        import_batch_size (int): количество задач в одном COPY при
+            импорте из CSV.
+        import_max_errors (int): сколько отклоненных строк импорта
+            перечислять в ответе (считаются все).
+    """
+
+    bulk_max_size: int = int(os.getenv("API_BULK_MAX_SIZE", 10_000))
+    import_batch_size: int = int(os.getenv("API_IMPORT_BATCH_SIZE", 10_000))
+    import_max_errors: int = int(os.getenv("API_IMPORT_MAX_ERRORS", 100))
+
+
+@dataclass
+class CacheConfig:
+    """
+    Конфигурация кэшей в памяти процесса.
+
+    Attributes:
+        tasks_maxbytes (int): бюджет памяти кэша страниц задач
+            (crud.task.get_tasks_page), в байтах.
+    """
+
+    tasks_maxbytes: int = int(os.getenv("CACHE_TASKS_MAXBYTES", 32 * 1024**2))
+
+
 @dataclass
 class ParamConfig:
     """
@@ -70,6 +179,12 @@ class AllTaskParams:
         SORTED (ParamConfig): параметры сортировки задач.
         FILTER (ParamConfig): параметры фильтрации задач по статусу выполнения.
         SEARCH (ParamConfig): параметры поиска задач по имени.
+        AFTER (ParamConfig): курсор страницы, после которой идет текущая.
+        BEFORE (ParamConfig): курсор страницы, перед которой идет текущая.
+        page_size (int): количество задач на одной странице.
+        stream (bool): отдавать страницу со списком задач потоком.
+        stats_days (int): количество дней в статистике на странице
+            пользователя.
     """
 
     SORTED: ParamConfig = ParamConfig(
@@ -81,12 +196,14 @@ class AllTaskParams:
             "down": "created_at DESC",
             "completed": "completed_at",
             "name": "name",
+            "relevance": SORT_BY_RELEVANCE,
         },
         html_map={
             "up": "Сначала старые",
             "down": "Сначала новые",
             "completed": "По дате завершения",
             "name": "По названию",
+            "relevance": "По релевантности",
         },
     )
 
@@ -108,6 +225,12 @@ class AllTaskParams:
 
     SEARCH: ParamConfig = ParamConfig(name="search", default_db="")
 
+    AFTER: ParamConfig = ParamConfig(name="after", default_db="")
+    BEFORE: ParamConfig = ParamConfig(name="before", default_db="")
+    stream: bool = os.getenv("TASKS_STREAM", "1") == "1"
+    page_size: int = int(os.getenv("TASKS_PAGE_SIZE", 50))
+    stats_days: int = int(os.getenv("TASKS_STATS_DAYS", 14))
+
 
 @dataclass
 class Settings:
@@ -118,12 +241,26 @@ class Settings:
         db (DatabaseConfig): конфигурация бд.
         users_data (UserAuth): ключи для хранения данных пользователя в сессии.
         secret_key (str | None): секретный ключ для подписи сессий Flask.
+        stats (bool): подключать /stats - счетчики пула соединений и кэшей
+            процесса без авторизации (только для подбора размеров, не для
+            публичного доступа).
+        jinja (JinjaConfig): конфигурация компиляции шаблонов.
+        static (StaticConfig): конфигурация отдачи статики.
+        compression (CompressionConfig): конфигурация сжатия ответов.
+        api (ApiConfig): конфигурация JSON API.
+        cache (CacheConfig): конфигурация кэшей в памяти процесса.
         tasks (AllTaskParams): параметры сортировки, фильтрации и поиска задач.
     """
 
     db: DatabaseConfig = DatabaseConfig()
     users_data: UserAuth = UserAuth()
     secret_key: str | None = os.getenv("SESSION_KEY")
+    stats: bool = os.getenv("STATS", "0") == "1"
+    jinja: JinjaConfig = JinjaConfig()
+    static: StaticConfig = StaticConfig()
+    compression: CompressionConfig = CompressionConfig()
+    api: ApiConfig = ApiConfig()
+    cache: CacheConfig = CacheConfig()
     tasks: AllTaskParams = AllTaskParams()
 
 
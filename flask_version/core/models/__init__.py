@@ -1,9 +1,13 @@
 __all__ = (
     "db",
+    "PoolTimeout",
     "create_users_table",
     "create_tasks_table",
+    "create_user_daily_stats_table",
 )
 
 from .base import db
+from .pool import PoolTimeout
 from .task import create_tasks_table
 from .user import create_users_table
+from .user_daily_stats import create_user_daily_stats_table
@@ -1,16 +1,99 @@
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from itertools import count
+from typing import Any, Generator, Sequence
 
 from core.config import settings
-from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+from psycopg2 import extensions
+from psycopg2.extras import NamedTupleCursor, RealDictCursor
+
+from .pool import ConnectionPool
+
+# Плейсхолдер параметра psycopg2 (но не экранированный "%%s")
+PLACEHOLDER_RE = re.compile(r"(?<!%)%s")
+
+
+class PreparedConnection(extensions.connection):
+    """
+    Соединение psycopg2, помнящее имена подготовленных в нем запросов
+    (PREPARE действует до закрытия соединения).
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.prepared: set[str] = set()
+
+
+class CopyCancelled(Exception):
+    """
+    Чтение результата COPY прекращено (см. Database.copy_out).
+    """
+
+
+class _CopyWriter:
+    """
+    Файл для cursor.copy_expert: собирает строки COPY ... TO STDOUT во
+    фрагменты не меньше chunk_size байт и передает их через очередь.
+    """
+
+    def __init__(
+        self,
+        chunks: queue.Queue,
+        stop: threading.Event,
+        chunk_size: int,
+    ) -> None:
+        self._chunks = chunks
+        self._stop = stop
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+
+    def put(self, item: Any) -> None:
+        """
+        Кладет элемент в очередь, дожидаясь места; если чтение
+        прекращено, вызывает CopyCancelled (прерывает COPY).
+        """
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise CopyCancelled
+
+    def write(self, data: bytes) -> None:
+        self._buffer += data
+        if len(self._buffer) >= self._chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.put(bytes(self._buffer))
+            self._buffer.clear()
 
 
 class Database:
     """
     Класс для управления пулом соединений с PostgreSQL с помощью psycopg2.
+
+    Пул потокобезопасный (см. ConnectionPool): при нехватке соединений
+    запрос ждет освобождения соединения не дольше pool_timeout секунд.
     """
 
-    def __init__(self, user, password, host, database, minconn=1, maxconn=10):
+    def __init__(
+        self,
+        user,
+        password,
+        host,
+        database,
+        minconn=1,
+        maxconn=10,
+        pool_timeout=30.0,
+        max_age=3600.0,
+        ping_after=30.0,
+    ) -> None:
         """
         Инициализирует пул соединений к PostgreSQL.
 
@@ -21,14 +104,27 @@ class Database:
             database (str): название базы данных.
             minconn (int): минимальное число соединений в пуле.
             maxconn (int): максимальное число соединений в пуле.
+            pool_timeout (float): максимальное ожидание свободного
+                соединения, в секундах.
+            max_age (float): время жизни соединения, в секундах.
+            ping_after (float): время простоя, после которого соединение
+                проверяется перед выдачей, в секундах.
         """
-        self.postgresql_pool = pool.SimpleConnectionPool(
+        self._cursor_ids = count(1)
+        # Реестр подготовленных запросов: текст SQL -> имя запроса
+        self._statements: dict[str, str] = {}
+        self._statements_lock = threading.Lock()
+        self.postgresql_pool = ConnectionPool(
             minconn=minconn,
             maxconn=maxconn,
+            timeout=pool_timeout,
+            max_age=max_age,
+            ping_after=ping_after,
             user=user,
             password=password,
             host=host,
             database=database,
+            connection_factory=PreparedConnection,
         )
 
     @contextmanager
@@ -71,6 +167,136 @@ class Database:
             cursor.close()
             self.postgresql_pool.putconn(connection)
 
+    @contextmanager
+    def stream(self, itersize: int | None = None):
+        """
+        Контекстный менеджер, возвращающий именованный (серверный) курсор
+        для построчного чтения больших выборок.
+
+        Строки выбираются с сервера порциями по itersize, поэтому память
+        процесса не зависит от размера выборки. Строки возвращаются как
+        namedtuple (NamedTupleCursor): доступ к полям по имени без
+        создания словаря на каждую строку.
+
+        Курсор живет внутри транзакции: итерацию нужно завершить до выхода
+        из контекстного менеджера.
+
+        Args:
+            itersize (int | None): число строк, выбираемых за один запрос
+                к серверу (по умолчанию settings.db.itersize).
+        """
+        connection = self.postgresql_pool.getconn()
+        cursor = connection.cursor(
+            name=f"stream_{next(self._cursor_ids)}",
+            cursor_factory=NamedTupleCursor,
+        )
+        cursor.itersize = itersize or settings.db.itersize
+        try:
+            yield cursor
+            # Серверный курсор закрывается до завершения транзакции
+            cursor.close()
+            connection.commit()
+        except BaseException:
+            # Откат закрывает и серверный курсор (в т.ч. при незавершенной
+            # итерации генератора)
+            connection.rollback()
+            raise
+        finally:
+            self.postgresql_pool.putconn(connection)
+
+    def copy_out(
+        self,
+        sql: str,
+        params: Sequence[Any] = (),
+        max_chunks: int = 16,
+        chunk_size: int = 64 * 1024,
+    ) -> Generator[bytes, None, None]:
+        """
+        Выполняет COPY ... TO STDOUT и выдает результат фрагментами по
+        мере получения от сервера.
+
+        cursor.copy_expert возвращает управление только после всего
+        COPY, поэтому COPY выполняется в отдельном потоке и передает
+        фрагменты через очередь из max_chunks фрагментов: если клиент
+        читает медленно, COPY приостанавливается, и память не зависит от
+        размера результата. Если итерацию прервать (close генератора),
+        COPY прерывается, а транзакция откатывается.
+
+        Args:
+            sql (str): запрос COPY ... TO STDOUT с плейсхолдерами %s.
+            params (Sequence[Any]): параметры запроса (подставляются на
+                стороне клиента: COPY не поддерживает параметры).
+            max_chunks (int): размер очереди фрагментов.
+            chunk_size (int): минимальный размер фрагмента, в байтах.
+
+        Yields:
+            bytes: фрагменты результата COPY.
+        """
+        chunks: queue.Queue = queue.Queue(maxsize=max_chunks)
+        stop = threading.Event()
+        writer = _CopyWriter(chunks, stop, chunk_size)
+
+        def copy() -> None:
+            try:
+                with self.connect() as cur:
+                    cur.copy_expert(cur.mogrify(sql, params), writer)
+                writer.flush()
+            finally:
+                # Конец результата (в т.ч. при ошибке COPY)
+                writer.put(None)
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(copy)
+        try:
+            while (chunk := chunks.get()) is not None:
+                yield chunk
+            # Ошибка COPY передается вызывающему коду
+            future.result()
+        finally:
+            stop.set()
+            executor.shutdown()
+
+    def _statement_name(self, sql: str) -> str:
+        """
+        Возвращает имя подготовленного запроса для текста SQL, при
+        первом обращении регистрируя его в реестре.
+        """
+        if (name := self._statements.get(sql)) is None:
+            with self._statements_lock:
+                name = self._statements.setdefault(
+                    sql,
+                    f"stmt_{len(self._statements) + 1}",
+                )
+        return name
+
+    def execute(self, cursor, sql: str, params: Sequence[Any] = ()) -> None:
+        """
+        Выполняет запрос как подготовленный (PREPARE/EXECUTE).
+
+        Запрос разбирается и планируется сервером один раз на соединение:
+        PREPARE выполняется лениво при первом выполнении запроса в
+        соединении, дальше запрос выполняется по имени. Разные тексты SQL
+        (напр., разные ORDER BY) - разные подготовленные запросы.
+
+        Args:
+            cursor (cursor): курсор соединения из пула.
+            sql (str): запрос с плейсхолдерами %s.
+            params (Sequence[Any]): параметры запроса.
+        """
+        name = self._statement_name(sql)
+        connection = cursor.connection
+        if name not in connection.prepared:
+            numbers = count(1)
+            statement = PLACEHOLDER_RE.sub(lambda _: f"${next(numbers)}", sql)
+            cursor.execute(f"PREPARE {name} AS {statement}")
+            connection.prepared.add(name)
+
+        if params:
+            placeholders = ", ".join(["%s"] * len(params))
+            cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+
     def close_pool(self):
         """
         Закрывает все соединения в пуле.
@@ -83,4 +309,9 @@ db = Database(
     password=settings.db.password,
     host=settings.db.host,
     database=settings.db.database,
+    minconn=settings.db.minconn,
+    maxconn=settings.db.maxconn,
+    pool_timeout=settings.db.pool_timeout,
+    max_age=settings.db.pool_recycle,
+    ping_after=settings.db.pool_ping_after,
 )
@@ -0,0 +1,229 @@
+import threading
+import time
+from typing import Any
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+
+class PoolTimeout(Exception):
+    """
+    Свободное соединение не появилось за отведенное время.
+    """
+
+
+class ConnectionPool:
+    """
+    Потокобезопасный пул соединений psycopg2 с ограничением размера.
+
+    - Если все maxconn соединений заняты, getconn ждет освобождения
+        соединения не дольше timeout секунд, затем вызывает PoolTimeout.
+    - Соединения старше max_age секунд закрываются и создаются заново.
+    - Соединение, простаивавшее в пуле дольше ping_after секунд,
+        перед выдачей проверяется запросом SELECT 1.
+    - Ведет счетчики для подбора размера пула (см. stats).
+    """
+
+    def __init__(
+        self,
+        minconn: int,
+        maxconn: int,
+        timeout: float,
+        max_age: float,
+        ping_after: float,
+        **connect_kwargs: Any,
+    ):
+        """
+        Args:
+            minconn (int): число соединений, открываемых сразу.
+            maxconn (int): максимальное число соединений в пуле.
+            timeout (float): максимальное ожидание свободного соединения,
+                в секундах.
+            max_age (float): время жизни соединения, в секундах.
+            ping_after (float): время простоя, после которого соединение
+                проверяется перед выдачей, в секундах.
+            **connect_kwargs: параметры psycopg2.connect.
+        """
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_age = max_age
+        self.ping_after = ping_after
+        self._connect_kwargs = connect_kwargs
+
+        self._lock = threading.Condition()
+        # Свободные соединения: (соединение, момент возврата в пул)
+        self._idle: list[tuple[extensions.connection, float]] = []
+        # Момент создания каждого открытого соединения (по id соединения)
+        self._created: dict[int, float] = {}
+        self._in_use = 0
+        self._closed = False
+
+        self.checkouts = 0
+        self.timeouts = 0
+        self.recycled = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+        for _ in range(minconn):
+            with self._lock:
+                self._in_use += 1
+            self.putconn(self._connect())
+
+    def _connect(self) -> extensions.connection:
+        """
+        Открывает новое соединение. Место в пуле уже зарезервировано
+        вызывающим кодом (self._in_use).
+        """
+        try:
+            connection = psycopg2.connect(**self._connect_kwargs)
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+        self._created[id(connection)] = time.monotonic()
+        return connection
+
+    def _discard(self, connection: extensions.connection) -> None:
+        """
+        Закрывает соединение и забывает о нем.
+        """
+        self._created.pop(id(connection), None)
+        if not connection.closed:
+            connection.close()
+
+    def _is_usable(
+        self,
+        connection: extensions.connection,
+        idle_since: float,
+    ) -> bool:
+        """
+        Проверяет, можно ли выдать соединение из пула.
+        """
+        now = time.monotonic()
+        if connection.closed:
+            return False
+        if now - self._created.get(id(connection), now) > self.max_age:
+            return False
+        if now - idle_since > self.ping_after:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                connection.rollback()
+            except psycopg2.Error:
+                return False
+        return True
+
+    def getconn(self) -> extensions.connection:
+        """
+        Выдает соединение из пула, при необходимости открывая новое или
+        дожидаясь освобождения занятого.
+
+        Returns:
+            connection: соединение psycopg2.
+
+        Raises:
+            PoolTimeout: все соединения заняты дольше self.timeout секунд.
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+        with self._lock:
+            while not self._idle and self._in_use >= self.maxconn:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._closed:
+                    break
+                self._lock.wait(remaining)
+
+            if self._closed:
+                raise PoolError("connection pool is closed")
+            if not self._idle and self._in_use >= self.maxconn:
+                self.timeouts += 1
+                raise PoolTimeout(
+                    f"no free connection in {self.timeout} s "
+                    f"(maxconn={self.maxconn})"
+                )
+
+            waited = time.monotonic() - started
+            self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+            self._in_use += 1
+            idle = self._idle.pop() if self._idle else None
+
+        # Проверка и открытие соединения выполняются вне блокировки:
+        # место в пуле уже занято этим потоком
+        if idle is not None:
+            connection, idle_since = idle
+            if self._is_usable(connection, idle_since):
+                return connection
+            self._discard(connection)
+            with self._lock:
+                self.recycled += 1
+
+        return self._connect()
+
+    def putconn(self, connection: extensions.connection) -> None:
+        """
+        Возвращает соединение в пул. Незавершенная транзакция
+        откатывается, сломанное соединение закрывается.
+
+        Args:
+            connection (connection): соединение, выданное getconn.
+        """
+        if not connection.closed:
+            status = connection.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                self._discard(connection)
+            elif status != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    connection.rollback()
+                except psycopg2.Error:
+                    self._discard(connection)
+        else:
+            self._discard(connection)
+
+        with self._lock:
+            self._in_use -= 1
+            if not connection.closed and not self._closed:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                self._discard(connection)
+            self._lock.notify()
+
+    def closeall(self) -> None:
+        """
+        Закрывает все свободные соединения; занятые закрываются при
+        возврате в пул.
+        """
+        with self._lock:
+            self._closed = True
+            for connection, _ in self._idle:
+                self._discard(connection)
+            self._idle.clear()
+            self._lock.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Возвращает счетчики пула.
+
+        Returns:
+            dict[str, Any]: размер пула, число занятых и свободных
+                соединений, число выдач и таймаутов, время ожидания выдачи.
+        """
+        with self._lock:
+            in_use = self._in_use
+            idle = len(self._idle)
+        avg_wait = self.wait_seconds / self.checkouts if self.checkouts else 0
+        return {
+            "maxconn": self.maxconn,
+            "in_use": in_use,
+            "idle": idle,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "recycled": self.recycled,
+            "avg_wait_ms": avg_wait * 1000,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+        }
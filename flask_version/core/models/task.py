@@ -1,9 +1,41 @@
 from .base import db
 
+# Составные индексы под выборку списка задач пользователя: для каждого
+# порядка из AllTaskParams.SORTED (с фильтром по статусу и без него).
+# Столбец id в конце задает однозначный порядок при равных значениях.
+TASKS_INDEXES: dict[str, tuple[str, ...]] = {
+    "ix_tasks_id_users_created_at": ("id_users", "created_at", "id"),
+    "ix_tasks_id_users_completed_at": ("id_users", "completed_at", "id"),
+    "ix_tasks_id_users_name": ("id_users", "name", "id"),
+    "ix_tasks_id_users_completed_created_at": (
+        "id_users",
+        "completed",
+        "created_at",
+        "id",
+    ),
+    "ix_tasks_id_users_completed_completed_at": (
+        "id_users",
+        "completed",
+        "completed_at",
+        "id",
+    ),
+    "ix_tasks_id_users_completed_name": (
+        "id_users",
+        "completed",
+        "name",
+        "id",
+    ),
+}
+
+# Триграммный GIN-индекс для поиска по названию в пределах задач
+# пользователя (btree_gin позволяет включить id_users в GIN-индекс).
+TASKS_NAME_TRGM_INDEX = "ix_tasks_id_users_name_trgm"
+
 
 def create_tasks_table():
     """
-    Создает таблицу 'tasks' в базе данных, если она не существует.
+    Создает таблицу 'tasks' и индексы для списка задач в базе данных,
+    если они не существуют.
     """
     with db.connect() as cur:
         cur.execute(
@@ -19,3 +51,19 @@ def create_tasks_table():
             )
             """
         )
+        for name, columns in TASKS_INDEXES.items():
+            cur.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS {name}
+                ON tasks ({', '.join(columns)})
+                """
+            )
+
+        cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cur.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+        cur.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS {TASKS_NAME_TRGM_INDEX}
+            ON tasks USING gin (id_users, name gin_trgm_ops)
+            """
+        )
@@ -4,6 +4,9 @@ from .base import db
 def create_users_table():
     """
     Создает таблицу 'users' в базе данных, если она не существует.
+
+    Столбец tasks_version (версия задач пользователя для ETag страниц
+    задач) добавляется и в ранее созданную таблицу.
     """
     with db.connect() as cur:
         cur.execute(
@@ -13,7 +16,14 @@ def create_users_table():
                 name VARCHAR(20),
                 email VARCHAR(30),
                 hashed_password varchar(80),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                tasks_version BIGINT NOT NULL DEFAULT 0
             )
             """
         )
+        cur.execute(
+            """
+            ALTER TABLE users
+            ADD COLUMN IF NOT EXISTS tasks_version BIGINT NOT NULL DEFAULT 0
+            """
+        )
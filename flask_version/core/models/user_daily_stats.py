@@ -0,0 +1,113 @@
+from .base import db
+
+# Вклад задач из таблицы {table} в счетчики дня: +1 (новые строки) или
+# -1 (старые строки) к created в день создания и к completed в день
+# выполнения
+TASKS_DELTA = """
+    SELECT id_users, created_at::date AS day,
+        {sign} AS created, 0 AS completed
+    FROM {table}
+    WHERE created_at IS NOT NULL
+    UNION ALL
+    SELECT id_users, completed_at::date, 0, {sign}
+    FROM {table}
+    WHERE completed AND completed_at IS NOT NULL
+"""
+
+# Прибавляет вклад измененных задач к счетчикам (одна вставка на
+# оператор, в т.ч. на COPY и массовые UPDATE/DELETE)
+UPSERT_DAILY_STATS = """
+    INSERT INTO user_daily_stats AS s (id_users, day, created, completed)
+    SELECT id_users, day, sum(created), sum(completed)
+    FROM ({delta}) AS delta
+    GROUP BY id_users, day
+    HAVING sum(created) <> 0 OR sum(completed) <> 0
+    ON CONFLICT (id_users, day) DO UPDATE
+    SET created = s.created + EXCLUDED.created,
+        completed = s.completed + EXCLUDED.completed
+"""
+
+# Операция -> переходные таблицы триггера (вид, имя, знак вклада)
+DAILY_STATS_TRIGGERS: dict[str, tuple[tuple[str, str, int], ...]] = {
+    "INSERT": (("NEW", "new_tasks", 1),),
+    "UPDATE": (("OLD", "old_tasks", -1), ("NEW", "new_tasks", 1)),
+    "DELETE": (("OLD", "old_tasks", -1),),
+}
+
+
+def _daily_stats_trigger(
+    operation: str,
+    tables: tuple[tuple[str, str, int], ...],
+) -> tuple[str, str]:
+    """
+    Возвращает DDL функции и триггера, которые прибавляют к счетчикам
+    вклад задач из переходных таблиц оператора operation.
+    """
+    name = f"user_daily_stats_{operation.lower()}"
+    delta = " UNION ALL ".join(
+        TASKS_DELTA.format(table=table, sign=sign) for _, table, sign in tables
+    )
+    referencing = " ".join(f"{kind} TABLE AS {t}" for kind, t, _ in tables)
+    function = f"""
+        CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+        BEGIN
+            {UPSERT_DAILY_STATS.format(delta=delta)};
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+    trigger = f"""
+        CREATE TRIGGER tasks_{name}
+        AFTER {operation} ON tasks
+        REFERENCING {referencing}
+        FOR EACH STATEMENT EXECUTE FUNCTION {name}()
+    """
+    return function, trigger
+
+
+def create_user_daily_stats_table():
+    """
+    Создает таблицу 'user_daily_stats' (число созданных и выполненных
+    задач пользователя за день) и триггеры, которые ведут ее при каждом
+    добавлении, изменении и удалении задач, если они не существуют.
+
+    Триггеры уровня оператора с переходными таблицами: счетчики
+    обновляются одним запросом на оператор, а не на каждую задачу.
+    При создании таблица заполняется по уже существующим задачам.
+    """
+    with db.connect() as cur:
+        cur.execute("SELECT to_regclass('user_daily_stats') IS NOT NULL")
+        if cur.fetchone()[0]:
+            return
+
+        # Изменения задач ждут конца транзакции: счетчики не пропускают
+        # задачи, измененные между заполнением и созданием триггеров
+        cur.execute("LOCK TABLE tasks IN SHARE ROW EXCLUSIVE MODE")
+        cur.execute("SELECT to_regclass('user_daily_stats') IS NOT NULL")
+        if cur.fetchone()[0]:
+            return
+
+        cur.execute(
+            """
+            CREATE TABLE user_daily_stats (
+                id SERIAL PRIMARY KEY,
+                id_users INT NOT NULL
+                    REFERENCES users(id) ON DELETE CASCADE,
+                day DATE NOT NULL,
+                created INT NOT NULL DEFAULT 0,
+                completed INT NOT NULL DEFAULT 0,
+                CONSTRAINT uq_user_daily_stats_id_users_day
+                    UNIQUE (id_users, day)
+            )
+            """
+        )
+        for operation, tables in DAILY_STATS_TRIGGERS.items():
+            function, trigger = _daily_stats_trigger(operation, tables)
+            cur.execute(function)
+            cur.execute(trigger)
+
+        cur.execute(
+            UPSERT_DAILY_STATS.format(
+                delta=TASKS_DELTA.format(table="tasks", sign=1),
+            )
+        )
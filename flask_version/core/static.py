@@ -0,0 +1,86 @@
+import gzip
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # brotli - необязательная зависимость
+    brotli = None
+
+# Исходный путь файла (напр., "style.css") -> путь с хэшем содержимого
+# (напр., "style.3f2a9c1b7d4e.css"); заполняется build_static
+manifest: dict[str, str] = {}
+# Пути с хэшем, которые отдаются из папки собранной статики
+hashed_paths: set[str] = set()
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+# Доступные сжатия: Content-Encoding -> (суффикс файла, функция сжатия),
+# в порядке предпочтения
+COMPRESSORS: dict[str, tuple[str, Callable[[bytes], bytes]]] = {
+    "gzip": (".gz", _gzip),
+}
+if brotli is not None:
+    COMPRESSORS = {"br": (".br", brotli.compress), **COMPRESSORS}
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """
+    Записывает файл через временный файл, чтобы воркеры, собирающие
+    статику одновременно, не видели недописанный файл.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent)
+    with os.fdopen(fd, "wb") as tmp:
+        tmp.write(data)
+    os.replace(tmp_name, path)
+
+
+def build_static(source: Path, target: Path) -> dict[str, str]:
+    """
+    Копирует файлы статики в target под именами с хэшем содержимого и
+    записывает рядом сжатые варианты (.gz и, если установлен brotli, .br),
+    если они меньше исходного файла. Уже собранные файлы не
+    перезаписываются.
+
+    Args:
+        source (Path): папка исходной статики.
+        target (Path): папка собранной статики.
+
+    Returns:
+        dict[str, str]: manifest - исходный путь -> путь с хэшем.
+    """
+    built: dict[str, str] = {}
+    for path in sorted(source.rglob("*")):
+        if not path.is_file():
+            continue
+
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        name = path.relative_to(source)
+        hashed = name.with_name(f"{name.stem}.{digest}{name.suffix}")
+        built[name.as_posix()] = hashed.as_posix()
+
+        hashed_path = target / hashed
+        if hashed_path.exists():
+            continue
+        hashed_path.parent.mkdir(parents=True, exist_ok=True)
+        for suffix, compress in COMPRESSORS.values():
+            compressed = compress(data)
+            if len(compressed) < len(data):
+                variant = hashed_path.with_name(hashed_path.name + suffix)
+                _write_atomic(variant, compressed)
+        # Основной файл пишется последним: его наличие означает, что
+        # сборка файла завершена
+        _write_atomic(hashed_path, data)
+
+    manifest.clear()
+    manifest.update(built)
+    hashed_paths.clear()
+    hashed_paths.update(built.values())
+    return built
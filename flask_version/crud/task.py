@@ -1,7 +1,179 @@
-from typing import Any
+import base64
+import csv
+import datetime
+import io
+import json
+import sys
+from dataclasses import dataclass, field, replace
+from typing import Any, Generator, Iterable, Iterator
 
+from core.analytics import (
+    CompletionReport,
+    completion_report,
+    decode_float8_array,
+)
+from core.cache import ResultCache
+from core.config import SORT_BY_RELEVANCE, settings
+from core.csv_import import IMPORT_COLUMNS, ImportReport, TaskCsvParser
 from core.models import db
 
+# Столбцы сортировки, которые могут содержать NULL / хранят дату и время
+NULLABLE_SORT_COLUMNS = ("completed_at",)
+DATETIME_SORT_COLUMNS = ("created_at", "completed_at")
+
+
+# Запросы выгрузки всех задач пользователя (в порядке создания) для
+# COPY ... TO STDOUT: формат выгрузки -> (запрос, параметры COPY).
+# NDJSON собирает сервер (row_to_json); строки выгружаются как CSV с
+# разделителем и кавычкой, которых нет в JSON (управляющие символы в
+# JSON экранируются), поэтому выходят без изменений - по одной в строке
+_EXPORT_TASKS = """
+    SELECT id, name, describe, created_at, completed, completed_at
+    FROM tasks
+    WHERE id_users = %s
+"""
+EXPORT_QUERIES: dict[str, tuple[str, str]] = {
+    "csv": (
+        f"{_EXPORT_TASKS} ORDER BY id",
+        "FORMAT csv, HEADER",
+    ),
+    "ndjson": (
+        f"SELECT row_to_json(t) FROM ({_EXPORT_TASKS}) AS t ORDER BY t.id",
+        "FORMAT csv, DELIMITER E'\\x02', QUOTE E'\\x01'",
+    ),
+}
+
+
+@dataclass
+class TaskPage:
+    """
+    Страница списка задач при keyset-пагинации.
+
+    Attributes:
+        tasks (list[dict]): строки задач текущей страницы (столбец ->
+            значение).
+        next_cursor (str | None): курсор следующей страницы, если она есть.
+        prev_cursor (str | None): курсор предыдущей страницы, если она есть.
+    """
+
+    tasks: list[dict] = field(default_factory=list)
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+def _page_size(page: TaskPage) -> int:
+    """
+    Приблизительно оценивает память, занятую страницей задач, в байтах.
+    """
+    size = sys.getsizeof(page) + sys.getsizeof(page.tasks)
+    for task in page.tasks:
+        size += sys.getsizeof(task)
+        size += sum(sys.getsizeof(value) for value in task.values())
+    return size
+
+
+# Ключ кэша: (сортировка, статусы, поиск, курсоры after и before, размер
+# страницы)
+TasksKey = tuple[str, tuple[str, ...], str, str, str, int]
+
+# Страницы задач (get_tasks_page) для каждого пользователя; сбрасываются
+# функциями, изменяющими задачи (_tasks_changed)
+tasks_cache: ResultCache[TasksKey, TaskPage] = ResultCache(
+    maxbytes=settings.cache.tasks_maxbytes,
+    sizeof=_page_size,
+)
+
+
+@dataclass
+class DayStats:
+    """
+    Число созданных и выполненных задач пользователя за день.
+
+    Attributes:
+        day (datetime.date): день.
+        created (int): число задач, созданных в этот день.
+        completed (int): число задач, выполненных в этот день.
+    """
+
+    day: datetime.date
+    created: int = 0
+    completed: int = 0
+
+
+@dataclass
+class SortKey:
+    """
+    Разобранное значение сортировки из AllTaskParams.SORTED.db_map.
+
+    Attributes:
+        sql (str): SQL-выражение сортировки.
+        params (list[Any]): параметры SQL-выражения.
+        descending (bool): сортировка по убыванию.
+        nullable (bool): выражение может принимать NULL.
+        is_datetime (bool): выражение возвращает дату и время.
+    """
+
+    sql: str
+    params: list[Any] = field(default_factory=list)
+    descending: bool = False
+    nullable: bool = False
+    is_datetime: bool = False
+
+
+def _tasks_changed(cur: Any, user_id: int) -> None:
+    """
+    Увеличивает версию задач пользователя (users.tasks_version) в текущей
+    транзакции и удаляет его страницы из tasks_cache. Вызывается каждой
+    функцией, изменяющей задачи.
+
+    Args:
+        cur (cursor): курсор открытой транзакции.
+        user_id (int): ID пользователя.
+    """
+    db.execute(
+        cur,
+        """
+        UPDATE users
+        SET tasks_version = tasks_version + 1
+        WHERE id = %s
+        """,
+        (user_id,),
+    )
+    tasks_cache.invalidate(user_id)
+
+
+def _tasks_version(cur: Any, user_id: int) -> int:
+    """
+    Читает версию задач пользователя в транзакции курсора cur
+    (отдельным курсором: cur может возвращать строки в виде dict).
+    """
+    with cur.connection.cursor() as version_cur:
+        db.execute(
+            version_cur,
+            """
+            SELECT tasks_version FROM users
+            WHERE id = %s
+            """,
+            (user_id,),
+        )
+        result = version_cur.fetchone()
+    return result[0] if result else 0
+
+
+def get_tasks_version(user_id: int) -> int:
+    """
+    Возвращает версию задач пользователя: число, которое меняется при
+    каждом изменении его задач. Используется для ETag страниц задач.
+
+    Args:
+        user_id (int): ID пользователя.
+
+    Returns:
+        int: версия задач пользователя.
+    """
+    with db.connect() as cur:
+        return _tasks_version(cur, user_id)
+
 
 def create_task(id_users: int, name: str, describe: str) -> None:
     """
@@ -13,13 +185,210 @@ def create_task(id_users: int, name: str, describe: str) -> None:
         describe (str): описание задачи.
     """
     with db.connect() as cur:
-        cur.execute(
+        db.execute(
+            cur,
             """
             INSERT INTO tasks (id_users, name, describe)
             VALUES (%s, %s, %s)
             """,
             (id_users, name, describe),
         )
+        _tasks_changed(cur, id_users)
+
+
+def create_tasks(id_users: int, tasks: list[tuple[str, str]]) -> int:
+    """
+    Добавляет задачи пользователя в таблицу 'tasks' одним запросом
+    INSERT ... SELECT FROM unnest(...) в одной транзакции. Названия и
+    описания передаются массивами, поэтому текст (и план) запроса не
+    зависит от числа задач.
+
+    Args:
+        id_users (int): ID пользователя, создающего задачи.
+        tasks (list[tuple[str, str]]): названия и описания задач.
+
+    Returns:
+        int: количество добавленных задач.
+    """
+    if not tasks:
+        return 0
+
+    names = [name for name, _ in tasks]
+    describes = [describe for _, describe in tasks]
+    with db.connect() as cur:
+        db.execute(
+            cur,
+            """
+            INSERT INTO tasks (id_users, name, describe)
+            SELECT %s, name, describe
+            FROM unnest(%s::varchar[], %s::text[]) AS new_tasks(name, describe)
+            """,
+            (id_users, names, describes),
+        )
+        _tasks_changed(cur, id_users)
+    return len(tasks)
+
+
+def _sort_key(sorted_for_db: str, search_query: str) -> SortKey:
+    """
+    Разбирает значение сортировки (напр., "created_at DESC").
+
+    Args:
+        sorted_for_db (str): поле для сортировки в SQL-запросе.
+        search_query (str): поисковая строка (для сортировки по релевантности).
+
+    Returns:
+        SortKey: выражение сортировки и его свойства.
+    """
+    if sorted_for_db == SORT_BY_RELEVANCE:
+        if search_query:
+            return SortKey(
+                sql="word_similarity(%s, name)",
+                params=[search_query],
+                descending=True,
+            )
+        # Без поисковой строки ранжировать не по чему
+        sorted_for_db = str(settings.tasks.SORTED.default_db)
+
+    column, _, direction = sorted_for_db.partition(" ")
+    return SortKey(
+        sql=column,
+        descending=direction.upper() == "DESC",
+        nullable=column in NULLABLE_SORT_COLUMNS,
+        is_datetime=column in DATETIME_SORT_COLUMNS,
+    )
+
+
+def _where_tasks(
+    user_id: int,
+    completed: tuple[str, ...],
+    search_query: str,
+) -> tuple[str, list[Any]]:
+    """
+    Формирует условие выборки задач пользователя с фильтром по статусу и
+    поиском по названию.
+
+    Поиск по подстроке (ILIKE) обслуживается триграммным GIN-индексом
+    'ix_tasks_id_users_name_trgm'.
+
+    Returns:
+        tuple[str, list[Any]]: SQL-условие и его параметры.
+    """
+    # Массив вместо IN (...): число параметров не зависит от фильтра, и
+    # запрос можно подготовить один раз
+    where_sql = "id_users = %s AND completed = ANY(%s)"
+    params: list[Any] = [user_id, [status == "true" for status in completed]]
+    if search_query:
+        where_sql += " AND name ILIKE %s"
+        params.append(f"%{search_query}%")
+    return where_sql, params
+
+
+def _keyset_filter(
+    sort_key: SortKey,
+    descending: bool,
+    value: Any,
+    task_id: int,
+) -> tuple[str, list[Any]]:
+    """
+    Условие "строка идет после (value, task_id)" в порядке
+    (выражение, id) ASC/DESC. NULL, как и в PostgreSQL, считается
+    наибольшим значением.
+
+    Returns:
+        tuple[str, list[Any]]: SQL-условие и его параметры.
+    """
+    expr, expr_params = sort_key.sql, sort_key.params
+    if descending:
+        if value is None:
+            return (
+                f"({expr} IS NOT NULL OR ({expr} IS NULL AND id < %s))",
+                [*expr_params, *expr_params, task_id],
+            )
+        return f"({expr}, id) < (%s, %s)", [*expr_params, value, task_id]
+
+    if value is None:
+        return f"{expr} IS NULL AND id > %s", [*expr_params, task_id]
+    if sort_key.nullable:
+        return (
+            f"(({expr}, id) > (%s, %s) OR {expr} IS NULL)",
+            [*expr_params, value, task_id, *expr_params],
+        )
+    return f"({expr}, id) > (%s, %s)", [*expr_params, value, task_id]
+
+
+def _order_by(sort_key: SortKey, descending: bool) -> str:
+    """
+    Порядок строк: выражение сортировки и id для однозначности.
+    """
+    direction = "DESC" if descending else "ASC"
+    return f"{sort_key.sql} {direction}, id {direction}"
+
+
+def _encode_cursor(value: Any, task_id: int) -> str:
+    """
+    Кодирует позицию строки (значение сортировки, id) в курсор для URL.
+    """
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, task_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_key: SortKey) -> tuple[Any, int] | None:
+    """
+    Декодирует курсор из URL. Возвращает None, если курсор некорректен.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, task_id = json.loads(raw)
+        if sort_key.is_datetime and isinstance(value, str):
+            value = datetime.datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+
+    if not isinstance(task_id, int):
+        return None
+    return value, task_id
+
+
+def iter_all_tasks(
+    user_id: int,
+    sorted_for_db: str,
+    completed: tuple[str, ...],
+    search_query: str,
+    itersize: int | None = None,
+) -> Iterator[tuple]:
+    """
+    Выдает отсортированные и отфильтрованные задачи по одной, читая их
+    серверным курсором порциями по itersize строк.
+
+    В отличие от get_all_tasks выборка целиком в памяти не хранится.
+    Задачи возвращаются как namedtuple (task.name, task.completed и т.д.).
+
+    Args:
+        user_id (int): ID пользователя.
+        sorted_for_db (str): поле для сортировки в SQL-запросе.
+        completed: (tuple[str, ...]): кортеж со статусами задач для фильтрации.
+        search_query (str): поисковая строка (поиск по названию задачи).
+        itersize (int | None): число строк, выбираемых за один запрос к БД.
+
+    Yields:
+        tuple: задачи, удовлетворяющие условиям фильтрации и поиска.
+    """
+    sort_key = _sort_key(sorted_for_db, search_query)
+    where_sql, params = _where_tasks(user_id, completed, search_query)
+
+    with db.stream(itersize) as cur:
+        cur.execute(
+            f"""
+            SELECT * FROM tasks
+            WHERE {where_sql}
+            ORDER BY {_order_by(sort_key, sort_key.descending)}
+            """,
+            [*params, *sort_key.params],
+        )
+        yield from cur
 
 
 def get_all_tasks(
@@ -27,34 +396,343 @@ def get_all_tasks(
     sorted_for_db: str,
     completed: tuple[str, ...],
     search_query: str,
-) -> list[dict]:
+) -> list[tuple]:
     """
     Возвращает список отсортированных и отфильтрованных задач.
     Ищет задачи по названию.
 
+    При сортировке SORT_BY_RELEVANCE задачи упорядочиваются по схожести
+    названия с поисковой строкой. Строки читаются через iter_all_tasks
+    (серверный курсор, namedtuple вместо словаря на каждую задачу); если
+    список целиком не нужен, используйте iter_all_tasks напрямую.
+
+    Args:
+        user_id (int): ID пользователя.
+        sorted_for_db (str): поле для сортировки в SQL-запросе.
+        completed: (tuple[str, ...]): кортеж со статусами задач для фильтрации.
+        search_query (str): поисковая строка (поиск по названию задачи).
+
+    Returns:
+        list[tuple]: список задач, удовлетворяющих условиям фильтрации и
+            поиска (task.name, task.completed и т.д.).
+    """
+    tasks = iter_all_tasks(user_id, sorted_for_db, completed, search_query)
+    return list(tasks)
+
+
+def _page_key(
+    sorted_for_db: str,
+    completed: tuple[str, ...],
+    search_query: str,
+    after: str,
+    before: str,
+    limit: int,
+) -> TasksKey:
+    """
+    Ключ страницы задач в tasks_cache.
+    """
+    return (
+        sorted_for_db,
+        tuple(completed),
+        search_query,
+        after,
+        before,
+        limit,
+    )
+
+
+def get_cached_tasks_page(
+    user_id: int,
+    version: int,
+    sorted_for_db: str,
+    completed: tuple[str, ...],
+    search_query: str,
+    after: str = "",
+    before: str = "",
+    limit: int = settings.tasks.page_size,
+) -> TaskPage | None:
+    """
+    Возвращает страницу задач из tasks_cache, если она сохранена для
+    текущей версии задач пользователя (см. get_tasks_page).
+
     Args:
         user_id (int): ID пользователя.
+        version (int): версия задач пользователя (см. get_tasks_version).
         sorted_for_db (str): поле для сортировки в SQL-запросе.
         completed: (tuple[str, ...]): кортеж со статусами задач для фильтрации.
         search_query (str): поисковая строка (поиск по названию задачи).
+        after (str): курсор, после которого начинается страница.
+        before (str): курсор, перед которым заканчивается страница.
+        limit (int): количество задач на странице.
 
     Returns:
-        list[dict]: список задач, удовлетворяющих условиям фильтрации и поиска.
+        TaskPage | None: страница или None при промахе.
     """
-    search_query = f"%{search_query}%"
+    key = _page_key(
+        sorted_for_db,
+        completed,
+        search_query,
+        after,
+        before,
+        limit,
+    )
+    page = tasks_cache.get(user_id, key, version)
+    if page is None:
+        return None
+    # Копия списка: вызывающий код не должен менять закэшированный
+    return replace(page, tasks=[*page.tasks])
+
+
+def iter_tasks_page(
+    page: TaskPage,
+    user_id: int,
+    sorted_for_db: str,
+    completed: tuple[str, ...],
+    search_query: str,
+    after: str = "",
+    before: str = "",
+    limit: int = settings.tasks.page_size,
+    version: int | None = None,
+) -> Iterator[dict]:
+    """
+    Выдает задачи одной страницы по мере чтения из БД, добавляя их в
+    page.tasks, и по окончании заполняет курсоры соседних страниц в page.
+    Если передана версия задач, прочитанная целиком страница сохраняется
+    в tasks_cache.
+
+    Использует keyset-пагинацию по паре (значение сортировки, id): страница
+    выбирается условием "после/до курсора" по тому же индексу, что и
+    сортировка, поэтому стоимость запроса не зависит от номера страницы.
+
+    Args:
+        page (TaskPage): страница, в которую записываются курсоры.
+        user_id (int): ID пользователя.
+        sorted_for_db (str): поле для сортировки в SQL-запросе.
+        completed: (tuple[str, ...]): кортеж со статусами задач для фильтрации.
+        search_query (str): поисковая строка (поиск по названию задачи).
+        after (str): курсор, после которого начинается страница.
+        before (str): курсор, перед которым заканчивается страница.
+        limit (int): количество задач на странице.
+        version (int | None): версия задач пользователя, прочитанная до
+            запроса страницы (см. get_tasks_version); None - не кэшировать.
+
+    Yields:
+        dict: задачи страницы в порядке сортировки.
+    """
+    sort_key = _sort_key(sorted_for_db, search_query)
+
+    # При движении назад выбираем строки в обратном порядке и разворачиваем
+    backward = bool(before) and not after
+    cursor = _decode_cursor(before if backward else after, sort_key)
+    if cursor is None:
+        backward = False
+
+    reverse = sort_key.descending != backward
+    where_sql, where_params = _where_tasks(user_id, completed, search_query)
+    params = [*sort_key.params, *where_params]
+    if cursor is not None:
+        cursor_sql, cursor_params = _keyset_filter(sort_key, reverse, *cursor)
+        where_sql += f" AND {cursor_sql}"
+        params.extend(cursor_params)
+    params.extend([*sort_key.params, limit + 1])
+
+    first: dict | None = None
+    last: dict | None = None
+    has_more = False
     with db.connect_return_dict() as cur:
-        cur.execute(
+        db.execute(
+            cur,
             f"""
-            SELECT * FROM tasks
-            WHERE id_users = %s
-                AND completed in %s
-                AND name ILIKE %s
-            ORDER BY {sorted_for_db}
+            SELECT *, {sort_key.sql} AS sort_value FROM tasks
+            WHERE {where_sql}
+            ORDER BY {_order_by(sort_key, reverse)}
+            LIMIT %s
             """,
-            (user_id, completed, search_query),
+            params,
+        )
+
+        if backward:
+            # Страница ограничена limit, поэтому развернуть ее дешево
+            rows = [dict(row) for row in cur.fetchall()]
+            has_more = len(rows) > limit
+            rows = rows[:limit][::-1]
+            if not rows:
+                # Перед курсором ничего не осталось - показываем первую
+                # страницу
+                yield from iter_tasks_page(
+                    page,
+                    user_id,
+                    sorted_for_db,
+                    completed,
+                    search_query,
+                    limit=limit,
+                    version=version,
+                )
+                return
+
+            first, last = rows[0], rows[-1]
+            page.tasks.extend(rows)
+            yield from rows
+
+        else:
+            for count, row in enumerate(cur, start=1):
+                if count > limit:
+                    has_more = True
+                    break
+                task = dict(row)
+                if first is None:
+                    first = task
+                last = task
+                page.tasks.append(task)
+                yield task
+
+    if first is not None and last is not None:
+        has_next = True if backward else has_more
+        has_prev = has_more if backward else cursor is not None
+        if has_next:
+            page.next_cursor = _encode_cursor(last["sort_value"], last["id"])
+        if has_prev:
+            page.prev_cursor = _encode_cursor(first["sort_value"], first["id"])
+
+    if version is not None:
+        key = _page_key(
+            sorted_for_db,
+            completed,
+            search_query,
+            after,
+            before,
+            limit,
         )
-        all_tasks = cur.fetchall()
-        return [dict(row) for row in all_tasks]
+        # Копия списка: вызывающий код не должен менять закэшированный
+        cached = replace(page, tasks=[*page.tasks])
+        tasks_cache.set(user_id, key, version, cached)
+
+
+def get_tasks_page(
+    user_id: int,
+    sorted_for_db: str,
+    completed: tuple[str, ...],
+    search_query: str,
+    after: str = "",
+    before: str = "",
+    limit: int = settings.tasks.page_size,
+    version: int | None = None,
+) -> TaskPage:
+    """
+    Возвращает одну страницу отсортированных и отфильтрованных задач
+    (см. iter_tasks_page).
+
+    Страница берется из tasks_cache, если задачи пользователя не менялись
+    с момента ее сохранения (проверяется по версии задач).
+
+    Args:
+        user_id (int): ID пользователя.
+        sorted_for_db (str): поле для сортировки в SQL-запросе.
+        completed: (tuple[str, ...]): кортеж со статусами задач для фильтрации.
+        search_query (str): поисковая строка (поиск по названию задачи).
+        after (str): курсор, после которого начинается страница.
+        before (str): курсор, перед которым заканчивается страница.
+        limit (int): количество задач на странице.
+        version (int | None): версия задач пользователя, если уже
+            прочитана (напр., для ETag); None - читается из БД.
+
+    Returns:
+        TaskPage: строки задач страницы и курсоры соседних страниц.
+    """
+    if version is None:
+        version = get_tasks_version(user_id)
+    query: dict[str, Any] = {
+        "sorted_for_db": sorted_for_db,
+        "completed": completed,
+        "search_query": search_query,
+        "after": after,
+        "before": before,
+        "limit": limit,
+    }
+    page = get_cached_tasks_page(user_id, version, **query)
+    if page is None:
+        page = TaskPage()
+        for _ in iter_tasks_page(page, user_id, version=version, **query):
+            pass
+    return page
+
+
+def iter_tasks_export(
+    user_id: int,
+    export_format: str,
+) -> Generator[bytes, None, None]:
+    """
+    Выгружает все задачи пользователя в CSV (с заголовком) или NDJSON
+    запросом COPY ... TO STDOUT (см. EXPORT_QUERIES и Database.copy_out):
+    строки формирует сервер БД, а фрагменты передаются дальше по мере
+    получения; память не зависит от числа задач.
+
+    Args:
+        user_id (int): ID пользователя.
+        export_format (str): формат выгрузки ("csv" или "ndjson").
+
+    Yields:
+        bytes: фрагменты выгрузки.
+    """
+    query, options = EXPORT_QUERIES[export_format]
+    sql = f"COPY ({query}) TO STDOUT WITH ({options})"
+    yield from db.copy_out(sql, (user_id,))
+
+
+def _copy_tasks(cur: Any, tasks: list[tuple[Any, ...]]) -> None:
+    """
+    Загружает задачи (записи в порядке IMPORT_COLUMNS) в таблицу 'tasks'
+    запросом COPY ... FROM STDIN в формате CSV.
+    """
+    data = io.StringIO()
+    csv.writer(data).writerows(tasks)
+    data.seek(0)
+    columns = ", ".join(IMPORT_COLUMNS)
+    sql = f"COPY tasks ({columns}) FROM STDIN WITH (FORMAT csv)"
+    cur.copy_expert(sql, data)
+
+
+def import_tasks(
+    user_id: int,
+    chunks: Iterable[bytes],
+    batch_size: int = settings.api.import_batch_size,
+    max_errors: int = settings.api.import_max_errors,
+) -> ImportReport:
+    """
+    Импортирует задачи пользователя из CSV-файла (см.
+    core.csv_import.TaskCsvParser).
+
+    Файл разбирается по мере получения фрагментов; корректные строки
+    загружаются в таблицу 'tasks' пакетами по batch_size задач через
+    COPY ... FROM STDIN, поэтому память не зависит от размера файла.
+    Весь импорт - одна транзакция: если файл нельзя разобрать целиком
+    (ImportFormatError), задачи не создаются.
+
+    Args:
+        user_id (int): ID пользователя.
+        chunks (Iterable[bytes]): фрагменты файла.
+        batch_size (int): количество задач в одном COPY.
+        max_errors (int): сколько отклоненных строк перечислять в отчете.
+
+    Returns:
+        ImportReport: количество импортированных задач и отклоненные
+            строки.
+    """
+    parser = TaskCsvParser(user_id, max_errors)
+    with db.connect() as cur:
+        batch: list[tuple[Any, ...]] = []
+        for data in chunks:
+            batch += parser.feed(data)
+            if len(batch) >= batch_size:
+                _copy_tasks(cur, batch)
+                batch = []
+        batch += parser.close()
+        if batch:
+            _copy_tasks(cur, batch)
+
+        if parser.report.imported:
+            _tasks_changed(cur, user_id)
+    return parser.report
 
 
 def get_task_by_id(user_id: int, task_id: int) -> dict[str, Any] | None:
@@ -70,7 +748,8 @@ def get_task_by_id(user_id: int, task_id: int) -> dict[str, Any] | None:
         иначе None.
     """
     with db.connect_return_dict() as cur:
-        cur.execute(
+        db.execute(
+            cur,
             """
             SELECT * FROM tasks
             where id_users = %s and id = %s
@@ -97,7 +776,8 @@ def complete_task_by_id(user_id: int, task_id: int) -> dict[str, Any] | None:
         если задача найдена и ее статус был изменен; иначе None.
     """
     with db.connect_return_dict() as cur:
-        cur.execute(
+        db.execute(
+            cur,
             """
             UPDATE tasks
             SET completed = true, completed_at = CURRENT_TIMESTAMP
@@ -110,6 +790,7 @@ def complete_task_by_id(user_id: int, task_id: int) -> dict[str, Any] | None:
         if not result_execute:
             return None
 
+        _tasks_changed(cur, user_id)
         return dict(result_execute)
 
 
@@ -129,7 +810,8 @@ def not_completed_task_by_id(
         если задача найдена и ее статус был изменен; иначе None.
     """
     with db.connect_return_dict() as cur:
-        cur.execute(
+        db.execute(
+            cur,
             """
             UPDATE tasks
             SET completed = false, completed_at = Null
@@ -142,6 +824,7 @@ def not_completed_task_by_id(
         if not result_execute:
             return None
 
+        _tasks_changed(cur, user_id)
         return dict(result_execute)
 
 
@@ -163,7 +846,8 @@ def change_describe_task_by_id(
         если задача найдена и описание обновлено; иначе None.
     """
     with db.connect_return_dict() as cur:
-        cur.execute(
+        db.execute(
+            cur,
             """
             UPDATE tasks
             set describe = %s
@@ -176,6 +860,7 @@ def change_describe_task_by_id(
         if not result_execute:
             return None
 
+        _tasks_changed(cur, user_id)
         return dict(result_execute)
 
 
@@ -192,7 +877,8 @@ def delete_task_by_id(user_id: int, task_id: int) -> str | None:
         иначе None.
     """
     with db.connect() as cur:
-        cur.execute(
+        db.execute(
+            cur,
             """
             DELETE FROM tasks
             where id_users = %s and id = %s
@@ -202,4 +888,189 @@ def delete_task_by_id(user_id: int, task_id: int) -> str | None:
         )
 
         result = cur.fetchone()
-        return result[0] if result else None
+        if not result:
+            return None
+
+        _tasks_changed(cur, user_id)
+        return result[0]
+
+
+def get_tasks_by_ids(user_id: int, task_ids: list[int]) -> list[dict]:
+    """
+    Возвращает задачи пользователя с указанными ID одним запросом
+    (ID, которых нет у пользователя, пропускаются).
+
+    Args:
+        user_id (int): ID пользователя.
+        task_ids (list[int]): ID задач.
+
+    Returns:
+        list[dict]: найденные задачи по возрастанию ID.
+    """
+    if not task_ids:
+        return []
+
+    with db.connect_return_dict() as cur:
+        db.execute(
+            cur,
+            """
+            SELECT * FROM tasks
+            WHERE id_users = %s and id = ANY(%s::int[])
+            ORDER BY id
+            """,
+            (user_id, task_ids),
+        )
+        return [dict(task) for task in cur.fetchall()]
+
+
+def set_tasks_completed(
+    user_id: int,
+    task_ids: list[int],
+    completed: bool,
+) -> int:
+    """
+    Помечает задачи пользователя выполненными или невыполненными одним
+    запросом UPDATE ... WHERE id = ANY(...) в одной транзакции.
+
+    Меняются только задачи с другим статусом: у уже выполненных задач
+    дата выполнения сохраняется.
+
+    Args:
+        user_id (int): ID пользователя.
+        task_ids (list[int]): ID задач.
+        completed (bool): новый статус выполнения.
+
+    Returns:
+        int: количество измененных задач.
+    """
+    if not task_ids:
+        return 0
+
+    with db.connect() as cur:
+        db.execute(
+            cur,
+            """
+            UPDATE tasks
+            SET completed = %s,
+                completed_at = CASE WHEN %s THEN CURRENT_TIMESTAMP END
+            WHERE id_users = %s and id = ANY(%s::int[]) and completed <> %s
+            """,
+            (completed, completed, user_id, task_ids, completed),
+        )
+        count = cur.rowcount
+        if count:
+            _tasks_changed(cur, user_id)
+    return count
+
+
+def delete_tasks(user_id: int, task_ids: list[int]) -> int:
+    """
+    Удаляет задачи пользователя одним запросом
+    DELETE ... WHERE id = ANY(...) в одной транзакции.
+
+    Args:
+        user_id (int): ID пользователя.
+        task_ids (list[int]): ID задач.
+
+    Returns:
+        int: количество удаленных задач.
+    """
+    if not task_ids:
+        return 0
+
+    with db.connect() as cur:
+        db.execute(
+            cur,
+            """
+            DELETE FROM tasks
+            WHERE id_users = %s and id = ANY(%s::int[])
+            """,
+            (user_id, task_ids),
+        )
+        count = cur.rowcount
+        if count:
+            _tasks_changed(cur, user_id)
+    return count
+
+
+def get_daily_stats(user_id: int, days: int) -> list[DayStats]:
+    """
+    Возвращает число созданных и выполненных задач пользователя за
+    каждый из последних days дней (включая сегодня).
+
+    Счетчики читаются из таблицы user_daily_stats, которую ведут триггеры
+    на таблице tasks, поэтому запрос читает не больше days строк
+    независимо от числа задач. Дни без задач дополняются нулями.
+
+    Args:
+        user_id (int): ID пользователя.
+        days (int): количество дней.
+
+    Returns:
+        list[DayStats]: счетчики по дням, от старых к новым.
+    """
+    today = datetime.date.today()
+    stats = [
+        DayStats(today - datetime.timedelta(days=offset))
+        for offset in range(days - 1, -1, -1)
+    ]
+    if not stats:
+        return stats
+
+    with db.connect() as cur:
+        db.execute(
+            cur,
+            """
+            SELECT day, created, completed
+            FROM user_daily_stats
+            WHERE id_users = %s and day >= %s
+            ORDER BY day
+            """,
+            (user_id, stats[0].day),
+        )
+        rows = cur.fetchall()
+
+    by_day = {day_stats.day: day_stats for day_stats in stats}
+    for day, created, completed in rows:
+        if day in by_day:
+            by_day[day].created = created
+            by_day[day].completed = completed
+    return stats
+
+
+def get_completion_report(user_id: int) -> CompletionReport:
+    """
+    Строит отчет о времени выполнения задач пользователя
+    (см. core.analytics.completion_report).
+
+    Время создания и выполнения всех выполненных задач читается одним
+    запросом двумя массивами float8 (секунды от эпохи) в двоичном формате
+    (array_send) и обрабатывается векторными операциями NumPy: ни строк,
+    ни словарей на каждую задачу не создается.
+
+    Args:
+        user_id (int): ID пользователя.
+
+    Returns:
+        CompletionReport: отчет.
+    """
+    with db.connect() as cur:
+        db.execute(
+            cur,
+            """
+            SELECT
+                array_send(array_agg(date_part('epoch', created_at))),
+                array_send(array_agg(date_part('epoch', completed_at)))
+            FROM tasks
+            WHERE id_users = %s AND completed
+                AND completed_at IS NOT NULL AND created_at IS NOT NULL
+            """,
+            (user_id,),
+        )
+        created_at, completed_at = cur.fetchone()
+
+    return completion_report(
+        decode_float8_array(created_at),
+        decode_float8_array(completed_at),
+        datetime.date.today(),
+    )
@@ -17,7 +17,8 @@ def add_new_user(name: str, email: str, password: str):
     hashed_password = get_password_hash(password)
 
     with db.connect() as cur:
-        cur.execute(
+        db.execute(
+            cur,
             """
             INSERT INTO users (name, email, hashed_password)
             VALUES (%s, %s, %s)
@@ -30,7 +31,8 @@ def check_user_exists(name: str, password: str):
     """Проверяет, что пользователь указанным именем и паролем существует"""
 
     with db.connect() as cur:
-        cur.execute(
+        db.execute(
+            cur,
             """
             SELECT hashed_password, id
             FROM users
@@ -48,3 +50,12 @@ def check_user_exists(name: str, password: str):
             return False
 
         return user_id
+
+
+def get_user_id(name: str) -> int | None:
+    """Возвращает ID пользователя с указанным именем или None"""
+
+    with db.connect() as cur:
+        db.execute(cur, "SELECT id FROM users WHERE name = %s", (name,))
+        user_data = cur.fetchone()
+    return user_data[0] if user_data else None
@@ -1,19 +1,31 @@
 import datetime
 
 from api import app_route
+from api.utils import compress_response, setup_static, setup_templates
+from cli import import_tasks
 from core.config import settings
-from core.models import create_tasks_table, create_users_table
-from flask import Flask, redirect, url_for
+from core.models import (
+    PoolTimeout,
+    create_tasks_table,
+    create_user_daily_stats_table,
+    create_users_table,
+)
+from flask import Flask, redirect, render_template, url_for
 
 app = Flask(__name__)
 app.register_blueprint(app_route)
 app.permanent_session_lifetime = datetime.timedelta(days=7)
 app.secret_key = settings.secret_key
+setup_static(app)
+setup_templates(app)
+app.after_request(compress_response)
+app.cli.add_command(import_tasks)
 # app.config['PERMANENT_SESSION_LIFETIME'] = datetime.timedelta(days=7)
 
 with app.app_context():
     create_users_table()
     create_tasks_table()
+    create_user_daily_stats_table()
 
 
 @app.route("/")
@@ -24,5 +36,21 @@ def home_page():
     return redirect(url_for("app.user.login_user"))
 
 
+@app.errorhandler(PoolTimeout)
+def pool_timeout(error: PoolTimeout) -> tuple[str, int]:
+    """
+    Все соединения с БД заняты дольше settings.db.pool_timeout:
+    возвращает страницу ошибки с кодом 503 вместо 500.
+    """
+    return (
+        render_template(
+            "mistakes.html",
+            code=503,
+            message="Database is busy, try again later",
+        ),
+        503,
+    )
+
+
 if __name__ == "__main__":
     app.run(debug=True)